@@ -0,0 +1,68 @@
+"""Measure how long ``import pypcom`` takes, and fail if it's over budget.
+
+This runs ``python -X importtime -c "import pypcom"`` several times in fresh
+interpreters, takes the median of the cumulative time reported for the
+``pypcom`` package, and compares it against the budget. Run it with::
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 20 --budget-ms 15
+
+Only what ``import pypcom`` itself pulls in is measured. The public names (and
+Selenium) are loaded lazily, so they aren't part of this cost until they're
+used.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+#: Median cumulative import time (in milliseconds) that's considered a
+#: regression. ``import pypcom`` takes roughly 1ms when nothing is loaded
+#: eagerly, and closer to 200ms once Selenium gets pulled in.
+DEFAULT_BUDGET_MS = 20.0
+
+
+def measure_once(module="pypcom"):
+    """Get the cumulative import time of the module in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import {}".format(module)],
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        universal_newlines=True,
+        check=True,
+    )
+    for line in result.stderr.splitlines():
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError("No import time reported for '{}'".format(module))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args(argv)
+
+    timings = [measure_once() / 1000.0 for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(
+        "import pypcom: median {:.2f}ms, min {:.2f}ms, max {:.2f}ms "
+        "over {} runs (budget {:.2f}ms)".format(
+            median,
+            min(timings),
+            max(timings),
+            args.runs,
+            args.budget_ms,
+        ),
+    )
+    if median > args.budget_ms:
+        print("Import time is over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
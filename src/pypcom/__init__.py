@@ -1,5 +1,8 @@
 from __future__ import absolute_import
 
+import sys
+from importlib import import_module
+
 from pypcom.__version__ import (
     __title__,
     __description__,
@@ -11,11 +14,6 @@ from pypcom.__version__ import (
     __license__,
 )
 
-from pypcom.page import Page
-from pypcom.component import PageComponent
-PC = PageComponent
-from pypcom.state import State
-
 
 __all__ = [
     "Page",
@@ -23,3 +21,35 @@ __all__ = [
     "PC",
     "State",
 ]
+
+# The public names are only imported once they're first referenced, so that
+# ``import pypcom`` stays cheap (Selenium in particular isn't imported until a
+# component actually needs it).
+_lazy_names = {
+    "Page": ("pypcom.page", "Page"),
+    "PageComponent": ("pypcom.component", "PageComponent"),
+    "PC": ("pypcom.component", "PageComponent"),
+    "State": ("pypcom.state", "State"),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attr_name = _lazy_names[name]
+    except KeyError:
+        raise AttributeError(
+            "module '{}' has no attribute '{}'".format(__name__, name),
+        )
+    value = getattr(import_module(module_name), attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names))
+
+
+if sys.version_info < (3, 7):
+    # module level __getattr__ isn't supported, so import everything up front
+    for _name in _lazy_names:
+        __getattr__(_name)
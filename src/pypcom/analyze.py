@@ -0,0 +1,355 @@
+"""Estimate how many WebDriver commands it costs to use each component.
+
+This looks at ``Page`` classes without needing a browser, walks the tree of
+``PageComponent`` descriptors declared on them, and estimates how many
+WebDriver round trips it takes to read something from each component (e.g.
+``page.login_form.username.text``), based on how PyPCOM finds elements:
+
+* every component costs one ``find_element``, plus the cost of finding its
+  parent's element if it has ``_find_from_parent`` set (and that lookup goes
+  through the parent's own iframe handling), and
+* every component inside an ``Iframe`` has to switch into its iframe (and back
+  out to the default content) every time its element is used (unless the
+  focus is already being held there, e.g. by ``Iframe.focus``).
+
+It also flags locators that are likely to be slow for the browser to resolve,
+like XPaths that start with ``//`` (which search the entire document), and CSS
+selectors that use a descendant combinator without anchoring to an ID, as well
+as anything that can't be estimated statically (e.g. a ``_locator`` that's a
+``property``).
+
+It can be run from the command line against one or more modules or packages
+(every submodule of a package is searched)::
+
+    python -m pypcom.analyze mypackage.pages
+    python -m pypcom.analyze mypackage.pages --json --limit 20
+
+The output is ranked with the most expensive components first.
+"""
+
+from __future__ import print_function
+
+import argparse
+import inspect
+import json
+import pkgutil
+import re
+import sys
+from importlib import import_module
+
+from pypcom.component import PageComponent, iter_component_descriptors
+from pypcom.page import Page
+
+
+def iframe_switch_commands(iframe_depth):
+    """Commands for ``Iframe.switch_to`` on an iframe nested this deep.
+
+    This switches to the default content, and then to each frame in turn. The
+    ``WebElement`` of each frame is cached after it's first found, so the
+    lookups for them aren't counted.
+
+    Args:
+        iframe_depth (int): How many iframes deep the iframe is (1 for an
+            iframe in the page itself).
+    """
+    return 1 + iframe_depth
+
+
+def iframe_context_commands(iframe_depth):
+    """Commands for one ``possible_iframe_context`` of a component.
+
+    Args:
+        iframe_depth (int): How many iframes the component is inside of.
+    """
+    if not iframe_depth:
+        return 0
+    return iframe_switch_commands(iframe_depth) + 1
+
+
+class ComponentCost(object):
+    """Estimated cost of reading something from a single component.
+
+    Attributes:
+        page (type): The ``Page`` class the component was found through.
+        path (str): Dotted path to the component from the page.
+        component (PageComponent): The component descriptor itself.
+        parent (ComponentCost): Cost of the parent component, if the parent
+            is a component.
+        iframe_depth (int): How many ``Iframe`` ancestors the component has.
+        lookups (int): ``find_element`` calls needed to find its element.
+        lookup_frame_commands (int): Commands spent switching frames while
+            finding its element.
+        frame_commands (int): Commands spent switching frames.
+        commands (int): Total commands to read one thing from it.
+        warnings (list): Slow patterns and things that couldn't be estimated.
+    """
+
+    def __init__(self, page, path, component, parent=None):
+        self.page = page
+        self.path = path
+        self.component = component
+        self.parent = parent
+        self.warnings = []
+        parent_depth = parent.iframe_depth if parent is not None else 0
+        parent_is_iframe = parent is not None and parent.component._is_iframe
+        self.iframe_depth = parent_depth + (1 if parent_is_iframe else 0)
+        self._estimate()
+
+    @property
+    def name(self):
+        return "{}.{}".format(self.page.__name__, self.path)
+
+    def _estimate(self):
+        component = self.component
+        cls = type(component)
+        self.lookups = 1
+        # frame commands spent while finding the element itself
+        self.lookup_frame_commands = 0
+        if component._find_from_parent and self.parent is not None:
+            # ``parent.find_element`` manages the parent's iframe context
+            # once when it's called. That's free if the focus is already
+            # being held on the parent's iframe.
+            parent_context = 0
+            if self.parent.iframe_depth != self.iframe_depth:
+                parent_context = iframe_context_commands(
+                    self.parent.iframe_depth,
+                )
+            self.lookups += self.parent.lookups
+            self.lookup_frame_commands = (
+                parent_context + self.parent.lookup_frame_commands
+            )
+        self.frame_commands = (
+            iframe_context_commands(self.iframe_depth)
+            + self.lookup_frame_commands
+        )
+        # finding the element, plus the command for what's being read
+        self.commands = self.lookups + self.frame_commands + 1
+
+        locator = inspect.getattr_static(cls, "_locator", None)
+        if not isinstance(locator, tuple):
+            if locator is not None:
+                self.warnings.append(
+                    "dynamic _locator can't be checked statically",
+                )
+            elif not self.has_subcomponents():
+                self.warnings.append("no _locator")
+        else:
+            self.warnings.extend(slow_locator_warnings(locator))
+        if cls._el is not PageComponent._el:
+            self.warnings.append("custom _el lookup may cost more")
+
+    def has_subcomponents(self):
+        return bool(iter_component_descriptors(type(self.component)))
+
+    def as_dict(self):
+        return {
+            "component": self.name,
+            "class": type(self.component).__name__,
+            "commands": self.commands,
+            "lookups": self.lookups,
+            "frame_commands": self.frame_commands,
+            "iframe_depth": self.iframe_depth,
+            "warnings": list(self.warnings),
+        }
+
+
+_UNANCHORED_COMPOUND = re.compile(r"^[^#]*$")
+
+
+def _split_css_compounds(selector):
+    """Split a CSS selector into its compound selectors.
+
+    Combinators (``>``, ``+``, ``~`` and whitespace) are kept as their own
+    items, and anything inside brackets, parentheses or quotes is left alone.
+    """
+    parts = []
+    current = []
+    depth = 0
+    quote = None
+    for char in selector.strip():
+        if quote:
+            current.append(char)
+            if char == quote:
+                quote = None
+            continue
+        if char in "\"'":
+            quote = char
+        elif char in "[(":
+            depth += 1
+        elif char in "])":
+            depth -= 1
+        elif depth == 0 and (char.isspace() or char in ">+~"):
+            if current:
+                parts.append("".join(current))
+                current = []
+            if char.isspace():
+                if not parts or parts[-1] not in (" ", ">", "+", "~"):
+                    parts.append(" ")
+            else:
+                if parts and parts[-1] == " ":
+                    parts.pop()
+                parts.append(char)
+            continue
+        current.append(char)
+    if current:
+        parts.append("".join(current))
+    while parts and parts[-1] in (" ", ">", "+", "~"):
+        parts.pop()
+    return parts
+
+
+def slow_locator_warnings(locator):
+    """Get warnings for patterns in a locator that are slow to resolve.
+
+    Args:
+        locator (tuple): The locator strategy and value.
+    """
+    warnings = []
+    using, value = locator
+    if using == "xpath":
+        if value.startswith("//"):
+            warnings.append(
+                "XPath starts with '//', which searches the whole document",
+            )
+    elif using == "css selector":
+        for selector in value.split(","):
+            parts = _split_css_compounds(selector)
+            if " " in parts and _UNANCHORED_COMPOUND.match(parts[0]):
+                warnings.append(
+                    "CSS selector '{}' uses a descendant combinator without "
+                    "an ID anchor".format(selector.strip()),
+                )
+    return warnings
+
+
+def analyze_page(page_cls):
+    """Estimate the cost of every component in a ``Page`` class.
+
+    Args:
+        page_cls (type): The ``Page`` class to analyze.
+
+    Returns:
+        list: A ``ComponentCost`` for every component in the tree, in the
+            order they were declared.
+    """
+    costs = []
+
+    def walk(cls, prefix, parent, ancestor_classes):
+        for name, component in iter_component_descriptors(cls):
+            path = prefix + name
+            cost = ComponentCost(page_cls, path, component, parent)
+            costs.append(cost)
+            component_cls = type(component)
+            if component_cls in ancestor_classes:
+                cost.warnings.append("recursive component tree not followed")
+                continue
+            walk(
+                component_cls,
+                path + ".",
+                cost,
+                ancestor_classes + (component_cls,),
+            )
+
+    walk(page_cls, "", None, ())
+    return costs
+
+
+def find_page_classes(module_name):
+    """Import a module (and its submodules) and find the ``Page`` subclasses.
+
+    Args:
+        module_name (str): The dotted name of the module or package.
+    """
+    modules = [import_module(module_name)]
+    if hasattr(modules[0], "__path__"):
+        for info in pkgutil.walk_packages(
+            modules[0].__path__,
+            module_name + ".",
+        ):
+            modules.append(import_module(info[1]))
+
+    pages = []
+    for module in modules:
+        for value in vars(module).values():
+            if (
+                inspect.isclass(value)
+                and issubclass(value, Page)
+                and value is not Page
+                and value not in pages
+            ):
+                pages.append(value)
+    return pages
+
+
+def rank(costs):
+    """Sort the costs with the most expensive first."""
+    return sorted(
+        costs,
+        key=lambda cost: (-cost.commands, -cost.lookups, cost.name),
+    )
+
+
+def format_table(costs):
+    """Format the costs as a plain text table."""
+    name_width = max([len("component")] + [len(cost.name) for cost in costs])
+    lines = [
+        "{:<{width}}  {:>8}  {:>7}  {:>6}  {}".format(
+            "component",
+            "commands",
+            "lookups",
+            "frames",
+            "warnings",
+            width=name_width,
+        ),
+    ]
+    for cost in costs:
+        lines.append(
+            "{:<{width}}  {:>8}  {:>7}  {:>6}  {}".format(
+                cost.name,
+                cost.commands,
+                cost.lookups,
+                cost.frame_commands,
+                "; ".join(cost.warnings),
+                width=name_width,
+            ),
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m pypcom.analyze",
+        description=(
+            "Estimate the WebDriver commands needed to use each component of "
+            "the Page classes in the given modules."
+        ),
+    )
+    parser.add_argument("modules", nargs="+", help="modules to search")
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="output JSON instead of a table",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="only show the most expensive components",
+    )
+    args = parser.parse_args(argv)
+
+    costs = []
+    for module_name in args.modules:
+        for page_cls in find_page_classes(module_name):
+            costs.extend(analyze_page(page_cls))
+    costs = rank(costs)[:args.limit]
+
+    if args.json:
+        print(json.dumps([cost.as_dict() for cost in costs], indent=2))
+    else:
+        print(format_table(costs))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
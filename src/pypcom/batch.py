@@ -0,0 +1,95 @@
+"""Run many component operations with as few frame switches as possible.
+
+Every time a component inside an ``Iframe`` is used, the focus is switched into
+its iframe and back out again, which costs several WebDriver commands on top of
+the interaction itself. When a lot of components spread across several iframes
+need to be used (e.g. reading every widget on a dashboard), most of the time
+ends up going to switching frames.
+
+``run_batch`` takes a batch of operations, groups them by the iframe their
+component is in, and visits each iframe only once, holding the focus on it
+(see ``Iframe.focus``) while every operation for that iframe runs. The results
+are returned in the same order as the operations were given.
+
+Example::
+
+    texts = run_batch(
+        (component, lambda component: component.text)
+        for component in (
+            page.sales_frame.total,
+            page.traffic_frame.visitors,
+            page.sales_frame.orders,
+            page.header.title,
+        )
+    )
+"""
+
+from pypcom.component import iframe_focus
+
+
+def group_by_iframe(components):
+    """Group components by the iframe they're in.
+
+    Args:
+        components (iterable): The ``PageComponent``s to group.
+
+    Returns:
+        list: ``(iframe, indexes)`` pairs, where ``iframe`` is the ``Iframe``
+            the components are in (or ``None`` for the page itself), and
+            ``indexes`` are the positions of those components in the original
+            iterable. Groups are in the order they were first seen.
+    """
+    groups = []
+    indexes_by_iframe = {}
+    for index, component in enumerate(components):
+        iframe = component.iframe_ancestor
+        key = id(iframe)
+        if key not in indexes_by_iframe:
+            indexes_by_iframe[key] = []
+            groups.append((iframe, indexes_by_iframe[key]))
+        indexes_by_iframe[key].append(index)
+    return groups
+
+
+def run_in_iframe(iframe, func, driver=None):
+    """Call ``func`` while holding the focus on the iframe (if there is one).
+
+    If there isn't one, and the driver is given, the focus is held on the
+    default content instead (which only matters if the focus was being held
+    on an iframe).
+
+    Args:
+        iframe (Iframe): The iframe to hold the focus on, or ``None``.
+        func (callable): What to call.
+        driver (WebDriver): The driver to hold the focus of.
+    """
+    if iframe is None and driver is None:
+        return func()
+    with iframe_focus(iframe, driver):
+        return func()
+
+
+def run_batch(operations):
+    """Run the operations, visiting each iframe only once.
+
+    Args:
+        operations (iterable): ``(component, operation)`` pairs, where
+            ``operation`` is a callable that will be passed the component.
+
+    Returns:
+        list: What each operation returned, in the order they were given.
+    """
+    operations = list(operations)
+    results = [None] * len(operations)
+
+    def run_group(indexes):
+        for index in indexes:
+            component, operation = operations[index]
+            results[index] = operation(component)
+
+    for iframe, indexes in group_by_iframe(
+        component for component, _ in operations
+    ):
+        driver = operations[indexes[0]][0].driver
+        run_in_iframe(iframe, lambda: run_group(indexes), driver)
+    return results
@@ -0,0 +1,171 @@
+"""Time how long it takes each component of a live page to find its element.
+
+Where ``pypcom.analyze`` estimates the cost of each component without a
+browser, this measures it against a page that's actually loaded. Every
+component declared on the ``Page`` (and their subcomponents) has its element
+looked up several times, exactly as PyPCOM would when it's used (switching into
+any iframes it's inside of, and finding its parents' elements first if it has
+``_find_from_parent`` set), and the median time is reported.
+
+Example::
+
+    page = DashboardPage(driver)
+    timings = benchmark_locators(page, runs=7)
+    print(format_table(timings))
+    with open("locator_timings.json", "w") as f:
+        f.write(to_json(timings))
+
+The results are sorted with the slowest components first.
+"""
+
+import json
+import statistics
+import time
+
+
+class LocatorTiming(object):
+    """How long it took a component to find its element.
+
+    Attributes:
+        path (str): Dotted path to the component from the page.
+        component (PageComponent): The component that was timed.
+        timings (list): Seconds each lookup took.
+        error (str): Why the element couldn't be found, if it couldn't.
+    """
+
+    def __init__(self, path, component, timings, error=None):
+        self.path = path
+        self.component = component
+        self.timings = timings
+        self.error = error
+
+    @property
+    def median(self):
+        """Median lookup time in seconds (``None`` if nothing was timed)."""
+        if not self.timings:
+            return None
+        return statistics.median(self.timings)
+
+    def as_dict(self):
+        return {
+            "component": self.path,
+            "class": type(self.component).__name__,
+            "locator": list(self.component._locator),
+            "median_ms": _ms(self.median),
+            "min_ms": _ms(min(self.timings) if self.timings else None),
+            "max_ms": _ms(max(self.timings) if self.timings else None),
+            "runs": len(self.timings),
+            "error": self.error,
+        }
+
+
+def _ms(seconds):
+    if seconds is None:
+        return None
+    return round(seconds * 1000.0, 3)
+
+
+def time_locator(component, runs=5, clock=time.perf_counter):
+    """Time how long the component takes to find its element.
+
+    Args:
+        component (PageComponent): The (bound) component to time.
+        runs (int): How many times to look the element up.
+        clock (callable): Returns the current time in seconds.
+
+    Returns:
+        tuple: The list of timings, and the error message if the element
+            couldn't be found.
+    """
+    from selenium.common.exceptions import WebDriverException
+
+    timings = []
+    for _ in range(runs):
+        start = clock()
+        try:
+            with component.possible_iframe_context():
+                component._el
+        except WebDriverException as e:
+            return timings, e.__class__.__name__
+        timings.append(clock() - start)
+    return timings, None
+
+
+def benchmark_locators(page, runs=5, clock=time.perf_counter):
+    """Time every component of the page finding its element.
+
+    Components without a ``_locator`` (i.e. ones that only group other
+    components) are skipped. Components can be shared by more than one
+    parent (e.g. when they're declared on a base class), so each one is
+    referenced through its path from the page again right before it's timed,
+    to make sure it's bound to the parent its path goes through.
+
+    Args:
+        page (Page): The page, bound to a driver that's on the live page.
+        runs (int): How many times to look up each element.
+        clock (callable): Returns the current time in seconds.
+
+    Returns:
+        list: A ``LocatorTiming`` for each component, slowest first.
+    """
+    results = []
+    for path, component in page.iter_components():
+        if component._locator is None:
+            continue
+        component = _get_by_path(page, path)
+        timings, error = time_locator(component, runs, clock)
+        results.append(LocatorTiming(path, component, timings, error))
+    return sorted(
+        results,
+        key=lambda result: (
+            result.median is None,
+            -(result.median or 0),
+            result.path,
+        ),
+    )
+
+
+def _get_by_path(page, path):
+    """Reference a component through its dotted path from the page."""
+    node = page
+    for name in path.split("."):
+        node = getattr(node, name)
+    return node
+
+
+def format_table(results):
+    """Format the timings as a plain text table."""
+    path_width = max([len("component")] + [len(r.path) for r in results])
+    row = "{:<{width}}  {:>10}  {:>10}  {:>10}  {}"
+    lines = [
+        row.format(
+            "component",
+            "median ms",
+            "min ms",
+            "max ms",
+            "locator",
+            width=path_width,
+        ),
+    ]
+    for result in results:
+        details = result.as_dict()
+        lines.append(
+            row.format(
+                result.path,
+                _cell(details["median_ms"]),
+                _cell(details["min_ms"]),
+                _cell(details["max_ms"]),
+                result.error or "{}={}".format(*result.component._locator),
+                width=path_width,
+            ),
+        )
+    return "\n".join(lines)
+
+
+def _cell(value):
+    return "-" if value is None else "{:.3f}".format(value)
+
+
+def to_json(results):
+    """Serialize the timings to JSON."""
+    return json.dumps([result.as_dict() for result in results], indent=2)
@@ -0,0 +1,264 @@
+"""Hold tests to a budget of WebDriver commands and time spent waiting.
+
+How many WebDriver commands a test's page objects send (and how long they
+spend waiting) creeps up quietly as components and pages change. A ``Budget``
+puts a ceiling on both, and ``measure_usage`` measures what was actually used
+(with ``pypcom.tracing``)::
+
+    with measure_usage() as usage:
+        page.login_form.username = "me"
+        page.login_form.submit.click()
+        page.dashboard.wait_until("visible")
+    assert not Budget(commands=10, wait_seconds=2).check(usage)
+
+Only commands sent by PyPCOM operations (e.g. reading a component's text, or
+waiting on it) on the measuring thread are counted, so commands sent directly
+through the driver, and by a ``Warmup`` in the background, aren't.
+
+The pytest plugin applies budgets to tests through the ``pypcom_budget``
+marker (and the ``pypcom_budget_*`` ini options), and can ratchet them down
+from a baseline file (see ``Baseline``).
+"""
+
+import bisect
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from pypcom import tracing
+
+
+class Usage(object):
+    """What a stretch of page object usage cost.
+
+    Attributes:
+        commands (int): How many WebDriver commands were sent.
+        wait_seconds (float): How many seconds were spent waiting.
+    """
+
+    def __init__(self, commands=0, wait_seconds=0.0):
+        self.commands = commands
+        self.wait_seconds = wait_seconds
+
+    def add_events(self, events, thread_id):
+        """Add the cost recorded in some trace events.
+
+        Args:
+            events (list): The Chrome trace events recorded by a ``Tracer``.
+            thread_id (int): The thread to count the events of.
+        """
+        events = [event for event in events if event["tid"] == thread_id]
+        operations = _merge_intervals(
+            event for event in events
+            if event["cat"] not in ("webdriver", "test")
+        )
+        starts = [start for start, _ in operations]
+        for event in events:
+            if event["cat"] != "webdriver":
+                continue
+            index = bisect.bisect_right(starts, event["ts"]) - 1
+            # the timestamps are rounded, so allow for a little slop
+            end = event["ts"] + event["dur"]
+            if index >= 0 and end <= operations[index][1] + 0.01:
+                self.commands += 1
+        waits = _merge_intervals(
+            event for event in events if event["cat"] == "wait"
+        )
+        self.wait_seconds += sum(end - start for start, end in waits) / 1e6
+
+    def as_dict(self):
+        return {"commands": self.commands, "wait_seconds": self.wait_seconds}
+
+    def __repr__(self):
+        return "<Usage commands={} wait_seconds={:.3f}>".format(
+            self.commands,
+            self.wait_seconds,
+        )
+
+
+def _merge_intervals(events):
+    intervals = sorted(
+        (event["ts"], event["ts"] + event["dur"]) for event in events
+    )
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+@contextmanager
+def measure_usage():
+    """Context manager that measures the page object usage inside it.
+
+    If tracing is already on (e.g. for ``--pypcom-trace``), its tracer is
+    used to measure the usage. Otherwise, tracing is on while the context is
+    active.
+
+    Yields:
+        Usage: The usage, which is filled in once the context exits.
+    """
+    usage = Usage()
+    tracer = tracing.get_tracer()
+    started = tracer is None
+    if started:
+        tracer = tracing.start_tracing()
+    first = len(tracer.events)
+    thread_id = threading.current_thread().ident
+    try:
+        yield usage
+    finally:
+        if started:
+            tracing.stop_tracing()
+        usage.add_events(tracer.events[first:], thread_id)
+
+
+class Budget(object):
+    """The most page object usage allowed.
+
+    Args:
+        commands (int): The most WebDriver commands allowed (no limit if
+            ``None``).
+        wait_seconds (float): The most seconds allowed to be spent waiting (no
+            limit if ``None``).
+    """
+
+    def __init__(self, commands=None, wait_seconds=None):
+        self.commands = commands
+        self.wait_seconds = wait_seconds
+
+    @property
+    def is_limited(self):
+        """Whether or not there's anything to hold usage to."""
+        return self.commands is not None or self.wait_seconds is not None
+
+    def tightened(self, usage, wait_slack=0.0, wait_grace=0.0):
+        """Get a budget that's no looser than the given usage.
+
+        Waiting times vary from run to run, so some slack can be allowed on
+        top of the waiting time.
+
+        Args:
+            usage (Usage): The usage to hold to (e.g. from a ``Baseline``).
+            wait_slack (float): The fraction of the waiting time to allow on
+                top of it.
+            wait_grace (float): The number of seconds to allow on top of it.
+
+        Returns:
+            Budget: The tighter budget.
+        """
+        commands = _lowest(self.commands, usage.commands)
+        wait_seconds = _lowest(
+            self.wait_seconds,
+            usage.wait_seconds * (1 + wait_slack) + wait_grace,
+        )
+        return Budget(commands, wait_seconds)
+
+    def check(self, usage):
+        """Check the usage against the budget.
+
+        Args:
+            usage (Usage): The usage to check.
+
+        Returns:
+            list: A message for each part of the budget that was exceeded.
+        """
+        problems = []
+        if self.commands is not None and usage.commands > self.commands:
+            problems.append(
+                "{} WebDriver commands were sent, which is over the budget "
+                "of {}".format(usage.commands, self.commands),
+            )
+        if (
+            self.wait_seconds is not None
+            and usage.wait_seconds > self.wait_seconds
+        ):
+            problems.append(
+                "{:.2f}s were spent waiting, which is over the budget of "
+                "{:.2f}s".format(usage.wait_seconds, self.wait_seconds),
+            )
+        return problems
+
+
+def _lowest(limit, value):
+    if limit is None:
+        return value
+    return min(limit, value)
+
+
+class Baseline(object):
+    """The usage of each test, stored so budgets can only ever go down.
+
+    Each test with an entry is held to the usage it had (see
+    ``Budget.tightened``), and whenever a test uses less than that, its entry
+    is lowered to match, so nobody can make a test's page objects slower
+    without it being noticed. Tests without an entry get one the first time
+    they're recorded. To allow a test to use more, its entry has to be removed
+    (or the file deleted) on purpose.
+
+    The file is JSON, keyed by the test's ID::
+
+        {
+            "tests/test_login.py::test_login": {
+                "commands": 42,
+                "wait_seconds": 1.5
+            }
+        }
+
+    Args:
+        path (str): Where the baseline is stored.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.changed = False
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def get(self, test_id):
+        """Get the stored usage of a test.
+
+        Args:
+            test_id (str): The ID of the test.
+
+        Returns:
+            Usage: The stored usage, or ``None`` if there isn't any.
+        """
+        entry = self.entries.get(test_id)
+        if entry is None:
+            return None
+        return Usage(entry["commands"], entry["wait_seconds"])
+
+    def record(self, test_id, usage):
+        """Record a test's usage, if it's lower than what's stored.
+
+        Args:
+            test_id (str): The ID of the test.
+            usage (Usage): The usage the test had.
+        """
+        stored = self.get(test_id)
+        if stored is not None:
+            usage = Usage(
+                min(stored.commands, usage.commands),
+                min(stored.wait_seconds, usage.wait_seconds),
+            )
+        entry = {
+            "commands": usage.commands,
+            "wait_seconds": round(usage.wait_seconds, 3),
+        }
+        if self.entries.get(test_id) != entry:
+            self.entries[test_id] = entry
+            self.changed = True
+
+    def save(self):
+        """Write the baseline back to its file, if anything changed."""
+        if not self.changed:
+            return
+        with open(self.path, "w") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        self.changed = False
@@ -0,0 +1,287 @@
+"""Save the state of a browser session, and put it back later.
+
+A lot of a suite's time can go into setting up the same state through the UI
+over and over (e.g. logging in). A ``Checkpoint`` captures that state once it's
+set up (the cookies, the ``localStorage`` and ``sessionStorage`` of the
+current origin, and the current URL), so it can be put back into any session
+afterwards, without going through the UI again::
+
+    login_page.log_in("me", "secret")
+    checkpoint = page.checkpoint()
+    checkpoint.save("logged_in.json")
+    ...
+    page.restore(Checkpoint.load("logged_in.json"))
+
+The storage is read with a single script, and the cookies with a single
+command (the cookies are read through WebDriver, rather than the script, as
+a script can't see ``HttpOnly`` cookies, which are usually the ones that
+matter).
+
+The pytest plugin provides a ``pypcom_checkpoints`` fixture, which keeps the
+checkpoints for each setup by name, so each setup only runs once per worker
+(or once at all, with ``--pypcom-checkpoint-dir``; see
+``CheckpointStore``).
+
+Only the state of the current origin is captured, and restoring it navigates
+to the checkpoint's URL.
+"""
+
+import json
+import os
+import re
+import tempfile
+
+try:
+    from urllib.parse import urlsplit
+except ImportError:
+    from urlparse import urlsplit
+
+
+CAPTURE_STORAGE_SCRIPT = r"""
+function dump(name) {
+    var result = {};
+    try {
+        var storage = window[name];
+        for (var i = 0; i < storage.length; i++) {
+            var key = storage.key(i);
+            result[key] = storage.getItem(key);
+        }
+    } catch (e) {
+        // storage isn't available (e.g. on about:blank)
+    }
+    return result;
+}
+return {
+    url: window.location.href,
+    localStorage: dump("localStorage"),
+    sessionStorage: dump("sessionStorage")
+};
+"""
+
+RESTORE_STORAGE_SCRIPT = r"""
+function load(name, items) {
+    var storage = window[name];
+    storage.clear();
+    Object.keys(items).forEach(function (key) {
+        storage.setItem(key, items[key]);
+    });
+}
+load("localStorage", arguments[0]);
+load("sessionStorage", arguments[1]);
+"""
+
+
+def _origin(url):
+    parts = urlsplit(url or "")
+    return parts.scheme, parts.netloc
+
+
+class Checkpoint(object):
+    """The state of a browser session at some point.
+
+    Args:
+        url (str): The URL the browser was on.
+        cookies (list): The cookies, as returned by ``get_cookies``.
+        local_storage (dict): The items in ``localStorage``.
+        session_storage (dict): The items in ``sessionStorage``.
+    """
+
+    def __init__(
+        self,
+        url,
+        cookies=(),
+        local_storage=None,
+        session_storage=None,
+    ):
+        self.url = url
+        self.cookies = list(cookies)
+        self.local_storage = dict(local_storage or {})
+        self.session_storage = dict(session_storage or {})
+
+    @classmethod
+    def capture(cls, driver):
+        """Capture the state of the driver's session.
+
+        Args:
+            driver (WebDriver): The driver to capture the state of.
+        """
+        storage = driver.execute_script(CAPTURE_STORAGE_SCRIPT)
+        return cls(
+            storage["url"],
+            driver.get_cookies(),
+            storage["localStorage"],
+            storage["sessionStorage"],
+        )
+
+    def restore(self, driver):
+        """Put the state back into the driver's session.
+
+        Cookies and storage can only be set for the origin the browser is
+        on, so if it's on another origin, it navigates to the checkpoint's
+        URL first. Everything is then replaced with what's in the checkpoint,
+        and it navigates to the checkpoint's URL, so the page is loaded with
+        the restored state.
+
+        Args:
+            driver (WebDriver): The driver to restore the state into.
+
+        Raises:
+            RuntimeError: If navigating to the checkpoint's URL ended up on
+                another origin (e.g. a redirect to a login page on another
+                domain), so the state can't be put back.
+        """
+        if _origin(driver.current_url) != _origin(self.url):
+            driver.get(self.url)
+            current_url = driver.current_url
+            if _origin(current_url) != _origin(self.url):
+                raise RuntimeError(
+                    "Couldn't restore the checkpoint of '{}', as going to it "
+                    "ended up on '{}' (a different origin)".format(
+                        self.url,
+                        current_url,
+                    ),
+                )
+        driver.delete_all_cookies()
+        for cookie in self.cookies:
+            driver.add_cookie(cookie)
+        driver.execute_script(
+            RESTORE_STORAGE_SCRIPT,
+            self.local_storage,
+            self.session_storage,
+        )
+        driver.get(self.url)
+
+    def as_dict(self):
+        return {
+            "url": self.url,
+            "cookies": self.cookies,
+            "localStorage": self.local_storage,
+            "sessionStorage": self.session_storage,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["url"],
+            data.get("cookies", ()),
+            data.get("localStorage"),
+            data.get("sessionStorage"),
+        )
+
+    def save(self, path):
+        """Write the checkpoint to a file as JSON.
+
+        It's written to a temporary file next to the path first, and then
+        moved into place, so anything reading the path (e.g. another pytest
+        worker) never sees a partly written checkpoint.
+
+        Args:
+            path (str): Where to write the checkpoint to.
+        """
+        directory, filename = os.path.split(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(
+            prefix="." + filename,
+            suffix=".tmp",
+            dir=directory,
+        )
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.as_dict(), f)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """Read a checkpoint from a file written by ``save``.
+
+        Args:
+            path (str): Where to read the checkpoint from.
+        """
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def __repr__(self):
+        return "<Checkpoint {} cookies={} localStorage={}>".format(
+            self.url,
+            len(self.cookies),
+            len(self.local_storage),
+        )
+
+
+class CheckpointStore(object):
+    """Checkpoints of setups, by the name of the setup.
+
+    This is what the ``pypcom_checkpoints`` fixture provides. The first time
+    a setup is asked for, it's run through the UI, and the state it left the
+    session in is captured. Every time after that, the state is restored
+    instead::
+
+        def test_dashboard(driver, pypcom_checkpoints):
+            page = DashboardPage(driver)
+            pypcom_checkpoints.restore_or_run(
+                "logged_in",
+                page,
+                lambda: LoginPage(driver).log_in("me", "secret"),
+            )
+
+    Args:
+        directory (str): Where to save the checkpoints, so they can be used
+            across processes and runs (they're only kept in memory if
+            ``None``). Anything saved there is trusted until it's deleted.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._checkpoints = {}
+
+    def _get_path(self, name):
+        filename = re.sub(r"[^\w.-]", "_", name) + ".json"
+        return os.path.join(self.directory, filename)
+
+    def get(self, name):
+        """Get the checkpoint of a setup, if there is one.
+
+        Args:
+            name (str): The name of the setup.
+        """
+        checkpoint = self._checkpoints.get(name)
+        if checkpoint is None and self.directory is not None:
+            path = self._get_path(name)
+            if os.path.exists(path):
+                checkpoint = self._checkpoints[name] = Checkpoint.load(path)
+        return checkpoint
+
+    def put(self, name, checkpoint):
+        """Keep the checkpoint of a setup.
+
+        Args:
+            name (str): The name of the setup.
+            checkpoint (Checkpoint): The state the setup left the session in.
+        """
+        self._checkpoints[name] = checkpoint
+        if self.directory is not None:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            checkpoint.save(self._get_path(name))
+
+    def restore_or_run(self, name, page, setup):
+        """Restore the state of a setup, or run it if it hasn't been yet.
+
+        Args:
+            name (str): The name of the setup.
+            page (Page): The page whose driver the state goes into.
+            setup (callable): What sets the state up through the UI.
+
+        Returns:
+            Checkpoint: The state of the setup.
+        """
+        checkpoint = self.get(name)
+        if checkpoint is not None:
+            page.restore(checkpoint)
+            return checkpoint
+        setup()
+        checkpoint = page.checkpoint()
+        self.put(name, checkpoint)
+        return checkpoint
@@ -1,7 +1,10 @@
 """Common component templates."""
 
 from pypcom.common.iframe import Iframe
+from pypcom.common.collection import Collection, VirtualScrollCollection
 
 __all__ = [
     "Iframe",
+    "Collection",
+    "VirtualScrollCollection",
 ]
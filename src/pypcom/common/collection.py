@@ -0,0 +1,472 @@
+"""Template component class for collections of items (e.g. table rows)."""
+
+import csv
+import json
+
+from pypcom import PageComponent as PC
+from pypcom.batch import run_in_iframe
+from pypcom.facts import SCRIPT_HELPERS, get_script_target, translate_locator
+
+
+READ_ITEMS_HELPER = r"""
+function readItems(items, fields) {
+    return items.map(function (item) {
+        return fields.map(function (field) {
+            var el = field[0] ? item.querySelector(field[0]) : item;
+            if (!el) {
+                return null;
+            }
+            return field[1] ? getAttribute(el, field[1]) : getText(el);
+        });
+    });
+}
+"""
+
+READ_ROWS_SCRIPT = SCRIPT_HELPERS + READ_ITEMS_HELPER + r"""
+var container = resolve(arguments[0]), itemStep = arguments[1];
+var start = arguments[2], count = arguments[3], fields = arguments[4];
+if (!container) {
+    return null;
+}
+return readItems(
+    findAll(container, itemStep).slice(start, start + count),
+    fields
+);
+"""
+
+SCROLL_AND_READ_SCRIPT = SCRIPT_HELPERS + READ_ITEMS_HELPER + r"""
+var done = arguments[arguments.length - 1];
+var container = resolve(arguments[0]), itemStep = arguments[1];
+var fields = arguments[2], scrollTarget = arguments[3];
+var step = arguments[4], settle = arguments[5], fromTop = arguments[6];
+if (!container) {
+    done(null);
+    return;
+}
+var scroller = scrollTarget ? resolve(scrollTarget) : container;
+function afterRender(callback) {
+    requestAnimationFrame(function () {
+        requestAnimationFrame(function () {
+            setTimeout(callback, settle);
+        });
+    });
+}
+function readAndScroll() {
+    var rows = readItems(findAll(container, itemStep), fields);
+    var before = scroller.scrollTop;
+    scroller.scrollTop = before + (step || scroller.clientHeight);
+    var atEnd = scroller.scrollTop <= before;
+    afterRender(function () {
+        done({rows: rows, atEnd: atEnd});
+    });
+}
+if (fromTop && scroller.scrollTop !== 0) {
+    scroller.scrollTop = 0;
+    afterRender(readAndScroll);
+} else {
+    readAndScroll();
+}
+"""
+
+
+class Collection(PC):
+    """Collection base class.
+
+    Some components are really just a container for a (potentially huge)
+    number of items that all have the same structure, like the rows of a
+    table. Making a component for each item, and reading each of their fields
+    one at a time, costs several WebDriver commands per item, and holds onto
+    everything that's been read. This class is designed to read the data of
+    the items in bulk instead, a chunk of items at a time, with only one script
+    per chunk, and to stream that data out as plain tuples so memory use stays
+    the same no matter how many items there are.
+
+    The ``_locator`` of the collection should find the container, and the
+    ``_item_locator`` should find each item inside the container (it must be
+    either a CSS selector or an XPath). ``_fields`` describes the data to read
+    from each item, as a sequence of ``(name, selector, attribute)`` tuples:
+
+    * ``name`` is the name of the field.
+    * ``selector`` is a CSS selector for the element inside the item to read
+      from (``None`` to read from the item itself).
+    * ``attribute`` is the name of the attribute to read (``None`` to read the
+      element's text).
+
+    ``selector`` and ``attribute`` can be left off if they're ``None``.
+
+    Example:
+
+    .. code-block::
+
+        class CarTable(Collection):
+            _locator = (By.CSS_SELECTOR, ".carTable")
+            _item_locator = (By.CSS_SELECTOR, "tbody tr")
+            _fields = (
+                ("id", "td:nth-of-type(1) input", "value"),
+                ("make", "td:nth-of-type(2)"),
+                ("model", "td:nth-of-type(3)"),
+                ("year", "td:nth-of-type(4)"),
+                ("color", "td:nth-of-type(5)"),
+            )
+
+    Example:
+
+    .. code-block::
+
+        for car_id, make, model, year, color in page.car_table.iter_rows():
+            ...
+        with open("cars.csv", "w", newline="") as f:
+            page.car_table.write_csv(f, chunk_size=1000)
+    """
+
+    _item_locator = None
+    _fields = ()
+
+    @property
+    def field_names(self):
+        """The names of the fields read from each item, in order."""
+        return tuple(field[0] for field in self._fields)
+
+    def _get_field_specs(self, fields=None):
+        """Get the ``(selector, attribute)`` pair for each field to read.
+
+        Args:
+            fields (list): Names of the fields to read (all of them if
+                ``None``).
+        """
+        specs = {}
+        for field in self._fields:
+            field = tuple(field) + (None, None)
+            specs[field[0]] = [field[1], field[2]]
+        if fields is None:
+            fields = self.field_names
+        try:
+            return [specs[name] for name in fields]
+        except KeyError as e:
+            raise KeyError(
+                "'{}' has no field {}".format(self.__class__.__name__, e),
+            )
+
+    def _get_item_step(self):
+        if self._item_locator is None:
+            raise AttributeError(
+                "Component must have _item_locator to be read as a "
+                "collection.",
+            )
+        step = translate_locator(self._item_locator)
+        if step is None:
+            raise ValueError(
+                "_item_locator must be a CSS selector or an XPath, not "
+                "'{}'".format(self._item_locator[0]),
+            )
+        return step
+
+    def read_rows(self, start, count, fields=None):
+        """Read the fields of a slice of the items with a single script.
+
+        Args:
+            start (int): Index of the first item to read.
+            count (int): The most items to read.
+            fields (list): Names of the fields to read (all of them if
+                ``None``).
+
+        Returns:
+            list: A list of field values for each item that was read.
+        """
+        from selenium.common.exceptions import NoSuchElementException
+
+        item_step = self._get_item_step()
+        specs = self._get_field_specs(fields)
+
+        def read():
+            return self.driver.execute_script(
+                READ_ROWS_SCRIPT,
+                get_script_target(self),
+                item_step,
+                start,
+                count,
+                specs,
+            )
+
+        rows = run_in_iframe(self.iframe_ancestor, read, self.driver)
+        if rows is None:
+            raise NoSuchElementException(
+                "Element for '{}' was not present".format(
+                    self.__class__.__name__,
+                ),
+            )
+        return rows
+
+    def iter_rows(self, chunk_size=500, fields=None):
+        """Stream the fields of every item, reading a chunk at a time.
+
+        Each chunk is read with a single script, and only one chunk is held
+        in memory at a time.
+
+        Args:
+            chunk_size (int): How many items to read with each script.
+            fields (list): Names of the fields to read (all of them if
+                ``None``).
+
+        Yields:
+            tuple: The field values of each item, in order.
+        """
+        start = 0
+        while True:
+            rows = self.read_rows(start, chunk_size, fields)
+            for row in rows:
+                yield tuple(row)
+            if len(rows) < chunk_size:
+                return
+            start += chunk_size
+
+    def read_columns(self, fields=None, chunk_size=500):
+        """Read the fields of every item, as a column for each field.
+
+        Args:
+            fields (list): Names of the fields to read (all of them if
+                ``None``).
+            chunk_size (int): How many items to read with each script.
+
+        Returns:
+            dict: A list of the values of each field, by field name.
+        """
+        if fields is None:
+            fields = self.field_names
+        columns = [[] for _ in fields]
+        for row in self.iter_rows(chunk_size, fields):
+            for column, value in zip(columns, row):
+                column.append(value)
+        return dict(zip(fields, columns))
+
+    def count_items(self):
+        """Count how many items are in the collection."""
+        return len(self.find_elements(*self._item_locator))
+
+    def write_jsonl(self, fp, chunk_size=500, fields=None):
+        """Write every item to a file as JSON lines, streaming as it goes.
+
+        Args:
+            fp (file): The text file to write to.
+            chunk_size (int): How many items to read with each script.
+            fields (list): Names of the fields to write (all of them if
+                ``None``).
+
+        Returns:
+            int: How many items were written.
+        """
+        names = fields if fields is not None else self.field_names
+        return write_jsonl(self.iter_rows(chunk_size, fields), fp, names)
+
+    def write_csv(self, fp, chunk_size=500, fields=None, header=True):
+        """Write every item to a file as CSV, streaming as it goes.
+
+        Args:
+            fp (file): The text file to write to (opened with ``newline=""``).
+            chunk_size (int): How many items to read with each script.
+            fields (list): Names of the fields to write (all of them if
+                ``None``).
+            header (bool): Whether or not to write the field names first.
+
+        Returns:
+            int: How many items were written.
+        """
+        names = fields if fields is not None else self.field_names
+        return write_csv(
+            self.iter_rows(chunk_size, fields),
+            fp,
+            names if header else None,
+        )
+
+
+class VirtualScrollCollection(Collection):
+    """Collection base class for lists and grids that virtualize their items.
+
+    Many large lists and grids only render the items that are currently
+    scrolled into view, so locating the items only ever finds that window of
+    them (and counting them gives the wrong answer). This class reads the
+    items by scrolling through the collection instead. Each step is a single
+    script that reads the fields of every item that's rendered, scrolls
+    further, and waits for the newly scrolled in items to be rendered, so a
+    full read is one scroll-and-read loop, without interacting with any items
+    individually.
+
+    Since the same item may be rendered across several steps, the items are
+    deduplicated using the field named by ``_key_field``, which must uniquely
+    identify each item.
+
+    The ``_locator`` element is scrolled, unless a ``_scroll_locator`` is
+    given (found from the document, rather than the collection). Each step
+    scrolls by ``_scroll_step`` pixels (a full viewport of the scrolled element
+    if ``None``), and then waits two animation frames plus ``_settle_ms``
+    milliseconds for the items to render. If the end isn't reached within
+    ``_max_scroll_steps`` steps, reading the items fails, rather than
+    silently stopping short.
+
+    Example:
+
+    .. code-block::
+
+        class OrderGrid(VirtualScrollCollection):
+            _locator = (By.CSS_SELECTOR, ".order-grid .viewport")
+            _item_locator = (By.CSS_SELECTOR, ".row")
+            _key_field = "id"
+            _fields = (
+                ("id", None, "data-order-id"),
+                ("customer", ".customer"),
+                ("total", ".total"),
+            )
+    """
+
+    _key_field = None
+    _scroll_locator = None
+    _scroll_step = None
+    _settle_ms = 50
+    _max_scroll_steps = 10000
+
+    def scroll_and_read(self, fields=None, from_top=False):
+        """Read every rendered item, and then scroll the next ones into view.
+
+        Args:
+            fields (list): Names of the fields to read (all of them if
+                ``None``).
+            from_top (bool): Whether or not to scroll back to the top before
+                reading.
+
+        Returns:
+            tuple: The field values of each rendered item, and whether or not
+                the end had already been reached (i.e. it couldn't scroll any
+                further).
+        """
+        from selenium.common.exceptions import NoSuchElementException
+
+        item_step = self._get_item_step()
+        specs = self._get_field_specs(fields)
+        scroll_target = None
+        if self._scroll_locator is not None:
+            scroll_step = translate_locator(self._scroll_locator)
+            if scroll_step is None:
+                raise ValueError(
+                    "_scroll_locator must be a CSS selector or an XPath, not "
+                    "'{}'".format(self._scroll_locator[0]),
+                )
+            scroll_target = [scroll_step]
+
+        def read():
+            return self.driver.execute_async_script(
+                SCROLL_AND_READ_SCRIPT,
+                get_script_target(self),
+                item_step,
+                specs,
+                scroll_target,
+                self._scroll_step,
+                self._settle_ms,
+                from_top,
+            )
+
+        result = run_in_iframe(self.iframe_ancestor, read, self.driver)
+        if result is None:
+            raise NoSuchElementException(
+                "Element for '{}' was not present".format(
+                    self.__class__.__name__,
+                ),
+            )
+        return result["rows"], result["atEnd"]
+
+    def iter_rows(self, chunk_size=None, fields=None):
+        """Stream the fields of every item, scrolling through the collection.
+
+        This starts from the top of the collection, and each scroll step is a
+        single script. Only the keys of the items that have already been seen
+        are held in memory.
+
+        Args:
+            chunk_size (int): Unused, as the number of items read with each
+                script is however many are rendered at once. It's accepted so
+                the writers work the same way for every collection.
+            fields (list): Names of the fields to read (all of them if
+                ``None``).
+
+        Yields:
+            tuple: The field values of each item, in the order they were
+                scrolled into view.
+
+        Raises:
+            RuntimeError: If the end still hadn't been reached after
+                ``_max_scroll_steps`` steps (after the items that were read
+                have been yielded).
+        """
+        if self._key_field is None:
+            raise AttributeError(
+                "Component must have _key_field to be read by scrolling.",
+            )
+        if fields is None:
+            fields = self.field_names
+        fields = list(fields)
+        read_fields = fields
+        if self._key_field not in fields:
+            read_fields = fields + [self._key_field]
+        key_index = read_fields.index(self._key_field)
+        width = len(fields)
+
+        seen = set()
+        for step in range(self._max_scroll_steps):
+            rows, at_end = self.scroll_and_read(read_fields, step == 0)
+            for row in rows:
+                key = row[key_index]
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield tuple(row[:width])
+            if at_end:
+                return
+        raise RuntimeError(
+            "Didn't reach the end of '{}' within {} scroll steps".format(
+                self.__class__.__name__,
+                self._max_scroll_steps,
+            ),
+        )
+
+    def count_items(self):
+        """Count how many items are in the collection by scrolling through."""
+        return sum(1 for _ in self.iter_rows(fields=[self._key_field]))
+
+
+def write_jsonl(rows, fp, field_names):
+    """Write rows to a file as one JSON object per line.
+
+    Args:
+        rows (iterable): Tuples of field values.
+        fp (file): The text file to write to.
+        field_names (list): The name of each field in the rows.
+
+    Returns:
+        int: How many rows were written.
+    """
+    count = 0
+    for row in rows:
+        fp.write(json.dumps(dict(zip(field_names, row))))
+        fp.write("\n")
+        count += 1
+    return count
+
+
+def write_csv(rows, fp, field_names=None):
+    """Write rows to a file as CSV.
+
+    Args:
+        rows (iterable): Tuples of field values.
+        fp (file): The text file to write to.
+        field_names (list): The header row to write first, if any.
+
+    Returns:
+        int: How many rows were written.
+    """
+    writer = csv.writer(fp)
+    if field_names is not None:
+        writer.writerow(field_names)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
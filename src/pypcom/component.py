@@ -1,12 +1,329 @@
 """This module just contains the base class for components."""
 
+import inspect
+import weakref
 from contextlib import contextmanager
 
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support.color import Color
-from selenium.common.exceptions import NoSuchElementException
-
 from pypcom import expected_conditions
+from pypcom.driver_state import get_driver_state
+from pypcom.tracing import component_span
+
+# Selenium is only imported once a component actually needs it, so importing
+# page objects (and pypcom itself) stays cheap.
+
+
+#: Methods of a ``WebElement`` that change the page, so anything that was read
+#: from the page before they're called may no longer be accurate.
+WRITE_METHODS = frozenset(["click", "send_keys", "clear", "submit"])
+
+
+def _ref(obj):
+    """Make a reference to the object that won't keep it alive, if possible.
+
+    Objects that can't be weakly referenced (e.g. ``None``) are referenced
+    normally.
+    """
+    try:
+        return weakref.ref(obj)
+    except TypeError:
+        return lambda: obj
+
+
+def iter_component_descriptors(cls):
+    """Get the name and instance of each ``PageComponent`` declared on a class.
+
+    Components declared on base classes are included, in the order they were
+    declared, and components overridden by subclasses are only included once.
+
+    Args:
+        cls (type): The ``Page`` or ``PageComponent`` class to look through.
+    """
+    seen = {}
+    for klass in reversed(inspect.getmro(cls)):
+        for name, value in vars(klass).items():
+            if isinstance(value, PageComponent):
+                seen.pop(name, None)
+                seen[name] = value
+            elif name in seen:
+                seen.pop(name)
+    return list(seen.items())
+
+
+# How an attribute of a ``WebElement`` is deferred to by ``__getattr__``.
+_PROPERTY = "property"
+_METHOD = "method"
+
+# The kind of each public attribute of a ``WebElement``, built the first time
+# it's needed.
+_element_dispatch = None
+
+# The dispatch table of each component class.
+_dispatch_tables = weakref.WeakKeyDictionary()
+
+
+def _get_element_dispatch():
+    """Get the kind of each public attribute of a ``WebElement``."""
+    global _element_dispatch
+    if _element_dispatch is None:
+        from selenium.webdriver.remote.webelement import WebElement
+
+        dispatch = {}
+        for name in dir(WebElement):
+            if name.startswith("_"):
+                continue
+            value = inspect.getattr_static(WebElement, name)
+            if isinstance(value, property):
+                dispatch[name] = _PROPERTY
+            elif callable(value):
+                dispatch[name] = _METHOD
+        _element_dispatch = dispatch
+    return _element_dispatch
+
+
+def get_dispatch_table(cls):
+    """Get how a component class defers each ``WebElement`` attribute.
+
+    This is built once for each class. Classes that override ``_el`` (e.g. to
+    wrap the ``WebElement`` in a ``Select``) can't be assumed to have the
+    attributes of a ``WebElement``, so their table is empty, and every lookup
+    through them is done without any assumptions.
+
+    Args:
+        cls (type): The ``PageComponent`` class.
+
+    Returns:
+        dict: The kind of attribute (property or method) for each name.
+    """
+    try:
+        return _dispatch_tables[cls]
+    except KeyError:
+        pass
+    if cls._el is PageComponent._el:
+        table = _get_element_dispatch()
+    else:
+        table = {}
+    _dispatch_tables[cls] = table
+    return table
+
+
+class ElementMethod(object):
+    """A method of a component's ``WebElement``, bound to the component.
+
+    The element is found when this is called, rather than when it's looked
+    up, so the element is only looked up (and the iframe context is only
+    managed) once per call. One of these is made for each method the first
+    time it's looked up through a component, and is kept on the component
+    from then on, so later lookups don't go through ``__getattr__`` at all.
+
+    Args:
+        component (PageComponent): The component the method is bound to.
+        name (str): The name of the method.
+    """
+
+    __slots__ = ("_component", "_name", "_is_write", "__weakref__")
+
+    def __init__(self, component, name):
+        self._component = component
+        self._name = name
+        self._is_write = name in WRITE_METHODS
+
+    def __repr__(self):
+        return "<ElementMethod {}.{}>".format(
+            self._component.__class__.__name__,
+            self._name,
+        )
+
+    def __call__(self, *args, **kwargs):
+        __tracebackhide__ = True
+        component = self._component
+        snapshot = getattr(component._page, "_active_snapshot", None)
+        if snapshot is not None:
+            answered, value = snapshot.read(component, self._name)
+            if answered:
+                return value(*args, **kwargs)
+        with component_span(component, self._name):
+            if self._is_write:
+                component._notify_write()
+            if not component._needs_focus():
+                return component._operate(self._name, args, kwargs)
+            with component.possible_iframe_context():
+                return component._operate(self._name, args, kwargs)
+
+
+def _is_stale(error):
+    from selenium.common.exceptions import StaleElementReferenceException
+
+    return isinstance(error, StaleElementReferenceException)
+
+
+class StaleMetrics(object):
+    """How often a component's elements went stale while it was being used.
+
+    Attributes:
+        stale (int): How many times a stale element was run into.
+        recovered (int): Operations that succeeded after retrying.
+        failed (int): Operations that gave up after running out of retries.
+        relinked (int): How many elements had to be found again in total.
+        by_link (dict): How many times each component in the chain of parents
+            it's found through (see ``_find_from_parent``) had gone stale, by
+            class name.
+    """
+
+    def __init__(self):
+        self.stale = 0
+        self.recovered = 0
+        self.failed = 0
+        self.relinked = 0
+        self.by_link = {}
+
+    def as_dict(self):
+        return {
+            "stale": self.stale,
+            "recovered": self.recovered,
+            "failed": self.failed,
+            "relinked": self.relinked,
+            "by_link": dict(self.by_link),
+        }
+
+    def __repr__(self):
+        return "<StaleMetrics stale={} recovered={} failed={}>".format(
+            self.stale,
+            self.recovered,
+            self.failed,
+        )
+
+
+class Binding(object):
+    """A component, along with the place it was referenced through.
+
+    Components are shared by every parent they're declared on, and each time
+    one is referenced, it's bound to the parent it was referenced through. A
+    list of components gathered from around a page (e.g. through
+    ``Page.iter_components``) only knows the last place each one was
+    referenced through, so anything that gathers components to use later
+    (e.g. ``Page.snapshot``) keeps a ``Binding`` of each one instead, and
+    binds the component there again right before it's used.
+
+    Args:
+        component (PageComponent): The component, as it's bound right now.
+
+    Attributes:
+        component (PageComponent): The component.
+        key (tuple): The component, and the components it was referenced
+            through (see ``PageComponent._get_parent_chain``).
+    """
+
+    def __init__(self, component):
+        self.component = component
+        self._parents = []
+        node = component
+        while isinstance(node, PageComponent):
+            parent = node._parent
+            self._parents.append((node, _ref(parent)))
+            node = parent
+        self.key = tuple(node for node, _ in self._parents)
+
+    def bind(self):
+        """Bind the component to the place it was referenced through again.
+
+        Returns:
+            PageComponent: The component.
+        """
+        for node, parent_ref in self._parents:
+            parent = parent_ref()
+            if parent is None:
+                continue
+            current = node._parent_ref
+            if current is None or current() is not parent:
+                node._bind(parent)
+        return self.component
+
+    def __repr__(self):
+        return "<Binding {}>".format(
+            ".".join(type(node).__name__ for node in reversed(self.key)),
+        )
+
+
+def as_binding(component):
+    """Get a ``Binding`` of the component as it's bound right now.
+
+    Args:
+        component (obj): The component (or a ``Binding`` of it, which is
+            returned as is).
+    """
+    if isinstance(component, Binding):
+        return component
+    return Binding(component)
+
+
+# The ``Iframe`` each driver currently has its focus held on by
+# ``iframe_focus``. Entries only exist while the focus is held.
+_focused_iframes = weakref.WeakKeyDictionary()
+
+
+def get_focused_iframe(driver):
+    """Get the ``Iframe`` that the driver's focus is being held on, if any."""
+    try:
+        return _focused_iframes.get(driver)
+    except TypeError:
+        # the driver can't be weakly referenced, so focus isn't tracked for it
+        return None
+
+
+def _set_focused_iframe(driver, iframe):
+    try:
+        if iframe is None:
+            _focused_iframes.pop(driver, None)
+        else:
+            _focused_iframes[driver] = iframe
+    except TypeError:
+        pass
+
+
+@contextmanager
+def iframe_focus(iframe, driver=None):
+    """Context manager that holds the driver's focus on an iframe.
+
+    The focus is switched to the iframe when the context is entered (unless
+    it's already being held there), and when the context exits, it's switched
+    back to wherever it was being held before (or the default content, if it
+    wasn't being held anywhere), even if an exception was raised.
+
+    While the focus is being held, any ``PageComponent`` inside the iframe can
+    be used without switching focus again, so nesting these contexts (e.g. a
+    component inside an iframe being found from its parent) costs nothing
+    extra.
+
+    If ``iframe`` is ``None``, the focus is held on the default content
+    instead, which only costs anything if the focus is being held on an
+    iframe at the time (e.g. a component of the page itself being used inside
+    of ``Iframe.focus``).
+
+    Args:
+        iframe (Iframe): The iframe to hold the focus on, or ``None`` for the
+            default content.
+        driver (WebDriver): The driver to hold the focus of (the iframe's, if
+            ``None``).
+    """
+    if driver is None:
+        driver = iframe.driver
+    previous = get_focused_iframe(driver)
+    if previous is iframe:
+        yield
+        return
+    if iframe is None:
+        driver.switch_to.default_content()
+    else:
+        iframe.switch_to()
+    _set_focused_iframe(driver, iframe)
+    try:
+        yield
+    finally:
+        _set_focused_iframe(driver, previous)
+        if previous is None:
+            driver.switch_to.default_content()
+        else:
+            previous.switch_to()
 
 
 class CssProperties():
@@ -19,10 +336,16 @@ class CssProperties():
     name, the name can be passed as a string to the ``get()`` method.
     """
 
+    _parent_ref = None
+
     def __get__(self, instance, owner):
-        self._parent = instance
+        self._parent_ref = _ref(instance)
         return self
 
+    @property
+    def _parent(self):
+        return self._parent_ref() if self._parent_ref is not None else None
+
     def __getattr__(self, name):
         """Treat the attribute name as the name of the CSS value to lookup."""
         return self.get(name)
@@ -34,11 +357,15 @@ class CssProperties():
     @property
     def color(self):
         """``Color`` object with multiple ways to view color value."""
+        from selenium.webdriver.support.color import Color
+
         return Color.from_string(self._parent.value_of_css_property("color"))
 
     @property
     def background_color(self):
         """``Color`` object for ``backgorund-color`` CSS property of element."""
+        from selenium.webdriver.support.color import Color
+
         return Color.from_string(
             self._parent.value_of_css_property("background-color"),
         )
@@ -100,16 +427,134 @@ class PageComponent(object):
         _find_from_parent (bool): Whether or not to used the parent
             component's element as the jumping off point to find the element
             from.
+        _stale_retries (int): How many times to retry reading from or calling
+            a method of the WebElement if it goes stale (see ``_operate``).
+            This is 2 by default, and can be set to 0 to not retry at all.
+
+    Components are usually shared by every instance of the class they're
+    declared on, so the references they keep to the parent they were
+    referenced through (and its driver) are weak references. This keeps them
+    from holding onto the last page they were referenced through (and its
+    driver) after the page is done with. If the parent was a component that's
+    gone by the time the component is used, a ``ReferenceError`` is raised,
+    rather than looking for the element from the wrong place. Components that
+    are made for a specific parent (e.g. one for each item of a collection),
+    and have their ``_parent`` and ``driver`` set directly, keep normal
+    references to them instead.
     """
 
     _locator = None
     _find_from_parent = False
-    _iframe_ancestor = False
     _is_iframe = False
     _expected_conditions = None
+    _parent_ref = None
+    _parent_component_name = None
+    _driver_ref = None
+    _stale_retries = 2
 
     css = CssProperties()
 
+    @property
+    def _parent(self):
+        """The page/component this component was referenced through.
+
+        Raises:
+            ReferenceError: If it was a component that no longer exists.
+        """
+        if self._parent_ref is None:
+            return None
+        parent = self._parent_ref()
+        if parent is None and self._parent_component_name is not None:
+            raise ReferenceError(
+                "The {} that '{}' was referenced through no longer exists "
+                "(it must be kept around while its components are being "
+                "used)".format(
+                    self._parent_component_name,
+                    self.__class__.__name__,
+                ),
+            )
+        return parent
+
+    @_parent.setter
+    def _parent(self, parent):
+        self._parent_ref = lambda: parent
+        self._parent_component_name = None
+
+    @property
+    def driver(self):
+        """The WebDriver of the page this component was referenced through."""
+        if self._driver_ref is None:
+            return None
+        return self._driver_ref()
+
+    @driver.setter
+    def driver(self, driver):
+        self._driver_ref = lambda: driver
+
+    def _bind(self, instance):
+        """Bind the component to the page/component it's referenced through.
+
+        Only weak references are kept to it and its driver.
+
+        Args:
+            instance (obj): The page/component this component was referenced
+                through.
+        """
+        self._parent_ref = _ref(instance)
+        if isinstance(instance, PageComponent):
+            self._parent_component_name = instance.__class__.__name__
+        else:
+            self._parent_component_name = None
+        self._driver_ref = _ref(instance.driver)
+
+    @property
+    def _page(self):
+        """The page at the top of the chain of parents (if it's still around).
+        """
+        node = self._parent
+        while isinstance(node, PageComponent):
+            node = node._parent
+        return node
+
+    def _get_parent_chain(self):
+        """Get this component and the components it was referenced through.
+
+        Components are shared by every parent they're declared on, so this is
+        what tells apart the places a component is used in (e.g. the same
+        ``Title`` declared on a ``Header`` that's used for both the top and
+        the bottom of a page).
+        """
+        chain = [self]
+        node = self._parent
+        while isinstance(node, PageComponent):
+            chain.append(node)
+            node = node._parent
+        return tuple(chain)
+
+    def _get_element_cache(self):
+        """Get the element cache of this component's driver.
+
+        Anything cached about the elements of a page is kept with the driver
+        (see ``pypcom.driver_state``), so it's shared by every page made for
+        the same driver (but never with another driver), and goes away along
+        with the driver. If the component isn't bound to a driver, this
+        returns ``None``, and nothing should be cached.
+        """
+        state = get_driver_state(self.driver)
+        if state is None:
+            return None
+        return state.element_cache
+
+    def _notify_write(self):
+        """Let the page know something is being written through this component.
+
+        This gives the page a chance to throw away anything it was holding onto
+        that may no longer be accurate (e.g. an active ``Snapshot``).
+        """
+        on_write = getattr(self._page, "_on_component_write", None)
+        if on_write is not None:
+            on_write(self)
+
     @property
     def _reference_node(self):
         if self._find_from_parent and isinstance(self._parent, PageComponent):
@@ -134,8 +579,7 @@ class PageComponent(object):
             owner (obj): The manager class that this component is a descriptor
                 for.
         """
-        self._parent = instance
-        self.driver = self._parent.driver
+        self._bind(instance)
         return self
 
     def __set__(self, instance, value):
@@ -164,15 +608,16 @@ class PageComponent(object):
                 component is a descriptor for (i.e. the parent component).
             value (str): The keys that should be sent to the WebElement.
         """
-        self._parent = instance
-        self.driver = self._parent.driver
+        self._bind(instance)
         if self._locator is None:
             raise AttributeError(
                 "Component must have _locator to be treated as an element.",
             )
 
-        with self.possible_iframe_context():
-            self.send_keys(value)
+        with component_span(self, "__set__"):
+            self._notify_write()
+            with self.possible_iframe_context():
+                self.send_keys(value)
 
     def __getattr__(self, name):
         """Defer the attribute lookup to the WebElement for this component.
@@ -199,11 +644,39 @@ class PageComponent(object):
         that component, and if the lookup for it failed in this way, it was
         because it wasn't properly defined in the component's class.
 
+        If the page has an active ``Snapshot`` (see ``Page.snapshot``) that
+        includes this component, reads it can answer are answered from it
+        instead. Calling any of the ``WRITE_METHODS`` lets the page know that
+        something is being written through this component.
+
+        Known ``WebElement`` attributes are looked up in the class's dispatch
+        table (see ``get_dispatch_table``), so properties are read without
+        any checks, and methods are returned as an ``ElementMethod`` that's
+        kept on the component for later lookups. The iframe context is only
+        managed if the focus actually has to be moved (see
+        ``possible_iframe_context``).
+
         Args:
             name (str): Name of the attribute to lookup.
         """
         __tracebackhide__ = True
-        with self.possible_iframe_context():
+        snapshot = getattr(self._page, "_active_snapshot", None)
+        if snapshot is not None:
+            answered, value = snapshot.read(self, name)
+            if answered:
+                return value
+        kind = get_dispatch_table(type(self)).get(name)
+        if kind is _METHOD:
+            method = self.__dict__[name] = ElementMethod(self, name)
+            return method
+        if kind is _PROPERTY:
+            with component_span(self, name):
+                if not self._needs_focus():
+                    return self._operate(name)
+                with self.possible_iframe_context():
+                    return self._operate(name)
+        is_write = name in WRITE_METHODS
+        with component_span(self, name), self.possible_iframe_context():
             el = object.__getattribute__(self, "_el")
             try:
                 attr = getattr(el, name)
@@ -213,8 +686,11 @@ class PageComponent(object):
                         # otherwise be evaluated and return, exiting the
                         # context, before actually getting called, which would
                         # make it stale.
-                        with self.possible_iframe_context():
-                            return attr(*args, **kwargs)
+                        with component_span(self, name):
+                            if is_write:
+                                self._notify_write()
+                            with self.possible_iframe_context():
+                                return attr(*args, **kwargs)
                     return attr_wrapper
 
                 return attr
@@ -235,6 +711,134 @@ class PageComponent(object):
             )
         return self._reference_node.find_element(*self._locator)
 
+    @property
+    def stale_metrics(self):
+        """``StaleMetrics`` for how often this component's elements went stale.
+
+        They're kept by the page this component was referenced through (see
+        ``Page.stale_metrics``), so they only cover what happened through
+        that page. Components that aren't attached to a page keep their own.
+        """
+        metrics_by_component = getattr(self._page, "_stale_metrics", None)
+        if metrics_by_component is None:
+            metrics_by_component = self.__dict__.setdefault(
+                "_pypcom_stale_metrics",
+                {},
+            )
+        metrics = metrics_by_component.get(self)
+        if metrics is None:
+            metrics = metrics_by_component[self] = StaleMetrics()
+        return metrics
+
+    def _element_chain(self):
+        """Get the components that are found one from the other to find this.
+
+        The first component is found on its own (through its ``_el``), and
+        each one after it is found by searching from the element of the one
+        before it (see ``_find_from_parent``). This component is last.
+        """
+        chain = [self]
+        node = self
+        while (
+            node._find_from_parent
+            and node._locator is not None
+            and type(node)._el is PageComponent._el
+        ):
+            parent = node._parent
+            if not isinstance(parent, PageComponent) or parent._is_iframe:
+                break
+            chain.append(parent)
+            node = parent
+        chain.reverse()
+        return chain
+
+    def _operate(self, name, args=None, kwargs=None):
+        """Read an attribute of the WebElement, or call one of its methods.
+
+        If the page prefetched the element (see ``Page.prefetch``), that's
+        used instead of finding it. If an element goes stale along the way,
+        it's retried up to ``_stale_retries`` times. Only the element that
+        went stale, and the ones found from it, are found again (the parents
+        it was found from are reused), and if that fails because the parent
+        it's found from has gone stale as well, the retry moves up to that
+        parent, and so on.
+
+        Args:
+            name (str): Name of the attribute to read, or method to call.
+            args (tuple): Positional arguments to call the method with
+                (``None`` to read the attribute).
+            kwargs (dict): Keyword arguments to call the method with.
+        """
+        __tracebackhide__ = True
+        take_prefetched = getattr(self._page, "_take_prefetched_element", None)
+        el = take_prefetched(self) if take_prefetched is not None else None
+        if el is not None:
+            try:
+                attr = getattr(el, name)
+                if args is not None:
+                    attr = attr(*args, **(kwargs or {}))
+                return attr
+            except Exception as e:
+                # a prefetched element that's gone stale is just found again
+                if not _is_stale(e):
+                    raise
+        if not self._find_from_parent:
+            chain = None
+            elements = None
+        else:
+            chain = self._element_chain()
+            elements = []
+        retries = self._stale_retries
+        metrics = None
+        attempt = 0
+        start = 0
+        while True:
+            # where the operation was when it failed (an index into the chain
+            # while elements are being found, and past the end after that)
+            step = 0
+            try:
+                if chain is None:
+                    el = self._el
+                    step = 1
+                else:
+                    del elements[start:]
+                    for step in range(start, len(chain)):
+                        if step:
+                            el = elements[-1].find_element(
+                                *chain[step]._locator
+                            )
+                        else:
+                            el = chain[0]._el
+                        elements.append(el)
+                    step = len(chain)
+                attr = getattr(el, name)
+                if args is not None:
+                    attr = attr(*args, **(kwargs or {}))
+            except Exception as e:
+                if not _is_stale(e):
+                    raise
+                # the element that was being used when it failed is the one
+                # that went stale, and it has to be found again
+                start = max(0, step - 1)
+                if metrics is None:
+                    metrics = self.stale_metrics
+                metrics.stale += 1
+                link = self if chain is None else chain[start]
+                link_name = link.__class__.__name__
+                metrics.by_link[link_name] = metrics.by_link.get(
+                    link_name,
+                    0,
+                ) + 1
+                if attempt >= retries:
+                    metrics.failed += 1
+                    raise
+                attempt += 1
+                metrics.relinked += 1 if chain is None else len(chain) - start
+                continue
+            if attempt:
+                metrics.recovered += 1
+            return attr
+
     def _get_wait_condition_callable(self, condition, **kwargs):
         """Given a string, find the callable associated with it.
 
@@ -303,11 +907,22 @@ class PageComponent(object):
 
         Lookups for expected conditions are either explicitely
 
+        If the page remembers conditions (see ``Page._condition_ttl``), a
+        condition that was met (or not met) recently isn't waited for again,
+        and what the wait returned last time is returned.
+
         Args:
             wait_bool (bool): Whether the condition should be met or not met.
             condition (str): The condition to be met/not met.
             timout (int): The maximum number of seconds to wait before failing.
         """
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        memo, key = self._get_condition_memo(condition, wait_bool, kwargs)
+        if memo is not None:
+            met, value = memo.get(key)
+            if met:
+                return value
         condition_callable = self._get_wait_condition_callable(condition, **kwargs)
 
         wait = WebDriverWait(
@@ -316,10 +931,47 @@ class PageComponent(object):
             poll_frequency=0.1,
         )
         until_method = wait.until if wait_bool else wait.until_not
-        with self.possible_iframe_context():
-            return until_method(
-                condition_callable,
-            )
+        operation = "wait_until" if wait_bool else "wait_until_not"
+        with component_span(self, operation, "wait"):
+            with self.possible_iframe_context():
+                value = until_method(
+                    condition_callable,
+                )
+        if memo is not None:
+            memo.put(key, value)
+        return value
+
+    def _get_condition_memo(self, condition, met, kwargs=None):
+        """Get the page's ``ConditionMemo``, and the key for a condition in it.
+
+        Only conditions that are looked up by name (see
+        ``_get_wait_condition_callable``) can be remembered.
+
+        Args:
+            condition (str): The name of the condition.
+            met (bool): Whether the condition is met, or not met.
+            kwargs (dict): Any extra keyword arguments for the condition.
+
+        Returns:
+            tuple: The memo and the key, or ``(None, None)`` if the condition
+                can't be remembered.
+        """
+        if not isinstance(condition, str):
+            return None, None
+        memo = getattr(self._page, "_condition_memo", None)
+        if memo is None:
+            return None, None
+        key = (
+            self._get_parent_chain(),
+            condition,
+            met,
+            tuple(sorted((kwargs or {}).items())),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None, None
+        return memo, key
 
     def is_present(self):
         """Query the element to find if it is present or not.
@@ -337,14 +989,47 @@ class PageComponent(object):
         any new behavior for the ``WebElement`` lookup if this is the case, but
         will also work if the standard behavior hasn't been overridden.
         """
+        from selenium.common.exceptions import NoSuchElementException
+
         try:
             self.is_displayed()
         except NoSuchElementException:
             return False
         return True
 
+    def watch(self, attributes=(), text=True, poll_seconds=5, batch_ms=50):
+        """Watch the element for changes, instead of polling it.
+
+        A ``MutationObserver`` is registered on the element, which buffers the
+        changes in the browser, and they're drained with long-polling async
+        scripts (see ``pypcom.watch``).
+
+        Example::
+
+            with page.order_status.watch(attributes=["class"]) as watch:
+                for event in watch.events(duration=10):
+                    if event.value == "Shipped":
+                        break
+
+        Args:
+            attributes (iterable): Names of the attributes to watch.
+            text (bool): Whether or not to watch the element's text.
+            poll_seconds (float): The longest each poll waits in the browser
+                for something to change.
+            batch_ms (int): How long to wait for more changes once one has
+                been made, so changes made together are delivered together.
+
+        Returns:
+            Watch: The started watch, which can be iterated over (normally or
+                asynchronously) for each ``ChangeEvent``.
+        """
+        from pypcom.watch import Watch
+
+        return Watch(self, attributes, text, poll_seconds, batch_ms).start()
+
     def remove_from_dom(self):
         """Remove the element from the DOM."""
+        self._notify_write()
         self.driver.execute_script(
             "arguments[0].parentElement.removeChild(arguments[0])",
             self._el,
@@ -358,22 +1043,17 @@ class PageComponent(object):
         that is of type ``Iframe``. If one is found, return it. If none are
         found, return ``None``.
 
-        This also caches the ancestor the first time it's searched for (as it
-        shouldn't be changing), which will speed up further references to it.
+        It's looked for every time, rather than being remembered, as
+        components are shared by every parent they're declared on, so the same
+        component can be inside one iframe where it's used in one place, and
+        inside another (or none at all) somewhere else.
         """
-        if self._iframe_ancestor is False:
-            self._iframe_ancestor = None
-            ancestor = self._parent
-            while issubclass(ancestor.__class__, PageComponent):
-                if ancestor._is_iframe:
-                    self._iframe_ancestor = ancestor
-                    break
-                if hasattr(ancestor, "_parent"):
-                    ancestor = ancestor._parent
-                else:
-                    ancestor = None
-
-        return self._iframe_ancestor
+        ancestor = self._parent
+        while isinstance(ancestor, PageComponent):
+            if ancestor._is_iframe:
+                return ancestor
+            ancestor = ancestor._parent
+        return None
 
     @contextmanager
     def possible_iframe_context(self):
@@ -389,9 +1069,21 @@ class PageComponent(object):
         to the default content without interferring with how the exception is
         handled, and without having to put a bunch of try/except/finally blocks
         everywhere.
+
+        If the focus is already being held on the iframe (see
+        ``iframe_focus``), nothing is switched. If the component isn't inside
+        an iframe, but the focus is being held on one, the focus is switched
+        to the default content, and back to that iframe afterwards.
         """
-        if self.iframe_ancestor:
-            self.iframe_ancestor.switch_to()
-        yield
-        if self.iframe_ancestor:
-            self.driver.switch_to.default_content()
+        if not self._needs_focus():
+            yield
+            return
+        with iframe_focus(self.iframe_ancestor, self.driver):
+            yield
+
+    def _needs_focus(self):
+        """Whether or not the focus has to be moved to use the element."""
+        iframe = self.iframe_ancestor
+        if iframe is not None:
+            return get_focused_iframe(self.driver) is not iframe
+        return get_focused_iframe(self.driver) is not None
@@ -0,0 +1,232 @@
+"""Expected conditions that are checked in the browser with a single script.
+
+A custom condition made of several checks (e.g. "visible, and has the text
+'Done', and isn't disabled") written as a Python callable sends a WebDriver
+command for each check, every time the wait polls. The conditions here are
+compiled into a single JavaScript predicate instead, so each poll is a single
+``execute_script`` call, no matter how many checks are combined::
+
+    from pypcom.conditions import (
+        all_of,
+        has_attribute,
+        has_text,
+        not_,
+        visible,
+    )
+
+    class SaveButton(PC):
+        _locator = ("id", "save")
+        _expected_conditions = {
+            "saved": all_of(
+                visible(),
+                has_text("Saved"),
+                not_(has_attribute("disabled")),
+            ),
+        }
+
+    page.save_button.wait_until("saved")
+
+They can also be passed to ``wait_until``/``wait_until_not`` directly. When a
+condition is met, the wait returns the element (or ``True`` if it's met
+without one, e.g. ``not_(present())``).
+
+The checks are done the same way ``pypcom.facts`` reads facts in bulk, so
+``visible()`` and ``has_text()`` are close approximations of what Selenium
+reports, rather than exact copies (see ``pypcom.facts``).
+"""
+
+from pypcom.facts import SCRIPT_HELPERS, get_script_target
+
+
+CONDITION_SCRIPT = SCRIPT_HELPERS + r"""
+var el = resolve(arguments[0]), p = arguments[1];
+var met = (%s);
+return met ? (el || true) : false;
+"""
+
+
+class BrowserCondition(object):
+    """A condition that's checked in the browser.
+
+    Each condition is a JavaScript expression over ``el`` (the component's
+    element, or ``null`` if it isn't present), and the parameters it needs,
+    which are passed to the script as ``p`` rather than written into it.
+
+    This is a precursor for a component's condition (see
+    ``PageComponent._get_wait_condition_callable``), so it can be put in
+    ``_expected_conditions``, or passed to ``wait_until`` directly.
+
+    Args:
+        expression (str): The JavaScript expression, with ``{}`` in place of
+            each parameter.
+        params (tuple): The parameters.
+        name (str): What to call the condition.
+    """
+
+    def __init__(self, expression, params=(), name=None):
+        self._expression = expression
+        self._params = tuple(params)
+        self.name = name or expression
+        self._script = None
+        self._script_params = None
+
+    def compile(self, params):
+        """Get the JavaScript expression for the condition.
+
+        Args:
+            params (list): The parameters of the whole script, which this
+                condition's parameters are added to.
+
+        Returns:
+            str: The expression.
+        """
+        references = []
+        for param in self._params:
+            references.append("p[{}]".format(len(params)))
+            params.append(param)
+        return "({})".format(self._expression.format(*references))
+
+    def get_script(self):
+        """Get the script that checks the condition, and its parameters.
+
+        The script is only compiled once.
+        """
+        if self._script is None:
+            params = []
+            self._script = CONDITION_SCRIPT % self.compile(params)
+            self._script_params = params
+        return self._script, self._script_params
+
+    def __call__(self, component, **kwargs):
+        script, params = self.get_script()
+
+        def condition(driver):
+            # the wait may pass the parent the component is found from
+            # instead of the driver
+            return component.driver.execute_script(
+                script,
+                get_script_target(component),
+                params,
+            )
+        return condition
+
+    def __repr__(self):
+        return "<BrowserCondition {}>".format(self.name)
+
+
+class _Combined(BrowserCondition):
+
+    def __init__(self, operator, conditions, name):
+        super(_Combined, self).__init__(None, name=name)
+        self._operator = operator
+        self._conditions = conditions
+
+    def compile(self, params):
+        return "({})".format(
+            " {} ".format(self._operator).join(
+                condition.compile(params) for condition in self._conditions
+            ),
+        )
+
+
+def all_of(*conditions):
+    """Met when every one of the conditions is met."""
+    return _Combined(
+        "&&",
+        conditions,
+        "all_of({})".format(", ".join(c.name for c in conditions)),
+    )
+
+
+def any_of(*conditions):
+    """Met when any one of the conditions is met."""
+    return _Combined(
+        "||",
+        conditions,
+        "any_of({})".format(", ".join(c.name for c in conditions)),
+    )
+
+
+class _Not(BrowserCondition):
+
+    def __init__(self, condition):
+        super(_Not, self).__init__(
+            None,
+            name="not_({})".format(condition.name),
+        )
+        self._condition = condition
+
+    def compile(self, params):
+        return "(!{})".format(self._condition.compile(params))
+
+
+def not_(condition):
+    """Met when the condition isn't met."""
+    return _Not(condition)
+
+
+def present():
+    """Met when the element is present."""
+    return BrowserCondition("!!el", name="present")
+
+
+def visible():
+    """Met when the element is present and displayed."""
+    return BrowserCondition("!!el && isDisplayed(el)", name="visible")
+
+
+def enabled():
+    """Met when the element is present and enabled."""
+    return BrowserCondition("!!el && readers.enabled(el)", name="enabled")
+
+
+def clickable():
+    """Met when the element is present, displayed, and enabled."""
+    return all_of(visible(), enabled())
+
+
+def has_text(text):
+    """Met when the element's text is exactly the given text."""
+    return BrowserCondition(
+        "!!el && getText(el) === {}",
+        (text,),
+        "has_text({!r})".format(text),
+    )
+
+
+def contains_text(text):
+    """Met when the element's text contains the given text."""
+    return BrowserCondition(
+        "!!el && getText(el).indexOf({}) !== -1",
+        (text,),
+        "contains_text({!r})".format(text),
+    )
+
+
+def has_attribute(name, value=None):
+    """Met when the element has the attribute (with the value, if given).
+
+    Args:
+        name (str): The name of the attribute.
+        value (str): What its value should be (any value if ``None``).
+    """
+    if value is None:
+        return BrowserCondition(
+            "!!el && getAttribute(el, {}) !== null",
+            (name,),
+            "has_attribute({!r})".format(name),
+        )
+    return BrowserCondition(
+        "!!el && getAttribute(el, {}) === {}",
+        (name, value),
+        "has_attribute({!r}, {!r})".format(name, value),
+    )
+
+
+def has_class(name):
+    """Met when the element has the class."""
+    return BrowserCondition(
+        "!!el && el.classList.contains({})",
+        (name,),
+        "has_class({!r})".format(name),
+    )
@@ -0,0 +1,145 @@
+"""Keep what's known about the browser on the driver it was learned through.
+
+Components are shared by every page they're declared on, and pages come and
+go, but some of what's learned while using them is about the browser itself,
+and is just as true for the next page that's made for the same driver (e.g.
+the ``WebElement`` of each frame). That's kept in a ``DriverState``, which
+lives on the driver itself, so it goes away along with the driver.
+
+It can't be kept in a ``weakref.WeakKeyDictionary`` by driver instead, as the
+``WebElement``s in it hold onto their driver, which would keep the driver
+alive for as long as the dictionary is.
+
+Everything that needs to know about each command a driver sends (e.g. to
+count navigations, or to record how long it took) hooks into it through
+``add_execute_hook``, rather than wrapping the driver's ``execute`` method
+itself, so the method is only ever wrapped once, and the hooks all see the
+same commands.
+"""
+
+import threading
+import weakref
+
+
+_state_lock = threading.Lock()
+
+
+class DriverState(object):
+    """What's known about the browser a driver controls.
+
+    This is normally gotten through ``get_driver_state``.
+
+    Attributes:
+        element_cache (dict): ``WebElement``s kept by components (e.g. the
+            frame of an ``Iframe``), by component. They're only valid for the
+            document the driver is on.
+        execute_hooks (tuple): The name and hook of each hook that every
+            command is sent through (see ``add_execute_hook``).
+        navigations (int): How many times the driver has navigated since
+            they started being counted (see ``pypcom.memo``).
+    """
+
+    def __init__(self):
+        self.element_cache = {}
+        self.navigations = 0
+        self.execute_hooks = ()
+        self._pages = weakref.WeakSet()
+
+    def add_page(self, page):
+        """Have the page forget about the document along with the driver.
+
+        Args:
+            page (Page): A page made for the driver.
+        """
+        self._pages.add(page)
+
+    def on_navigation(self):
+        """Throw away anything known about the document the driver was on.
+
+        This includes what every page made for the driver is holding onto
+        about it (see ``Page._forget_document``), not just what's kept here.
+        """
+        with _state_lock:
+            self.navigations += 1
+        self.element_cache.clear()
+        for page in list(self._pages):
+            page._forget_document()
+
+
+def get_driver_state(driver):
+    """Get the ``DriverState`` of the driver (made the first time).
+
+    Args:
+        driver (WebDriver): The driver to get the state of.
+
+    Returns:
+        DriverState: The state, or ``None`` if there's no driver (or it's not
+            an object the state can be kept on).
+    """
+    attributes = getattr(driver, "__dict__", None)
+    if attributes is None:
+        return None
+    state = attributes.get("_pypcom_state")
+    if state is None:
+        with _state_lock:
+            state = attributes.get("_pypcom_state")
+            if state is None:
+                state = DriverState()
+                driver._pypcom_state = state
+    return state
+
+
+def add_execute_hook(driver, name, hook):
+    """Send every command of the driver through the hook.
+
+    Every WebDriver command goes through the driver's ``execute`` method, so
+    the first time a hook is added for a driver, that's wrapped to send each
+    command through its hooks, in the order they were added. Each hook is
+    called with the name of the command, and a callable that sends it on
+    (through the rest of the hooks) and returns what it returned, e.g.::
+
+        def timed(driver_command, proceed):
+            start = time.perf_counter()
+            try:
+                return proceed()
+            finally:
+                print(driver_command, time.perf_counter() - start)
+
+        add_execute_hook(driver, "timed", timed)
+
+    Args:
+        driver (WebDriver): The driver to hook into.
+        name (str): What the hook is known by. If a hook was already added
+            for the driver by this name, nothing is changed.
+        hook (callable): The hook.
+    """
+    state = get_driver_state(driver)
+    if state is None:
+        return
+    if any(added == name for added, _ in state.execute_hooks):
+        return
+    with _state_lock:
+        if any(added == name for added, _ in state.execute_hooks):
+            return
+        if not state.execute_hooks:
+            _wrap_execute(driver, state)
+        state.execute_hooks += ((name, hook),)
+
+
+def _wrap_execute(driver, state):
+    execute = driver.execute
+
+    def hooked_execute(driver_command, *args, **kwargs):
+        hooks = state.execute_hooks
+
+        def proceed(index=0):
+            if index == len(hooks):
+                return execute(driver_command, *args, **kwargs)
+            return hooks[index][1](
+                driver_command,
+                lambda: proceed(index + 1),
+            )
+
+        return proceed()
+
+    driver.execute = hooked_execute
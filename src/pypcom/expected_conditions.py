@@ -6,16 +6,20 @@ from Selenium, custom conditions and how to check for them should be defined
 here.
 """
 
-from selenium.webdriver.support import expected_conditions as EC
-
 
 def visible(component, **kwargs):
+    from selenium.webdriver.support import expected_conditions as EC
+
     return EC.visibility_of_element_located(component._locator)
 
 
 def present(component, **kwargs):
+    from selenium.webdriver.support import expected_conditions as EC
+
     return EC.presence_of_element_located(component._locator)
 
 
 def clickable(component, **kwargs):
+    from selenium.webdriver.support import expected_conditions as EC
+
     return EC.element_to_be_clickable(component._locator)
@@ -0,0 +1,602 @@
+"""Bulk, browser-side reads of the facts that ``ExpectedAttribute``s check.
+
+Most of what gets checked about a component (whether it's present, displayed
+or enabled, its tag name, text, attributes, or where it is on the page) can be
+read for any number of elements with a single ``execute_script`` call, rather
+than one WebDriver round trip per fact, per component. This module provides
+the tools for doing that:
+
+* ``locator_chain`` translates a component's ``_locator`` (and those of the
+  parents it's found from) into something the browser can resolve on its own.
+* ``fetch_facts`` reads the requested facts for a list of components in one
+  script per frame.
+* ``resolve_elements`` finds the elements of a list of components in one
+  script per frame.
+* ``FactView`` wraps the facts for a single component so they can be read
+  through the same API as the component itself (e.g. ``is_displayed()``,
+  ``text``, ``get_attribute("href")``), which lets existing
+  ``ExpectedAttribute``s be checked against them unchanged.
+
+The facts are gathered in the browser, so a few of them are close
+approximations of what Selenium reports, rather than exact copies:
+``displayed`` checks the computed ``display``, ``visibility`` and ``opacity``
+of the element and its ancestors along with its size, and ``text`` is the
+trimmed ``innerText`` of the element.
+"""
+
+from pypcom.batch import run_in_iframe
+from pypcom.component import Binding, PageComponent, as_binding
+
+
+#: Facts that are read when no specific facts are asked for.
+DEFAULT_FACTS = ("displayed", "enabled", "tag_name", "text")
+
+#: Prefix for facts that are the value of one of the element's attributes.
+ATTRIBUTE_FACT_PREFIX = "attribute:"
+
+#: JavaScript functions shared by the scripts that read from the page in bulk.
+#: ``resolve`` finds the element for a target from ``get_script_target``, and
+#: ``findAll`` finds every element matching a translated locator step.
+SCRIPT_HELPERS = r"""
+function resolve(target) {
+    if (!Array.isArray(target)) {
+        return target;
+    }
+    var node = document;
+    for (var i = 0; i < target.length && node; i++) {
+        var using = target[i][0], value = target[i][1];
+        if (using === "xpath") {
+            node = document.evaluate(
+                value, node, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+            ).singleNodeValue;
+        } else {
+            node = node.querySelector(value);
+        }
+    }
+    return node;
+}
+function findAll(root, step) {
+    if (step[0] === "xpath") {
+        var snapshot = document.evaluate(
+            step[1], root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        var nodes = [];
+        for (var i = 0; i < snapshot.snapshotLength; i++) {
+            nodes.push(snapshot.snapshotItem(i));
+        }
+        return nodes;
+    }
+    return Array.prototype.slice.call(root.querySelectorAll(step[1]));
+}
+function getText(el) {
+    return (el.innerText || "").replace(/\u00a0/g, " ").trim();
+}
+function isDisplayed(el) {
+    var node = el;
+    for (; node && node.nodeType === 1; node = node.parentElement) {
+        var style = window.getComputedStyle(node);
+        if (style.display === "none" || style.opacity === "0") {
+            return false;
+        }
+    }
+    var visibility = window.getComputedStyle(el).visibility;
+    if (visibility === "hidden" || visibility === "collapse") {
+        return false;
+    }
+    var rect = el.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+}
+function getAttribute(el, name) {
+    var value = el[name];
+    if (value === undefined || value === null || typeof value === "object" ||
+            typeof value === "function") {
+        return el.getAttribute(name);
+    }
+    if (typeof value === "boolean") {
+        return value ? "true" : null;
+    }
+    return String(value);
+}
+var readers = {
+    displayed: isDisplayed,
+    enabled: function (el) {
+        return !(el.disabled || (el.matches && el.matches(":disabled")));
+    },
+    tag_name: function (el) {
+        return el.tagName.toLowerCase();
+    },
+    text: getText,
+    rect: function (el) {
+        var rect = el.getBoundingClientRect();
+        return {
+            x: rect.left + window.pageXOffset,
+            y: rect.top + window.pageYOffset,
+            width: rect.width,
+            height: rect.height
+        };
+    }
+};
+"""
+
+FETCH_FACTS_SCRIPT = SCRIPT_HELPERS + r"""
+var targets = arguments[0], facts = arguments[1];
+return targets.map(function (target) {
+    var el = resolve(target);
+    var result = {present: !!el};
+    if (!el) {
+        return result;
+    }
+    facts.forEach(function (fact) {
+        if (fact.indexOf("attribute:") === 0) {
+            result[fact] = getAttribute(el, fact.slice(10));
+        } else if (readers.hasOwnProperty(fact)) {
+            result[fact] = readers[fact](el);
+        }
+    });
+    return result;
+});
+"""
+
+
+RESOLVE_ELEMENTS_SCRIPT = SCRIPT_HELPERS + r"""
+return arguments[0].map(function (target) {
+    return resolve(target);
+});
+"""
+
+
+def _css_string(value):
+    """Quote a value so it can be used inside a CSS attribute selector."""
+    return '"{}"'.format(value.replace("\\", "\\\\").replace('"', '\\"'))
+
+
+_LOCATOR_TRANSLATIONS = {
+    "css selector": lambda value: ("css", value),
+    "xpath": lambda value: ("xpath", value),
+    "id": lambda value: ("css", "[id={}]".format(_css_string(value))),
+    "name": lambda value: ("css", "[name={}]".format(_css_string(value))),
+    "class name": lambda value: ("css", ".{}".format(value)),
+    "tag name": lambda value: ("css", value),
+}
+
+
+def _has_standard_lookup(component):
+    """Whether the component finds its ``WebElement`` in the standard way.
+
+    Components can override ``_el`` (e.g. to wrap the ``WebElement`` in a
+    ``Select``), in which case the browser can't be trusted to find the same
+    thing on its own.
+    """
+    return type(component)._el is PageComponent._el
+
+
+def translate_locator(locator):
+    """Translate a locator into a step the page's scripts can resolve.
+
+    Args:
+        locator (tuple): The locator strategy and value.
+
+    Returns:
+        tuple: ``("css", selector)`` or ``("xpath", expression)``, or ``None``
+            if the locator strategy can't be translated (e.g. link text).
+    """
+    using, value = locator
+    translate = _LOCATOR_TRANSLATIONS.get(using)
+    if translate is None:
+        return None
+    return translate(value)
+
+
+def locator_chain(component):
+    """Get the steps the browser needs to take to find the component's element.
+
+    Each step is a ``(using, value)`` pair, where ``using`` is either ``"css"``
+    or ``"xpath"``, starting from the document and working down through each
+    parent the component is found from (see ``_find_from_parent``).
+
+    If the component (or one of the parents it's found from) has no
+    ``_locator``, uses a locator strategy that can't be translated (e.g. link
+    text), or overrides how its ``WebElement`` is found, ``None`` is returned,
+    as the browser can't find it on its own.
+
+    Args:
+        component (PageComponent): The component to get the chain for.
+    """
+    chain = []
+    node = component
+    while True:
+        if not _has_standard_lookup(node) or node._locator is None:
+            return None
+        step = translate_locator(node._locator)
+        if step is None:
+            return None
+        chain.append(step)
+        parent = node._parent
+        if not (node._find_from_parent and isinstance(parent, PageComponent)):
+            break
+        node = parent
+    chain.reverse()
+    return chain
+
+
+def get_script_target(component):
+    """Get what a script should ``resolve`` to find the component's element.
+
+    This is the component's locator chain if it has one, and otherwise, its
+    ``WebElement`` (or ``None`` if it isn't present).
+    """
+    from selenium.common.exceptions import NoSuchElementException
+
+    chain = locator_chain(component)
+    if chain is not None:
+        return chain
+    try:
+        return component._el
+    except NoSuchElementException:
+        return None
+
+
+def _group_by_iframe(bindings):
+    """Group ``Binding``s by the iframe their components are in.
+
+    This is ``group_by_iframe``, except each component is bound to where it
+    was referenced through before its iframe is looked for, and each iframe
+    is given as a ``Binding`` as well (``None`` for the page itself), so it
+    can be bound there again before its frame is switched to.
+    """
+    groups = []
+    indexes_by_iframe = {}
+    for index, binding in enumerate(bindings):
+        iframe = binding.bind().iframe_ancestor
+        if iframe is None:
+            key = None
+        else:
+            iframe = Binding(iframe)
+            key = iframe.key
+        if key not in indexes_by_iframe:
+            indexes_by_iframe[key] = []
+            groups.append((iframe, indexes_by_iframe[key]))
+        indexes_by_iframe[key].append(index)
+    return groups
+
+
+def _run_in_group(bindings, iframe, indexes, func):
+    """Call ``func`` while holding the focus on the iframe of a group."""
+    if iframe is not None:
+        iframe = iframe.bind()
+    return run_in_iframe(iframe, func, bindings[indexes[0]].bind().driver)
+
+
+def fetch_facts(components, facts=DEFAULT_FACTS):
+    """Read facts about many components with as few round trips as possible.
+
+    The components are grouped by the iframe they're in, and each group has
+    all of its facts read with a single ``execute_script`` call. Whether or not
+    each component is present is always included.
+
+    Args:
+        components (list): The ``PageComponent``s to read the facts of (or
+            ``Binding``s of them, for components that may have been
+            referenced somewhere else since; see ``Binding``).
+        facts (iterable): The names of the facts to read. These can be any of
+            ``"displayed"``, ``"enabled"``, ``"tag_name"``, ``"text"``,
+            ``"rect"``, or ``"attribute:<name>"`` for the value of the
+            ``<name>`` attribute.
+
+    Returns:
+        list: A ``FactView`` for each component, in the same order.
+    """
+    bindings = [as_binding(component) for component in components]
+    facts = [fact for fact in facts if fact != "present"]
+
+    def fetch_group(indexes):
+        targets = [get_script_target(bindings[i].bind()) for i in indexes]
+        return bindings[indexes[0]].component.driver.execute_script(
+            FETCH_FACTS_SCRIPT,
+            targets,
+            facts,
+        )
+
+    views = [None] * len(bindings)
+    for iframe, indexes in _group_by_iframe(bindings):
+        results = _run_in_group(
+            bindings,
+            iframe,
+            indexes,
+            lambda: fetch_group(indexes),
+        )
+        for i, result in zip(indexes, results):
+            views[i] = FactView(result, bindings[i].component)
+    return views
+
+
+def resolve_elements(components):
+    """Find the elements of many components in as few round trips as possible.
+
+    Like ``fetch_facts``, the components are grouped by the iframe they're in,
+    and each group is found with a single ``execute_script`` call. Components
+    the browser can't find on its own (see ``locator_chain``) are skipped.
+
+    The elements of each group are yielded as soon as that group is found, so
+    anything they're needed for (e.g. caching the element of an ``Iframe``
+    so its frame can be switched to without finding it) can be done before
+    the next group is found.
+
+    Args:
+        components (list): The ``PageComponent``s to find the elements of (or
+            ``Binding``s of them; see ``fetch_facts``).
+
+    Yields:
+        tuple: The ``Binding`` of each component that was looked for, and its
+            ``WebElement`` (``None`` if it wasn't present).
+    """
+    bindings, chains = [], []
+    for component in components:
+        binding = as_binding(component)
+        chain = locator_chain(binding.bind())
+        if chain is not None:
+            bindings.append(binding)
+            chains.append(chain)
+
+    def resolve_group(indexes):
+        return bindings[indexes[0]].component.driver.execute_script(
+            RESOLVE_ELEMENTS_SCRIPT,
+            [chains[i] for i in indexes],
+        )
+
+    for iframe, indexes in _group_by_iframe(bindings):
+        results = _run_in_group(
+            bindings,
+            iframe,
+            indexes,
+            lambda: resolve_group(indexes),
+        )
+        for i, element in zip(indexes, results):
+            yield bindings[i], element
+
+
+class FactView(object):
+    """Read-only view of the facts fetched for a component.
+
+    This exposes the facts through the same names that the component (or its
+    ``WebElement``) would, so anything that only reads from a component, like
+    most ``ExpectedAttribute``s, can read from this instead. Asking for a fact
+    that wasn't fetched raises a ``KeyError``.
+
+    Args:
+        facts (dict): The facts returned by the fetch script.
+        component (PageComponent): The component the facts are about.
+    """
+
+    def __init__(self, facts, component=None):
+        self._facts = facts
+        self.component = component
+
+    def __repr__(self):
+        return "<FactView of {!r}: {!r}>".format(self.component, self._facts)
+
+    def has_fact(self, name):
+        """Whether or not the named fact was fetched."""
+        return name == "present" or name in self._facts
+
+    def get_fact(self, name):
+        """Get the value of the named fact.
+
+        If the element isn't present, this raises a ``NoSuchElementException``,
+        just like the component would when trying to find its element.
+
+        Args:
+            name (str): The name of the fact.
+        """
+        if name == "present":
+            return self._facts["present"]
+        if not self._facts["present"]:
+            from selenium.common.exceptions import NoSuchElementException
+
+            raise NoSuchElementException(
+                "Element for {!r} was not present".format(self.component),
+            )
+        try:
+            return self._facts[name]
+        except KeyError:
+            raise KeyError("Fact '{}' was not fetched".format(name))
+
+    def is_present(self):
+        return self.get_fact("present")
+
+    def is_displayed(self):
+        return self.get_fact("displayed")
+
+    def is_enabled(self):
+        return self.get_fact("enabled")
+
+    @property
+    def tag_name(self):
+        return self.get_fact("tag_name")
+
+    @property
+    def text(self):
+        return self.get_fact("text")
+
+    @property
+    def rect(self):
+        return self.get_fact("rect")
+
+    @property
+    def location(self):
+        rect = self.rect
+        return {"x": rect["x"], "y": rect["y"]}
+
+    @property
+    def size(self):
+        rect = self.rect
+        return {"width": rect["width"], "height": rect["height"]}
+
+    def get_attribute(self, name):
+        return self.get_fact(ATTRIBUTE_FACT_PREFIX + name)
+
+
+class Rect(object):
+    """The position and size of an element on the page.
+
+    The position is relative to the top left corner of the document, just like
+    a ``WebElement``'s ``rect``.
+
+    Args:
+        x (float): Distance of the element's left edge from the document's.
+        y (float): Distance of the element's top edge from the document's.
+        width (float): Width of the element.
+        height (float): Height of the element.
+    """
+
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+    @classmethod
+    def from_dict(cls, rect):
+        """Make a ``Rect`` from a ``dict`` like a ``WebElement``'s ``rect``."""
+        return cls(rect["x"], rect["y"], rect["width"], rect["height"])
+
+    def __repr__(self):
+        return "Rect(x={}, y={}, width={}, height={})".format(
+            self.x,
+            self.y,
+            self.width,
+            self.height,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, Rect):
+            return NotImplemented
+        return (self.x, self.y, self.width, self.height) == (
+            other.x,
+            other.y,
+            other.width,
+            other.height,
+        )
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = None
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def top(self):
+        return self.y
+
+    @property
+    def right(self):
+        return self.x + self.width
+
+    @property
+    def bottom(self):
+        return self.y + self.height
+
+    def contains(self, other, tolerance=0):
+        """Whether or not the other ``Rect`` is entirely inside this one.
+
+        Args:
+            other (Rect): The ``Rect`` that should be inside this one.
+            tolerance (float): How far (in pixels) the other ``Rect`` can
+                extend past any edge of this one.
+        """
+        return (
+            other.left >= self.left - tolerance
+            and other.top >= self.top - tolerance
+            and other.right <= self.right + tolerance
+            and other.bottom <= self.bottom + tolerance
+        )
+
+    def overlaps(self, other):
+        """Whether or not the other ``Rect`` shares any area with this one.
+
+        Edges that only touch don't count as overlapping.
+
+        Args:
+            other (Rect): The ``Rect`` to check against.
+        """
+        return (
+            self.left < other.right
+            and other.left < self.right
+            and self.top < other.bottom
+            and other.top < self.bottom
+        )
+
+
+class Geometry(object):
+    """Snapshot of where a set of components were on the page.
+
+    The ``Rect`` for each component can be looked up using the component as
+    the key. Components that weren't present have ``None`` for their ``Rect``.
+
+    Args:
+        rects (list): Pairs of components and their ``Rect``s.
+    """
+
+    def __init__(self, rects):
+        self._rects = dict((id(component), rect) for component, rect in rects)
+        self._components = [component for component, _ in rects]
+
+    def __getitem__(self, component):
+        try:
+            return self._rects[id(component)]
+        except KeyError:
+            raise KeyError(
+                "{!r} is not in the geometry snapshot".format(component),
+            )
+
+    def __contains__(self, component):
+        return id(component) in self._rects
+
+    def __iter__(self):
+        return iter(self._components)
+
+    def __len__(self):
+        return len(self._components)
+
+
+def fetch_geometry(components):
+    """Get a ``Geometry`` snapshot of the components with one script per frame.
+
+    Args:
+        components (iterable): The ``PageComponent``s to get the ``Rect``s of.
+    """
+    components = list(components)
+    views = fetch_facts(components, ("rect",))
+    rects = []
+    for component, view in zip(components, views):
+        rect = None
+        if view.is_present():
+            rect = Rect.from_dict(view.rect)
+        rects.append((component, rect))
+    return Geometry(rects)
+
+
+class Placement(object):
+    """Where a component is, along with where the components around it are.
+
+    This is what layout checks (see ``LayoutAttribute``) are given when the
+    ``Rect``s they need were already fetched along with others (e.g. by a
+    ``State`` with several of them), so they don't have to fetch their own.
+
+    Args:
+        rect (Rect): Where the component is (``None`` if it isn't present).
+        geometry (Geometry): Where the other components are.
+    """
+
+    def __init__(self, rect, geometry):
+        self.rect = rect
+        self.geometry = geometry
+
+    def __repr__(self):
+        return "<Placement {!r}>".format(self.rect)
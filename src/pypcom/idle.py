@@ -0,0 +1,183 @@
+"""Wait in the browser until the page has stopped loading things.
+
+A lot of waits on components are really waiting for the app to finish loading
+its data, which means polling a component (at least one WebDriver command per
+poll) for as long as requests are in flight. Instead, this installs a small
+tracker in the page that counts the ``fetch`` and ``XMLHttpRequest`` requests
+that are in flight, and notes when animation frames are requested, and then
+waits inside the browser (with an async script) until the document has loaded
+and there's been no activity for a while::
+
+    page.wait_for_idle(idle_ms=500, timeout=10)
+
+Requests that were started before the tracker was installed can't be seen, so
+for pages that start loading data right away, the tracker can be installed as
+early as possible with ``install_idle_tracker`` (e.g. right after navigating).
+The tracker is part of the document, so it's gone after navigating to another
+page, and it only tracks the document that has the focus (i.e. not the
+documents of iframes, unless the focus is in one).
+"""
+
+import time
+
+
+INSTALL_TRACKER_HELPER = r"""
+function installIdleTracker() {
+    if (window.__pypcomIdleTracker) {
+        return window.__pypcomIdleTracker;
+    }
+    var tracker = {pending: 0, lastActivity: Date.now(), lastFrame: 0};
+    function start() {
+        tracker.pending += 1;
+        tracker.lastActivity = Date.now();
+    }
+    function finish() {
+        tracker.pending = Math.max(0, tracker.pending - 1);
+        tracker.lastActivity = Date.now();
+    }
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            start();
+            try {
+                return fetch.apply(this, arguments).then(
+                    function (response) {
+                        finish();
+                        return response;
+                    },
+                    function (error) {
+                        finish();
+                        throw error;
+                    }
+                );
+            } catch (e) {
+                finish();
+                throw e;
+            }
+        };
+    }
+    if (window.XMLHttpRequest) {
+        var send = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            var finished = false;
+            function end() {
+                if (!finished) {
+                    finished = true;
+                    finish();
+                }
+            }
+            start();
+            this.addEventListener("loadend", end);
+            try {
+                return send.apply(this, arguments);
+            } catch (e) {
+                end();
+                throw e;
+            }
+        };
+    }
+    if (window.requestAnimationFrame) {
+        var requestFrame = window.requestAnimationFrame;
+        window.requestAnimationFrame = function (callback) {
+            tracker.lastFrame = Date.now();
+            return requestFrame.call(window, callback);
+        };
+    }
+    window.__pypcomIdleTracker = tracker;
+    return tracker;
+}
+"""
+
+INSTALL_TRACKER_SCRIPT = INSTALL_TRACKER_HELPER + r"""
+installIdleTracker();
+"""
+
+WAIT_FOR_IDLE_SCRIPT = INSTALL_TRACKER_HELPER + r"""
+var done = arguments[arguments.length - 1];
+var idleMs = arguments[0], maxWaitMs = arguments[1];
+var trackFrames = arguments[2];
+var tracker = installIdleTracker();
+var started = Date.now();
+function lastActivity() {
+    if (trackFrames && tracker.lastFrame > tracker.lastActivity) {
+        return tracker.lastFrame;
+    }
+    return tracker.lastActivity;
+}
+function check() {
+    var now = Date.now();
+    if (
+        document.readyState === "complete"
+        && tracker.pending === 0
+        && now - lastActivity() >= idleMs
+    ) {
+        done(true);
+    } else if (now - started >= maxWaitMs) {
+        done(false);
+    } else {
+        setTimeout(check, Math.max(10, Math.min(50, idleMs)));
+    }
+}
+check();
+"""
+
+#: The longest a single async script waits for, so waits longer than the
+#: driver's script timeout are split across several scripts.
+MAX_SCRIPT_WAIT_SECONDS = 5
+
+
+def install_idle_tracker(driver):
+    """Install the request and animation frame tracker in the current document.
+
+    Installing it again does nothing.
+
+    Args:
+        driver (WebDriver): The driver to install it through.
+    """
+    driver.execute_script(INSTALL_TRACKER_SCRIPT)
+
+
+def wait_for_idle(
+    driver,
+    idle_ms=500,
+    timeout=10,
+    animations=True,
+    clock=time.monotonic,
+):
+    """Wait until the document has loaded and nothing has happened for a bit.
+
+    The waiting is done in the browser, so this is a single async script (or
+    one every ``MAX_SCRIPT_WAIT_SECONDS``, for long waits).
+
+    Args:
+        driver (WebDriver): The driver to wait with.
+        idle_ms (int): How many milliseconds there must have been no requests
+            in flight (or animation frames requested) for.
+        timeout (int): The maximum number of seconds to wait before failing.
+        animations (bool): Whether or not requested animation frames count
+            as activity.
+        clock (callable): Returns the current time in seconds.
+
+    Raises:
+        TimeoutException: If the page didn't become idle in time.
+    """
+    from selenium.common.exceptions import TimeoutException
+
+    deadline = clock() + timeout
+    while True:
+        remaining = max(0, min(deadline - clock(), MAX_SCRIPT_WAIT_SECONDS))
+        idle = driver.execute_async_script(
+            WAIT_FOR_IDLE_SCRIPT,
+            idle_ms,
+            int(round(remaining * 1000)),
+            animations,
+        )
+        if idle:
+            return True
+        if clock() >= deadline:
+            raise TimeoutException(
+                "Page didn't become idle for {}ms within {} seconds".format(
+                    idle_ms,
+                    timeout,
+                ),
+            )
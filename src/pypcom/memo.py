@@ -0,0 +1,123 @@
+"""Remember which conditions were just met, so they aren't checked again.
+
+Tests often wait for a component to be visible, and then check that it's
+displayed (or wait for it again) right away, which asks the browser something
+it just answered. If a page sets ``_condition_ttl``, each condition a
+component's ``wait_until``/``wait_until_not`` (or a ``State`` check, like
+``IsDisplayed``) finds to be met is remembered for that many seconds, and
+waiting for (or checking) it again within that time is answered from memory::
+
+    class ResultsPage(Page):
+        _condition_ttl = 0.2
+        results = Results()
+
+    page.results.wait_until("visible")
+    assert page.results == State(IsDisplayed())  # no round trip
+
+A wait is only answered by an earlier wait, though, as it has to return what
+the condition returned (e.g. the ``WebElement`` for ``"visible"``), and a
+``State`` check doesn't have that.
+
+Everything remembered is forgotten as soon as something is written through
+any of the page's components (e.g. a click), or the driver navigates (any
+``get``, ``back``, ``forward``, or ``refresh`` command).
+"""
+
+import time
+import weakref
+from functools import partial
+
+from pypcom.driver_state import add_execute_hook, get_driver_state
+
+
+NAVIGATION_COMMANDS = frozenset(["get", "goBack", "goForward", "refresh"])
+
+
+def get_navigation_count(driver):
+    """Get how many times the driver has navigated since it was first watched.
+
+    The first time this is called for a driver, a hook is added to it (see
+    ``pypcom.driver_state.add_execute_hook``) so that navigation commands are
+    counted (and everything known about the document is thrown away, see
+    ``DriverState.on_navigation``).
+
+    Args:
+        driver (WebDriver): The driver to get the count of.
+    """
+    state = get_driver_state(driver)
+    if state is None:
+        return 0
+    add_execute_hook(
+        driver,
+        "pypcom.memo",
+        partial(_count_navigations, state),
+    )
+    return state.navigations
+
+
+def _count_navigations(state, driver_command, proceed):
+    if driver_command in NAVIGATION_COMMANDS:
+        state.on_navigation()
+    return proceed()
+
+
+class ConditionMemo(object):
+    """The conditions that were recently met on a page.
+
+    This is normally made by the page itself (see ``Page._condition_ttl``).
+
+    Args:
+        driver (WebDriver): The page's driver.
+        ttl (float): How many seconds a condition is remembered for.
+        clock (callable): What to get the current time from.
+    """
+
+    def __init__(self, driver, ttl, clock=time.monotonic):
+        self._driver_ref = weakref.ref(driver)
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = {}
+        self._navigations = get_navigation_count(driver)
+
+    def get(self, key):
+        """Look up whether or not a condition was recently met.
+
+        Args:
+            key (tuple): What identifies the condition.
+
+        Returns:
+            tuple: Whether or not it was recently met, and the value it was
+                met with.
+        """
+        self._forget_if_navigated()
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        met_at, value = entry
+        if self._clock() - met_at > self.ttl:
+            del self._entries[key]
+            return False, None
+        return True, value
+
+    def put(self, key, value=True):
+        """Remember that a condition was just met.
+
+        Args:
+            key (tuple): What identifies the condition.
+            value (obj): What it was met with (e.g. what the wait returned).
+        """
+        self._forget_if_navigated()
+        self._entries[key] = (self._clock(), value)
+
+    def clear(self):
+        """Forget everything."""
+        self._entries.clear()
+
+    def _forget_if_navigated(self):
+        driver = self._driver_ref()
+        if driver is None:
+            return
+        navigations = get_navigation_count(driver)
+        if navigations != self._navigations:
+            self._navigations = navigations
+            self._entries.clear()
@@ -0,0 +1,167 @@
+"""Navigate to pages by their URL, only as much as needed.
+
+A ``Page`` can declare the URL it lives at (with path parameters), and the
+component whose presence means it's ready to be used::
+
+    class CarPage(Page):
+        _url = "/cars/{car_id}"
+        _ready_component = "details"
+        _load_strategy = "eager"
+        details = CarDetails()
+
+    page = CarPage(driver).open(car_id=42)
+
+``Page.open`` then skips the navigation entirely if the browser is already on
+that URL (and the document has loaded), and otherwise navigates according to
+the page's load strategy:
+
+* ``"normal"`` navigates with ``get``, which waits for the ``load`` event (or
+  whatever the session's page load strategy waits for).
+* ``"eager"`` navigates with a script, and waits in the browser until the new
+  document's DOM has loaded (rather than for every image, stylesheet, and
+  script).
+* ``"none"`` navigates with a script, and only waits until the browser is on
+  the new document.
+
+Only navigating to another document is done with a script. Going to a URL
+that's only different by its fragment wouldn't replace the document (so
+there'd be no new document to wait for), and neither would going to the one
+that's still loading, so those are done with ``get``, whatever the strategy.
+
+Either way, it then waits for the ready component to be visible, which is
+usually what the test actually needs.
+"""
+
+try:
+    from urllib.parse import quote, urljoin, urlsplit
+except ImportError:
+    from urllib import quote
+    from urlparse import urljoin, urlsplit
+
+
+from pypcom.driver_state import get_driver_state
+
+
+LOAD_STRATEGIES = ("normal", "eager", "none")
+
+CURRENT_DOCUMENT_SCRIPT = r"""
+return [window.location.href, document.readyState];
+"""
+
+NAVIGATE_SCRIPT = r"""
+window.__pypcomLeaving = true;
+window.location.href = arguments[0];
+"""
+
+NEW_DOCUMENT_SCRIPT = r"""
+return window.__pypcomLeaving ? null : document.readyState;
+"""
+
+
+def build_url(template, params, base_url=None):
+    """Fill the path parameters of a URL template in, and make it absolute.
+
+    Args:
+        template (str): The URL, with ``{name}`` in place of each parameter.
+        params (dict): The value of each parameter (they're quoted, so they
+            can't add to the path).
+        base_url (str): What a relative URL is relative to.
+
+    Returns:
+        str: The URL.
+
+    Raises:
+        KeyError: If a parameter in the template wasn't given.
+    """
+    quoted = dict(
+        (name, quote(str(value), safe="")) for name, value in params.items()
+    )
+    try:
+        url = template.format(**quoted)
+    except KeyError as e:
+        raise KeyError(
+            "Missing path parameter {} for '{}'".format(e, template),
+        )
+    if base_url:
+        url = urljoin(base_url, url)
+    return url
+
+
+def _normalize(url):
+    parts = urlsplit(url)
+    return (
+        parts.scheme,
+        parts.netloc.lower(),
+        parts.path.rstrip("/") or "/",
+        parts.query,
+    )
+
+
+def is_same_document_url(current, url):
+    """Whether or not two URLs are for the same document.
+
+    The fragment, and any trailing slash of the path, are ignored.
+
+    Args:
+        current (str): The URL the browser is on.
+        url (str): The URL to compare it to.
+    """
+    return _normalize(current) == _normalize(url)
+
+
+def navigate(
+    driver,
+    url,
+    load_strategy="normal",
+    timeout=30,
+    current_url=None,
+):
+    """Navigate to the URL, waiting as much as the load strategy says.
+
+    Everything known about the document the driver was on is thrown away
+    (see ``DriverState.on_navigation``).
+
+    Args:
+        driver (WebDriver): The driver to navigate with.
+        url (str): Where to navigate to.
+        load_strategy (str): ``"normal"``, ``"eager"``, or ``"none"`` (see
+            ``pypcom.navigation``).
+        timeout (int): The maximum number of seconds to wait for the new
+            document.
+        current_url (str): The URL the browser is on, if it's known. If it's
+            for the same document as ``url``, ``get`` is used, whatever the
+            load strategy.
+
+    Raises:
+        TimeoutException: If the new document didn't load in time.
+    """
+    if load_strategy not in LOAD_STRATEGIES:
+        raise ValueError(
+            "Unsupported load strategy: {!r}".format(load_strategy),
+        )
+    state = get_driver_state(driver)
+    if state is not None:
+        state.on_navigation()
+    if load_strategy == "normal" or (
+        current_url is not None and is_same_document_url(current_url, url)
+    ):
+        driver.get(url)
+        return
+    from selenium.common.exceptions import JavascriptException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver.execute_script(NAVIGATE_SCRIPT, url)
+    if load_strategy == "eager":
+        def loaded(driver):
+            state = driver.execute_script(NEW_DOCUMENT_SCRIPT)
+            return state in ("interactive", "complete")
+    else:
+        def loaded(driver):
+            return driver.execute_script(NEW_DOCUMENT_SCRIPT) is not None
+    # scripts can fail while the old document is being unloaded
+    WebDriverWait(
+        driver,
+        timeout,
+        poll_frequency=0.05,
+        ignored_exceptions=(JavascriptException,),
+    ).until(loaded)
@@ -1,5 +1,7 @@
 """This module just contains the base class for pages."""
 
+from pypcom.driver_state import get_driver_state
+
 
 class Page(object):
     """The base class for all pages.
@@ -15,8 +17,33 @@ class Page(object):
     Attributes:
         driver (WebDriver): WebDriver to be used for element lookups and page
             interactions.
+        _warm_up (bool): Whether or not to start finding the elements of the
+            page's components in the background as soon as the page is made
+            (see ``warm_up``).
+        _condition_ttl (float): How many seconds conditions that were met
+            through the page's components are remembered for, so they aren't
+            checked again in that time (not at all if ``None``; see
+            ``pypcom.memo``).
+        _url (str): The URL of the page for ``open``, with ``{name}`` in
+            place of each path parameter. It can be relative to
+            ``_base_url`` (or to wherever the browser is, if that's
+            ``None``).
+        _base_url (str): What ``_url`` is relative to.
+        _ready_component (str): The name of the component that's visible
+            once the page is ready to be used, which ``open`` waits for.
+        _load_strategy (str): How much of the page ``open`` waits to load
+            (``"normal"``, ``"eager"``, or ``"none"``; see
+            ``pypcom.navigation``).
     """
 
+    _active_snapshot = None
+    _warm_up = False
+    _condition_ttl = None
+    _url = None
+    _base_url = None
+    _ready_component = None
+    _load_strategy = "normal"
+
     def __init__(self, driver):
         """Create an instance of the page.
 
@@ -29,3 +56,496 @@ class Page(object):
                 page interactions.
         """
         self.driver = driver
+        state = get_driver_state(driver)
+        if state is not None:
+            state.add_page(self)
+        if self._warm_up:
+            self.warm_up()
+
+    def get_url(self, current_url=None, **params):
+        """Get the URL of the page.
+
+        Args:
+            current_url (str): Where the browser is, which a relative
+                ``_url`` is relative to if there's no ``_base_url``.
+            **params: The value of each path parameter.
+        """
+        from pypcom.navigation import build_url
+
+        if self._url is None:
+            raise AttributeError("Page must have _url to be opened.")
+        return build_url(self._url, params, self._base_url or current_url)
+
+    def open(self, timeout=30, **params):
+        """Navigate to the page, unless the browser is already on it.
+
+        If the browser is already on the page's URL (ignoring the fragment),
+        and the document's DOM has loaded, the navigation is skipped.
+        Otherwise, it navigates according to ``_load_strategy``. Either way,
+        it then waits for the ``_ready_component`` (if there is one) to be
+        visible, and starts warming up the page's components if ``_warm_up``
+        is set.
+
+        Example::
+
+            page = CarPage(driver).open(car_id=42)
+
+        Args:
+            timeout (int): The maximum number of seconds to wait for the page
+                to load, and for the ready component.
+            **params: The value of each path parameter in ``_url``.
+
+        Returns:
+            Page: The page.
+        """
+        from pypcom.navigation import (
+            CURRENT_DOCUMENT_SCRIPT,
+            is_same_document_url,
+            navigate,
+        )
+        from pypcom.tracing import component_span
+
+        with component_span(self, "open", "navigation"):
+            current_url, ready_state = self.driver.execute_script(
+                CURRENT_DOCUMENT_SCRIPT,
+            )
+            url = self.get_url(current_url, **params)
+            if (
+                ready_state == "loading"
+                or not is_same_document_url(current_url, url)
+            ):
+                navigate(
+                    self.driver,
+                    url,
+                    self._load_strategy,
+                    timeout,
+                    current_url,
+                )
+            if self._ready_component is not None:
+                ready = getattr(self, self._ready_component)
+                ready.wait_until("visible", timeout=timeout)
+        if self._warm_up and "_pypcom_warmup" not in self.__dict__:
+            self.warm_up()
+        return self
+
+    def iter_components(self):
+        """Get every component in the page's tree, bound to this page.
+
+        Each component is referenced through its parent, so it's bound to the
+        page's driver just as it would be when used normally. Subcomponents
+        come right after the component they belong to.
+
+        Returns:
+            list: ``(path, component)`` pairs, where ``path`` is the dotted
+                path to the component from the page.
+        """
+        return list(self._walk_components())
+
+    def _walk_components(self):
+        """Reference every component in the page's tree, one at a time.
+
+        This is what ``iter_components`` gets its components from, except
+        each one is yielded as soon as it's referenced, while it's still
+        bound to where it was referenced through (which ``iter_components``
+        can't promise, as components are shared by every parent they're
+        declared on), so a ``Binding`` can be taken of it.
+
+        Yields:
+            tuple: The dotted path to each component, and the component.
+        """
+        from pypcom.component import iter_component_descriptors
+
+        def walk(owner, prefix, ancestor_classes):
+            for name, _ in iter_component_descriptors(type(owner)):
+                component = getattr(owner, name)
+                path = prefix + name
+                yield path, component
+                component_cls = type(component)
+                if component_cls not in ancestor_classes:
+                    for item in walk(
+                        component,
+                        path + ".",
+                        ancestor_classes + (component_cls,),
+                    ):
+                        yield item
+
+        return walk(self, "", ())
+
+    def _get_bindings(self, components=None, subtree=False):
+        """Get a ``Binding`` of each of the components.
+
+        Args:
+            components (list): The components (every component of the page
+                if ``None``).
+            subtree (bool): Whether or not to include the subcomponents of the
+                given components.
+        """
+        from pypcom.component import Binding, as_binding
+
+        if components is None:
+            return [
+                Binding(component) for _, component in self._walk_components()
+            ]
+        if subtree:
+            return list(_walk_subcomponents(components))
+        return [as_binding(component) for component in components]
+
+    def snapshot(self, components=None, subtree=False, attributes=None):
+        """Fetch facts about many components at once to answer reads from.
+
+        When entered as a context manager, the text, tag name, whether or not
+        they're displayed/enabled, position and size, and common attributes of
+        the components are fetched with a single script (per frame), and
+        reads of those through the components are answered from that until
+        the context exits or something is written through one of the page's
+        components (see ``pypcom.snapshot``).
+
+        Example::
+
+            with page.snapshot([page.summary], subtree=True):
+                assert page.summary.total.text == "$10.00"
+                assert page.summary.tax.text == "$0.80"
+
+        Args:
+            components (list): The components to fetch the facts of (every
+                component of the page if ``None``).
+            subtree (bool): Whether or not to include the subcomponents of the
+                given components.
+            attributes (iterable): The attributes to fetch (see
+                ``pypcom.snapshot.DEFAULT_ATTRIBUTES`` for the defaults).
+
+        Returns:
+            Snapshot: The snapshot, which must be entered to be used.
+        """
+        from pypcom.snapshot import DEFAULT_ATTRIBUTES, Snapshot
+
+        if attributes is None:
+            attributes = DEFAULT_ATTRIBUTES
+        return Snapshot(
+            self,
+            self._get_bindings(components, subtree),
+            attributes,
+        )
+
+    def prefetch(self, components=None, subtree=False):
+        """Find the elements of many components at once, ahead of their use.
+
+        The elements are found with a single script (per frame), and each one
+        is handed to its component the next time it's used, so that first use
+        doesn't have to find it. After that, the component finds its element
+        as it normally would, and anything written through a component of the
+        page throws away whatever hasn't been used yet (since the page may
+        have changed). ``Iframe``s also keep the element of their frame.
+
+        Only components whose locators (and those of the parents they're
+        found from) the browser can resolve on its own are prefetched (see
+        ``pypcom.facts.locator_chain``).
+
+        Example::
+
+            page = DashboardPage(driver)
+            page.prefetch()
+            page.header.title.text  # no find_element needed
+
+        Args:
+            components (list): The components to prefetch the elements of
+                (every component of the page if ``None``).
+            subtree (bool): Whether or not to include the subcomponents of the
+                given components.
+
+        Returns:
+            int: How many elements were found.
+        """
+        from pypcom.facts import resolve_elements
+
+        found = 0
+        for binding, element in resolve_elements(
+            self._get_bindings(components, subtree),
+        ):
+            if element is None:
+                continue
+            self._prefetched_elements[binding.key] = element
+            if binding.component._is_iframe:
+                self._element_cache[binding.key] = element
+            found += 1
+        return found
+
+    def warm_up(self, components=None, subtree=False, batch_size=20):
+        """Find the elements of the components in a background thread.
+
+        This is like ``prefetch``, except the elements are found a batch at a
+        time in a background thread, while the test does other things, and
+        the warm-up stops as soon as the test sends a WebDriver command of its
+        own (see ``pypcom.warmup``). Only components that aren't inside an
+        ``Iframe`` are warmed up.
+
+        Any warm-up that was already running for this page is stopped.
+
+        Args:
+            components (list): The components to find the elements of (every
+                component of the page if ``None``).
+            subtree (bool): Whether or not to include the subcomponents of the
+                given components.
+            batch_size (int): How many elements to find with each script.
+
+        Returns:
+            Warmup: The running warm-up.
+        """
+        from pypcom.warmup import Warmup
+
+        bindings = self._get_bindings(components, subtree)
+        self._cancel_warm_up()
+        warmup = Warmup(self, bindings, batch_size)
+        self.__dict__["_pypcom_warmup"] = warmup
+        return warmup.start()
+
+    def _cancel_warm_up(self):
+        warmup = self.__dict__.pop("_pypcom_warmup", None)
+        if warmup is not None:
+            warmup.cancel()
+
+    def _take_prefetched_element(self, component):
+        """Take the prefetched element of the component, if there is one.
+
+        Each prefetched element is only handed out once. They're kept by the
+        chain of components they were referenced through (see
+        ``pypcom.component.Binding``), as the same component can be declared
+        on more than one parent.
+
+        Args:
+            component (PageComponent): The component to take the element of.
+        """
+        prefetched = self.__dict__.get("_pypcom_prefetched_elements")
+        if not prefetched:
+            return None
+        return prefetched.pop(component._get_parent_chain(), None)
+
+    @property
+    def _prefetched_elements(self):
+        """Elements found by ``prefetch`` that haven't been used yet."""
+        prefetched = self.__dict__.get("_pypcom_prefetched_elements")
+        if prefetched is None:
+            prefetched = self.__dict__["_pypcom_prefetched_elements"] = {}
+        return prefetched
+
+    def wait_for_idle(self, idle_ms=500, timeout=10, animations=True):
+        """Wait in the browser until the page has stopped loading things.
+
+        This waits until the document has loaded, and there have been no
+        ``fetch``/``XMLHttpRequest`` requests in flight (or animation frames
+        requested) for ``idle_ms`` milliseconds, all inside an async script,
+        rather than polling from here (see ``pypcom.idle``).
+
+        Example::
+
+            page.search = "red hatchback"
+            page.search_button.click()
+            page.wait_for_idle()
+            assert page.results.count_items() == 12
+
+        Args:
+            idle_ms (int): How many milliseconds the page must be idle for.
+            timeout (int): The maximum number of seconds to wait before
+                failing.
+            animations (bool): Whether or not requested animation frames
+                count as activity.
+
+        Raises:
+            TimeoutException: If the page didn't become idle in time.
+        """
+        from pypcom.idle import wait_for_idle
+        from pypcom.tracing import component_span
+
+        with component_span(self, "wait_for_idle", "wait"):
+            return wait_for_idle(self.driver, idle_ms, timeout, animations)
+
+    def install_idle_tracker(self):
+        """Start tracking requests for ``wait_for_idle`` right away.
+
+        ``wait_for_idle`` installs the tracker itself, but it can only see
+        requests made after it's installed, so this can be used to install it
+        as soon as the page has been navigated to.
+        """
+        from pypcom.idle import install_idle_tracker
+
+        install_idle_tracker(self.driver)
+
+    def checkpoint(self):
+        """Capture the state of the session (see ``pypcom.checkpoint``).
+
+        Example::
+
+            page.log_in("me", "secret")
+            checkpoint = page.checkpoint()
+            checkpoint.save("logged_in.json")
+
+        Returns:
+            Checkpoint: The cookies, storage, and URL of the session.
+        """
+        from pypcom.checkpoint import Checkpoint
+
+        return Checkpoint.capture(self.driver)
+
+    def restore(self, checkpoint):
+        """Put the state from a checkpoint back into the session.
+
+        This navigates to the checkpoint's URL, so anything the page was
+        holding onto about the old document is thrown away.
+
+        Args:
+            checkpoint (Checkpoint): The state to restore.
+        """
+        self._on_navigation()
+        checkpoint.restore(self.driver)
+
+    def _on_navigation(self):
+        """Throw away anything held onto about the current document.
+
+        That's not just what this page is holding onto, but also what every
+        other page made for the same driver is (see
+        ``DriverState.on_navigation``).
+        """
+        state = get_driver_state(self.driver)
+        if state is not None:
+            state.on_navigation()
+        else:
+            self._forget_document()
+
+    def _forget_document(self):
+        """Throw away what this page is holding onto about the document."""
+        if self._active_snapshot is not None:
+            self._active_snapshot.invalidate()
+        self._cancel_warm_up()
+        self.forget_conditions()
+        self.__dict__.pop("_pypcom_prefetched_elements", None)
+
+    def stale_metrics(self):
+        """Get how often each component's elements have gone stale.
+
+        Only components that have run into a stale element are included.
+
+        Returns:
+            dict: The ``StaleMetrics`` of each component, by the dotted path to
+                it from the page.
+        """
+        metrics = self.__dict__.get("_pypcom_stale_metrics")
+        if not metrics:
+            return {}
+        return dict(
+            (path, metrics[component])
+            for path, component in self.iter_components()
+            if component in metrics
+        )
+
+    @property
+    def _stale_metrics(self):
+        """``StaleMetrics`` of the page's components, by component."""
+        metrics = self.__dict__.get("_pypcom_stale_metrics")
+        if metrics is None:
+            metrics = self.__dict__["_pypcom_stale_metrics"] = {}
+        return metrics
+
+    def _on_component_write(self, component):
+        """Called when something is written through one of the components.
+
+        Args:
+            component (PageComponent): The component being written through.
+        """
+        if self._active_snapshot is not None:
+            self._active_snapshot.invalidate()
+        self._cancel_warm_up()
+        self.forget_conditions()
+        prefetched = self.__dict__.get("_pypcom_prefetched_elements")
+        if prefetched:
+            # the component being written through is about to use its element
+            # (before anything has changed), so only that one is kept
+            key = component._get_parent_chain()
+            element = prefetched.get(key)
+            prefetched.clear()
+            if element is not None:
+                prefetched[key] = element
+
+    @property
+    def _condition_memo(self):
+        """The ``ConditionMemo`` of the page (``None`` if it doesn't have one).
+        """
+        if not self._condition_ttl:
+            return None
+        memo = self.__dict__.get("_pypcom_condition_memo")
+        if memo is None:
+            from pypcom.memo import ConditionMemo
+
+            memo = self.__dict__["_pypcom_condition_memo"] = ConditionMemo(
+                self.driver,
+                self._condition_ttl,
+            )
+        return memo
+
+    def forget_conditions(self):
+        """Forget the conditions that were recently met (see ``pypcom.memo``).
+
+        This happens on its own whenever something is written through one of
+        the page's components, or the driver navigates, but anything else
+        that changes the page (e.g. a script) should be followed by this.
+        """
+        memo = self.__dict__.get("_pypcom_condition_memo")
+        if memo is not None:
+            memo.clear()
+
+    @property
+    def _element_cache(self):
+        """``WebElement``s cached by the page's components, by component.
+
+        This is kept with the page's driver (see ``pypcom.driver_state``), so
+        it's shared with every other page made for the same driver.
+        """
+        return get_driver_state(self.driver).element_cache
+
+    def geometry(self, *components):
+        """Get where the given components are on the page, all at once.
+
+        Rather than getting the ``rect`` of each component one at a time, this
+        gets all of them using a single script (per frame).
+
+        Example::
+
+            geometry = page.geometry(page.sidebar, page.content)
+            assert not geometry[page.sidebar].overlaps(geometry[page.content])
+
+        Args:
+            *components (PageComponent): The components to get the position
+                and size of.
+
+        Returns:
+            Geometry: The ``Rect`` of each component, which can be looked up
+                with the component itself.
+        """
+        from pypcom.facts import fetch_geometry
+
+        return fetch_geometry(components)
+
+
+def _walk_subcomponents(components):
+    """Get a ``Binding`` of each component and all of their subcomponents."""
+    from pypcom.component import (
+        Binding,
+        as_binding,
+        iter_component_descriptors,
+    )
+
+    def walk(binding, ancestor_classes):
+        yield binding
+        component = binding.bind()
+        component_cls = type(component)
+        if component_cls in ancestor_classes:
+            return
+        for name, _ in iter_component_descriptors(component_cls):
+            for item in walk(
+                Binding(getattr(component, name)),
+                ancestor_classes + (component_cls,),
+            ):
+                yield item
+
+    for component in components:
+        for item in walk(as_binding(component), ()):
+            yield item
@@ -0,0 +1,149 @@
+"""Read how the current page performed from the browser's Performance API.
+
+Everything is read with a single async script: the navigation timing of the
+document (when the DOM was loaded, and when the page was fully loaded), the
+paint timings (first paint and first contentful paint), the largest contentful
+paint, and how many resources the page loaded (by type). All times are in
+milliseconds since the navigation started.
+
+This is what the performance ``ExpectedAttribute``s (e.g. ``LoadsWithin``)
+check, so a page's performance budget can be asserted along with the rest of
+its state::
+
+    assert page == State(
+        LoadsWithin(3000),
+        LargestContentfulPaintBelow(2500),
+        ResourceCountBelow(80),
+    )
+
+The timings are for the document that has the focus, and only cover what the
+browser supports (e.g. browsers without largest contentful paint support never
+report it).
+"""
+
+
+PERFORMANCE_SCRIPT = r"""
+var done = arguments[arguments.length - 1];
+var result = {
+    navigation: null,
+    paint: {},
+    largestContentfulPaint: null,
+    resources: {},
+    transferSize: 0
+};
+var nav = performance.getEntriesByType
+    ? performance.getEntriesByType("navigation")[0]
+    : null;
+if (nav) {
+    result.navigation = {
+        responseEnd: nav.responseEnd,
+        domContentLoaded: nav.domContentLoadedEventEnd,
+        load: nav.loadEventEnd
+    };
+} else if (performance.timing) {
+    var timing = performance.timing, start = timing.navigationStart;
+    var since = function (time) {
+        return time ? time - start : 0;
+    };
+    result.navigation = {
+        responseEnd: since(timing.responseEnd),
+        domContentLoaded: since(timing.domContentLoadedEventEnd),
+        load: since(timing.loadEventEnd)
+    };
+}
+performance.getEntriesByType("paint").forEach(function (entry) {
+    result.paint[entry.name] = entry.startTime;
+});
+performance.getEntriesByType("resource").forEach(function (entry) {
+    var type = entry.initiatorType || "other";
+    result.resources[type] = (result.resources[type] || 0) + 1;
+    result.transferSize += entry.transferSize || 0;
+});
+function recordPaints(entries) {
+    entries.forEach(function (entry) {
+        result.largestContentfulPaint = (
+            entry.renderTime || entry.loadTime || entry.startTime
+        );
+    });
+}
+var types = (
+    window.PerformanceObserver && PerformanceObserver.supportedEntryTypes
+);
+if (types && types.indexOf("largest-contentful-paint") !== -1) {
+    var observer = new PerformanceObserver(function (list) {
+        recordPaints(list.getEntries());
+    });
+    observer.observe({type: "largest-contentful-paint", buffered: true});
+    // the buffered entries are delivered asynchronously
+    setTimeout(function () {
+        recordPaints(observer.takeRecords());
+        observer.disconnect();
+        done(result);
+    }, 0);
+} else {
+    done(result);
+}
+"""
+
+
+class PerformanceTimings(object):
+    """How the current page performed, according to the browser.
+
+    All times are in milliseconds since the navigation started, and are
+    ``None`` if the browser didn't report them (or they haven't happened
+    yet).
+
+    Attributes:
+        response_end_ms (float): When the document finished downloading.
+        dom_content_loaded_ms (float): When the DOM finished loading.
+        load_ms (float): When the page finished loading.
+        first_paint_ms (float): When anything was first painted.
+        first_contentful_paint_ms (float): When content was first painted.
+        largest_contentful_paint_ms (float): When the largest piece of
+            content was painted.
+        resource_counts (dict): How many resources were loaded, by initiator
+            type (e.g. ``"script"``, ``"img"``).
+        transfer_size (int): How many bytes were transferred for them.
+    """
+
+    def __init__(self, timings):
+        navigation = timings.get("navigation") or {}
+        self.response_end_ms = navigation.get("responseEnd") or None
+        self.dom_content_loaded_ms = navigation.get("domContentLoaded") or None
+        self.load_ms = navigation.get("load") or None
+        paint = timings.get("paint") or {}
+        self.first_paint_ms = paint.get("first-paint")
+        self.first_contentful_paint_ms = paint.get("first-contentful-paint")
+        self.largest_contentful_paint_ms = timings.get(
+            "largestContentfulPaint",
+        )
+        self.resource_counts = dict(timings.get("resources") or {})
+        self.transfer_size = timings.get("transferSize") or 0
+
+    @property
+    def resource_count(self):
+        """How many resources were loaded in total."""
+        return sum(self.resource_counts.values())
+
+    def __repr__(self):
+        return (
+            "<PerformanceTimings load={}ms lcp={}ms resources={}>".format(
+                self.load_ms,
+                self.largest_contentful_paint_ms,
+                self.resource_count,
+            )
+        )
+
+
+def fetch_performance(driver):
+    """Read the performance of the current page with a single script.
+
+    Args:
+        driver (WebDriver): The driver on the page.
+
+    Returns:
+        PerformanceTimings: What the browser reported.
+    """
+    return PerformanceTimings(
+        driver.execute_async_script(PERFORMANCE_SCRIPT) or {},
+    )
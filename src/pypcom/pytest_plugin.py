@@ -1,4 +1,211 @@
+import pytest
+
 from pypcom import State
+from pypcom import tracing
+from pypcom.budget import Baseline, Budget, measure_usage
+from pypcom.checkpoint import CheckpointStore
+
+
+class BudgetWarning(pytest.PytestWarning):
+    """A test went over its budget of page object usage."""
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("pypcom")
+    group.addoption(
+        "--pypcom-trace",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Trace every PyPCOM operation and WebDriver command of the run, "
+            "and write the trace to PATH as Chrome trace event JSON."
+        ),
+    )
+    group.addoption(
+        "--pypcom-budget-baseline",
+        action="store",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Hold each test to the page object usage stored for it in PATH, "
+            "and lower (or add) the stored usage of tests that pass with "
+            "less."
+        ),
+    )
+    group.addoption(
+        "--pypcom-checkpoint-dir",
+        action="store",
+        default=None,
+        metavar="DIR",
+        help=(
+            "Save the checkpoints of the pypcom_checkpoints fixture in DIR, "
+            "so each setup only runs once across processes and runs."
+        ),
+    )
+    parser.addini(
+        "pypcom_budget_commands",
+        "Default budget of WebDriver commands for each test.",
+        default=None,
+    )
+    parser.addini(
+        "pypcom_budget_wait_seconds",
+        "Default budget of seconds spent waiting for each test.",
+        default=None,
+    )
+    parser.addini(
+        "pypcom_budget_action",
+        "What to do when a test goes over its budget ('fail' or 'warn').",
+        default="fail",
+    )
+    parser.addini(
+        "pypcom_budget_wait_slack",
+        "Fraction of a test's baseline waiting time allowed on top of it.",
+        default="0.25",
+    )
+    parser.addini(
+        "pypcom_budget_wait_grace",
+        "Seconds allowed on top of a test's baseline waiting time.",
+        default="0.25",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "pypcom_budget(commands=None, wait_seconds=None, action=None): the "
+        "most WebDriver commands the test's page objects may send, and the "
+        "most seconds they may spend waiting.",
+    )
+    if config.getoption("pypcom_trace", None):
+        config._pypcom_tracer = tracing.start_tracing()
+    baseline_path = config.getoption("pypcom_budget_baseline", None)
+    config._pypcom_baseline = (
+        Baseline(baseline_path) if baseline_path else None
+    )
+
+
+def pytest_unconfigure(config):
+    baseline = getattr(config, "_pypcom_baseline", None)
+    if baseline is not None:
+        baseline.save()
+    tracer = getattr(config, "_pypcom_tracer", None)
+    if tracer is None:
+        return
+    if tracing.get_tracer() is tracer:
+        tracing.stop_tracing()
+    tracer.write(config.getoption("pypcom_trace"))
+
+
+def _get_ini_number(config, name, convert):
+    value = config.getini(name)
+    if value in (None, ""):
+        return None
+    return convert(value)
+
+
+def get_budget(item):
+    """Get the budget a test is held to, and what to do if it goes over.
+
+    The ``pypcom_budget`` marker overrides the ``pypcom_budget_*`` ini
+    options, and if there's a baseline, the budget is tightened to the usage
+    stored for the test.
+
+    Args:
+        item (Item): The test.
+
+    Returns:
+        tuple: The ``Budget``, and the action (``"fail"`` or ``"warn"``), or
+            ``None`` if the test isn't measured.
+    """
+    config = item.config
+    settings = {
+        "commands": _get_ini_number(config, "pypcom_budget_commands", int),
+        "wait_seconds": _get_ini_number(
+            config,
+            "pypcom_budget_wait_seconds",
+            float,
+        ),
+        "action": config.getini("pypcom_budget_action") or "fail",
+    }
+    marker = item.get_closest_marker("pypcom_budget")
+    if marker is not None:
+        settings.update(
+            (key, value) for key, value in marker.kwargs.items()
+            if key != "action" or value is not None
+        )
+    if settings["action"] not in ("fail", "warn"):
+        raise ValueError(
+            "Unsupported pypcom_budget action: {!r}".format(
+                settings["action"],
+            ),
+        )
+    budget = Budget(settings["commands"], settings["wait_seconds"])
+    baseline = getattr(config, "_pypcom_baseline", None)
+    if baseline is not None:
+        stored = baseline.get(item.nodeid)
+        if stored is not None:
+            budget = budget.tightened(
+                stored,
+                float(config.getini("pypcom_budget_wait_slack")),
+                float(config.getini("pypcom_budget_wait_grace")),
+            )
+    elif not budget.is_limited:
+        return None
+    return budget, settings["action"]
+
+
+@pytest.fixture(scope="session")
+def pypcom_checkpoints(pytestconfig):
+    """The checkpoints of setups, by name (see ``CheckpointStore``).
+
+    They're kept for the session (so each setup runs once per worker), or in
+    the ``--pypcom-checkpoint-dir`` directory, if one is given.
+    """
+    return CheckpointStore(pytestconfig.getoption("pypcom_checkpoint_dir"))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    with tracing.span(item.nodeid, "test"):
+        yield
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    budget = get_budget(item)
+    if budget is None:
+        yield
+        return
+    with measure_usage() as usage:
+        yield
+    item._pypcom_budget = budget
+    item._pypcom_usage = usage
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    usage = getattr(item, "_pypcom_usage", None)
+    if call.when != "call" or usage is None or not report.passed:
+        return
+    budget, action = item._pypcom_budget
+    problems = budget.check(usage)
+    if not problems:
+        baseline = item.config._pypcom_baseline
+        if baseline is not None:
+            baseline.record(item.nodeid, usage)
+        return
+    message = "\n".join(
+        ["PyPCOM budget exceeded:"]
+        + ["    {}".format(problem) for problem in problems],
+    )
+    if action == "warn":
+        item.warn(BudgetWarning(message))
+    else:
+        report.outcome = "failed"
+        report.longrepr = message
 
 
 def pytest_assertrepr_compare(config, op, left, right):
@@ -10,4 +217,4 @@ def pytest_assertrepr_compare(config, op, left, right):
             state = right
         else:
             return
-        return state.get_pytest_failure_report_repr()
\ No newline at end of file
+        return state.get_pytest_failure_report_repr()
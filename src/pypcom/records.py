@@ -0,0 +1,254 @@
+"""Compare the data of a large collection against expected records, in bulk.
+
+Checking thousands of rows read from a ``Collection`` against the records
+they're expected to match (e.g. ``Car`` objects from a fixture) one ``__eq__``
+at a time is slow, and a failure only says that two long lists differ. This
+module compares them column by column instead:
+
+* The rows are lined up by their key (one or more fields that identify each
+  row), so rows in a different order aren't reported as changed.
+* Each row is compared as a whole (as a tuple of the fields being compared),
+  so only the rows that differ are gone through field by field.
+* The differences are summarized as rows that are missing, rows that are
+  extra, and rows that changed (by column), with only the first few of each
+  listed.
+
+::
+
+    columns = page.car_table.read_columns()
+    expected = columns_from_records(cars, list(columns))
+    diff = diff_columns(columns, expected, "id")
+    assert diff.matches, "\\n".join(diff.get_report_lines())
+
+``MatchesRecords`` does this as part of a ``State``.
+
+Everything read from the page is text, so the expected values are compared as
+text (``str(value)``, with ``None`` left as is).
+"""
+
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+def _as_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def columns_from_records(records, fields):
+    """Turn records into columns of text.
+
+    Args:
+        records (iterable): The records, as mappings or objects with an
+            attribute for each field.
+        fields (list): The names of the fields to read from each record.
+
+    Returns:
+        dict: A list of the values of each field, by field name.
+    """
+    columns = dict((field, []) for field in fields)
+    for record in records:
+        for field in fields:
+            if isinstance(record, Mapping):
+                value = record.get(field)
+            else:
+                value = getattr(record, field, None)
+            columns[field].append(_as_text(value))
+    return columns
+
+
+def _columns_as_text(columns):
+    return dict(
+        (field, [_as_text(value) for value in column])
+        for field, column in columns.items()
+    )
+
+
+def _get_keys(columns, key_fields):
+    keys = zip(*[columns[field] for field in key_fields])
+    if len(key_fields) == 1:
+        return [key[0] for key in keys]
+    return list(keys)
+
+
+def _index_keys(keys):
+    index = {}
+    duplicates = []
+    for position, key in enumerate(keys):
+        if key in index:
+            duplicates.append(key)
+        else:
+            index[key] = position
+    return index, duplicates
+
+
+def diff_columns(actual, expected, key, fields=None):
+    """Compare the rows of two sets of columns, lined up by their key.
+
+    Args:
+        actual (dict): The columns that were read (e.g. from
+            ``Collection.read_columns``).
+        expected (dict): The columns that were expected (e.g. from
+            ``columns_from_records``). Values that aren't text are compared
+            as text, like they are in ``columns_from_records``.
+        key (str): The name of the field that identifies each row (or a
+            tuple of them).
+        fields (list): The names of the fields to compare (every field in
+            ``expected`` other than the key if ``None``).
+
+    Returns:
+        RecordDiff: The differences.
+    """
+    key_fields = (key,) if isinstance(key, str) else tuple(key)
+    if fields is None:
+        fields = [field for field in expected if field not in key_fields]
+    fields = list(fields)
+    actual = _columns_as_text(actual)
+    expected = _columns_as_text(expected)
+
+    actual_keys = _get_keys(actual, key_fields)
+    expected_keys = _get_keys(expected, key_fields)
+    actual_index, duplicates = _index_keys(actual_keys)
+    expected_index, expected_duplicates = _index_keys(expected_keys)
+    duplicates.extend(expected_duplicates)
+
+    def rows(columns, count):
+        if not fields:
+            return [()] * count
+        return list(zip(*[columns[field] for field in fields]))
+
+    actual_rows = rows(actual, len(actual_keys))
+    expected_rows = rows(expected, len(expected_keys))
+
+    missing = [k for k in expected_index if k not in actual_index]
+    extra = [k for k in actual_index if k not in expected_index]
+    changed = []
+    for row_key, expected_position in expected_index.items():
+        actual_position = actual_index.get(row_key)
+        if actual_position is None:
+            continue
+        if actual_rows[actual_position] == expected_rows[expected_position]:
+            continue
+        changes = []
+        for field in fields:
+            expected_value = expected[field][expected_position]
+            actual_value = actual[field][actual_position]
+            if expected_value != actual_value:
+                changes.append((field, expected_value, actual_value))
+        if changes:
+            changed.append((row_key, changes))
+    return RecordDiff(
+        missing,
+        extra,
+        changed,
+        duplicates,
+        len(expected_keys),
+        len(actual_keys),
+    )
+
+
+class RecordDiff(object):
+    """The differences between the rows that were read, and those expected.
+
+    Attributes:
+        missing (list): The keys of the expected rows that weren't found.
+        extra (list): The keys of the rows that were found, but not expected.
+        changed (list): ``(key, changes)`` pairs for the rows that were found
+            with different values, where ``changes`` is a list of
+            ``(field, expected, actual)`` tuples.
+        duplicates (list): Keys that were found on more than one row.
+        expected_count (int): How many rows were expected.
+        actual_count (int): How many rows were found.
+    """
+
+    def __init__(
+        self,
+        missing,
+        extra,
+        changed,
+        duplicates,
+        expected_count,
+        actual_count,
+    ):
+        self.missing = missing
+        self.extra = extra
+        self.changed = changed
+        self.duplicates = duplicates
+        self.expected_count = expected_count
+        self.actual_count = actual_count
+
+    @property
+    def matches(self):
+        """Whether or not the rows matched exactly."""
+        return not (
+            self.missing or self.extra or self.changed or self.duplicates
+        )
+
+    def changes_by_field(self):
+        """Get the changed rows for each field.
+
+        Returns:
+            dict: ``(key, expected, actual)`` tuples for each row that
+                changed, by field (in the order they were found).
+        """
+        by_field = {}
+        for row_key, changes in self.changed:
+            for field, expected, actual in changes:
+                by_field.setdefault(field, []).append(
+                    (row_key, expected, actual),
+                )
+        return by_field
+
+    def get_report_lines(self, limit=5):
+        """Get a compact summary of the differences.
+
+        Args:
+            limit (int): The most rows to list for each kind of difference.
+
+        Returns:
+            list: The lines of the summary.
+        """
+        lines = [
+            "{} rows expected, {} found: {} missing, {} extra, {} changed"
+            .format(
+                self.expected_count,
+                self.actual_count,
+                len(self.missing),
+                len(self.extra),
+                len(self.changed),
+            ),
+        ]
+
+        def listing(items):
+            text = ", ".join(items[:limit])
+            if len(items) > limit:
+                text += ", ... and {} more".format(len(items) - limit)
+            return text
+
+        for label, keys in (
+            ("missing", self.missing),
+            ("extra", self.extra),
+            ("duplicate keys", self.duplicates),
+        ):
+            if keys:
+                lines.append(
+                    "{}: {}".format(label, listing([repr(k) for k in keys])),
+                )
+        by_field = self.changes_by_field()
+        for field in sorted(by_field, key=lambda f: -len(by_field[f])):
+            changes = by_field[field]
+            lines.append(
+                "{} changed in {} row{}: {}".format(
+                    field,
+                    len(changes),
+                    "" if len(changes) == 1 else "s",
+                    listing([
+                        "{!r}: '{}' is not '{}'".format(key, actual, expected)
+                        for key, expected, actual in changes
+                    ]),
+                ),
+            )
+        return lines
@@ -0,0 +1,155 @@
+"""Serve many component reads from a single bulk fetch.
+
+Verification steps tend to read a lot of things from a lot of components
+(text, attributes, whether they're displayed, etc.), and each of those reads is
+normally at least one WebDriver round trip. A ``Snapshot`` fetches all of those
+facts for a set of components with a single script (per frame) when it's
+entered, and while it's active, those reads are answered from memory instead
+(see ``PageComponent.__getattr__``)::
+
+    with page.snapshot() as snapshot:
+        assert page.header.title.text == "Dashboard"
+        assert page.header.logout.get_attribute("href") == "/logout"
+        assert page.sidebar.is_displayed()
+
+Anything written through a component of the page (setting its value, or
+calling ``click``, ``send_keys``, ``clear`` or ``submit``) makes the snapshot
+stale, since the page may have changed, and from then on, reads go to the
+browser as they normally would. ``refresh`` fetches everything again.
+
+Changes made to the page some other way (e.g. through the driver directly, or
+by the page's own JavaScript) aren't detected, so a snapshot should only be
+used while the page is expected to be stable.
+"""
+
+from pypcom.component import as_binding
+from pypcom.facts import ATTRIBUTE_FACT_PREFIX, DEFAULT_FACTS, fetch_facts
+
+
+#: Attributes that are fetched when no specific attributes are asked for.
+DEFAULT_ATTRIBUTES = (
+    "id",
+    "name",
+    "class",
+    "type",
+    "value",
+    "href",
+    "src",
+    "placeholder",
+    "title",
+)
+
+# The fact each read is answered from.
+_PROPERTY_FACTS = {
+    "text": "text",
+    "tag_name": "tag_name",
+    "rect": "rect",
+    "location": "rect",
+    "size": "rect",
+}
+_METHOD_FACTS = {
+    "is_displayed": "displayed",
+    "is_enabled": "enabled",
+}
+
+
+class Snapshot(object):
+    """Facts about a set of components, fetched all at once.
+
+    This is normally made through ``Page.snapshot``, and has to be entered as
+    a context manager for reads to be answered by it.
+
+    Args:
+        page (Page): The page the components belong to.
+        components (list): The (bound) components to fetch the facts of (or
+            their ``Binding``s).
+        attributes (iterable): The attributes to fetch for each component.
+    """
+
+    def __init__(self, page, components, attributes=DEFAULT_ATTRIBUTES):
+        self._page = page
+        self._bindings = [
+            binding for binding in map(as_binding, components)
+            if binding.component._locator is not None
+        ]
+        self._facts = list(DEFAULT_FACTS) + ["rect"] + [
+            ATTRIBUTE_FACT_PREFIX + name for name in attributes
+        ]
+        self._views = {}
+        self._previous = None
+        self.stale = True
+
+    def __enter__(self):
+        self.refresh()
+        self._previous = self._page._active_snapshot
+        self._page._active_snapshot = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._page._active_snapshot = self._previous
+        self._previous = None
+        self._views = {}
+        self.stale = True
+
+    def refresh(self):
+        """Fetch the facts for every component again."""
+        views = fetch_facts(self._bindings, self._facts)
+        self._views = dict(
+            (binding.key, view)
+            for binding, view in zip(self._bindings, views)
+        )
+        self.stale = False
+
+    def invalidate(self):
+        """Mark the snapshot as stale, so reads go to the browser again."""
+        self.stale = True
+
+    def get_view(self, component):
+        """Get the ``FactView`` of the component, if it's fresh.
+
+        Components are shared by every parent they're declared on, so the
+        view is looked up by the chain of components it was referenced
+        through.
+        """
+        if self.stale:
+            return None
+        return self._views.get(component._get_parent_chain())
+
+    def read(self, component, name):
+        """Try to answer a read of an attribute of the component's element.
+
+        Args:
+            component (PageComponent): The component being read from.
+            name (str): The name of the attribute being read.
+
+        Returns:
+            tuple: Whether or not the read could be answered, and the answer.
+        """
+        view = self.get_view(component)
+        if view is None:
+            return False, None
+        # reads of elements that weren't present raise, just as they would
+        # have if the element had been looked up
+        present = view.is_present()
+        if name in _PROPERTY_FACTS:
+            if present and not view.has_fact(_PROPERTY_FACTS[name]):
+                return False, None
+            return True, getattr(view, name)
+        if name in _METHOD_FACTS:
+            if present and not view.has_fact(_METHOD_FACTS[name]):
+                return False, None
+            return True, getattr(view, name)
+        if name == "get_attribute":
+            return True, self._make_get_attribute(component, view)
+        return False, None
+
+    def _make_get_attribute(self, component, view):
+        def get_attribute(name):
+            fact = ATTRIBUTE_FACT_PREFIX + name
+            if not self.stale and (
+                view.has_fact(fact) or not view.is_present()
+            ):
+                return view.get_fact(fact)
+            with component.possible_iframe_context():
+                return component._el.get_attribute(name)
+        return get_attribute
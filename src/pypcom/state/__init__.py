@@ -1,18 +1,10 @@
-from pypcom.state.state import State
-from pypcom.state.expected_attribute import (
-    ExpectedAttribute,
-    IsPresent,
-    IsDisplayed,
-    IsEnabled,
-    TagName,
-    Href,
-    Text,
-    Placeholder,
-    Type,
-)
+import sys
+from importlib import import_module
+
 
 __all__ = [
     "State",
+    "EachState",
     "ExpectedAttribute",
     "IsPresent",
     "IsDisplayed",
@@ -22,4 +14,45 @@ __all__ = [
     "Text",
     "Placeholder",
     "Type",
-]
\ No newline at end of file
+    "LayoutAttribute",
+    "Within",
+    "LeftAlignedWith",
+    "NotOverlapping",
+    "PerformanceAttribute",
+    "LoadsWithin",
+    "LargestContentfulPaintBelow",
+    "ResourceCountBelow",
+    "MatchesRecords",
+]
+
+# Everything is imported once it's first referenced (see ``pypcom``).
+_lazy_modules = {
+    "State": "pypcom.state.state",
+    "EachState": "pypcom.state.state",
+}
+_lazy_modules.update(
+    (name, "pypcom.state.expected_attribute")
+    for name in __all__
+    if name not in _lazy_modules
+)
+
+
+def __getattr__(name):
+    try:
+        module_name = _lazy_modules[name]
+    except KeyError:
+        raise AttributeError(
+            "module '{}' has no attribute '{}'".format(__name__, name),
+        )
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_modules))
+
+
+if sys.version_info < (3, 7):
+    for _name in __all__:
+        __getattr__(_name)
@@ -1,7 +1,33 @@
+from pypcom.component import PageComponent
+from pypcom.facts import Placement, Rect, fetch_geometry
+from pypcom.performance import PerformanceTimings, fetch_performance
+from pypcom.records import columns_from_records, diff_columns
+from pypcom.tracing import component_span
+
+
+def _checked_key(key):
+    """Get the key a condition found to be met by a check is remembered by.
+
+    A wait for a condition returns what the condition returned (e.g. the
+    ``WebElement`` for ``"visible"``), which a check doesn't have, so what
+    checks find is kept apart from what waits find. Checks can use either.
+    """
+    return ("checked",) + key
+
+
 class ExpectedAttribute(object):
 
     _problems = None
     name = None
+    # Names of the facts (see ``pypcom.facts``) that ``compare`` reads from the
+    # component. If set, the attribute can be compared against a ``FactView``
+    # that was fetched in bulk, rather than the component itself.
+    _facts = None
+    # The conditions (see ``pypcom.memo``) that, if recently met, mean the
+    # attribute is as expected, as ``(condition, met)`` pairs, by what's
+    # expected. When the attribute is found to be as expected, the first one
+    # is remembered as met (apart from the waits for it; see ``_checked_key``).
+    _memo_conditions = None
 
     def get_name(self):
         """The name of the attribute to be used in the failure message."""
@@ -13,10 +39,44 @@ class ExpectedAttribute(object):
         Args:
             other (obj): The object to check for something expected.
         """
-        try:
-            self.compare(other)
-        except AssertionError as e:
-            self.add_problem(e)
+        with component_span(other, self.get_name(), "expected_attribute"):
+            memo, keys = self._get_memo_keys(other)
+            if any(
+                memo.get(key)[0] or memo.get(_checked_key(key))[0]
+                for key in keys
+            ):
+                return
+            try:
+                self.compare(other)
+            except AssertionError as e:
+                self.add_problem(e)
+                return
+            if keys and not self.get_problems():
+                memo.put(_checked_key(keys[0]))
+
+    def _get_memo_keys(self, other):
+        """Get the page's ``ConditionMemo``, and the keys of the conditions.
+
+        Args:
+            other (obj): The object being compared against.
+
+        Returns:
+            tuple: The memo and the keys of ``_memo_conditions`` in it for
+                what's expected, or ``(None, [])`` if there aren't any.
+        """
+        if self._memo_conditions is None or not isinstance(
+            other,
+            PageComponent,
+        ):
+            return None, []
+        keys = []
+        memo = None
+        for condition, met in self._memo_conditions.get(self._expected, ()):
+            memo, key = other._get_condition_memo(condition, met)
+            if memo is None:
+                return None, []
+            keys.append(key)
+        return memo, keys
 
     def compare(self, other):
         """Defines how to check the other object for something expected.
@@ -84,6 +144,12 @@ class IsPresent(ExpectedAttribute):
         expected (bool): Whether or not the element should be present.
     """
 
+    _facts = ("present",)
+    _memo_conditions = {
+        True: (("present", True), ("visible", True), ("clickable", True)),
+        False: (("present", False),),
+    }
+
     _msg = {
         True: "Element is not present when it should be",
         False: "Element is present when it shouldn't be",
@@ -110,6 +176,9 @@ class IsDisplayed(ExpectedAttribute):
         expected (bool): Whether or not the element should be displayed.
     """
 
+    _facts = ("displayed",)
+    _memo_conditions = {True: (("visible", True), ("clickable", True))}
+
     _msg = {
         True: "Element is not displayed when it should be",
         False: "Element is displayed when it shouldn't be",
@@ -130,6 +199,8 @@ class IsEnabled(ExpectedAttribute):
         expected (bool): Whether or not the element should be enabled.
     """
 
+    _facts = ("enabled",)
+
     _msg = {
         True: "Element is not enabled when it should be",
         False: "Element is enabled when it shouldn't be",
@@ -150,6 +221,8 @@ class TagName(ExpectedAttribute):
         expected (bool): What tag name the element should have.
     """
 
+    _facts = ("tag_name",)
+
     def __init__(self, expected=True):
         self._expected = expected
 
@@ -170,6 +243,8 @@ class Href(ExpectedAttribute):
         expected (bool): What href value the element should have.
     """
 
+    _facts = ("attribute:href",)
+
     def __init__(self, expected=True):
         self._expected = expected
 
@@ -190,6 +265,8 @@ class Text(ExpectedAttribute):
         expected (bool): What text the element should have.
     """
 
+    _facts = ("text",)
+
     def __init__(self, expected=True):
         self._expected = expected
 
@@ -210,6 +287,8 @@ class Placeholder(ExpectedAttribute):
         expected (bool): What placeholder the element should have.
     """
 
+    _facts = ("attribute:placeholder",)
+
     def __init__(self, expected=True):
         self._expected = expected
 
@@ -230,6 +309,8 @@ class Type(ExpectedAttribute):
         expected (bool): What type the element should be.
     """
 
+    _facts = ("attribute:type",)
+
     def __init__(self, expected=True):
         self._expected = expected
 
@@ -241,3 +322,313 @@ class Type(ExpectedAttribute):
             self._expected,
         )
         assert other_type == self._expected, msg
+
+
+class LayoutAttribute(ExpectedAttribute):
+    """Base class for checks on where a component is relative to others.
+
+    The ``Rect`` of the component and of every reference component are
+    fetched together with a single script (see ``pypcom.facts``), and passed
+    to ``compare_rects``, which subclasses must override to define the actual
+    check. The ``Rect``s are fetched fresh for every comparison. When a
+    ``State`` (or ``EachState``) has several of these, it fetches the
+    ``Rect``s they all need at once, and gives each one a ``Placement`` to
+    check instead.
+
+    Args:
+        *references (PageComponent): The components to check the position of
+            the component against.
+        tolerance (float): How many pixels off the check is allowed to be.
+    """
+
+    _facts = ("rect",)
+    _reads_geometry = True
+
+    def __init__(self, *references, **kwargs):
+        self._references = references
+        self._tolerance = kwargs.pop("tolerance", 0)
+        if kwargs:
+            raise TypeError(
+                "Unexpected keyword arguments: {}".format(", ".join(kwargs)),
+            )
+
+    def get_references(self):
+        """The components the position of the component is checked against.
+        """
+        return self._references
+
+    def compare(self, other):
+        """Fetch the ``Rect``s and pass them to ``compare_rects``."""
+        if isinstance(other, Placement):
+            rect = other.rect
+            geometry = other.geometry
+        elif isinstance(other, PageComponent):
+            geometry = fetch_geometry((other,) + self._references)
+            rect = geometry[other]
+        else:
+            rect = Rect.from_dict(other.rect)
+            geometry = fetch_geometry(self._references)
+        reference_rects = [geometry[ref] for ref in self._references]
+        assert rect is not None, "Element is not present"
+        for reference, reference_rect in zip(
+            self._references,
+            reference_rects,
+        ):
+            assert reference_rect is not None, "{} is not present".format(
+                reference.__class__.__name__,
+            )
+        self.compare_rects(rect, reference_rects)
+
+    def compare_rects(self, rect, reference_rects):
+        """Check the component's ``Rect`` against those of the references.
+
+        Args:
+            rect (Rect): Where the component is.
+            reference_rects (list): Where each reference component is, in the
+                order they were given.
+        """
+        raise NotImplementedError(
+            "Must be overridden to define how to check the layout.",
+        )
+
+
+class Within(LayoutAttribute):
+    """Checks if the component is entirely inside another component.
+
+    Args:
+        container (PageComponent): The component it should be inside of.
+        tolerance (float): How many pixels it can stick out by.
+    """
+
+    def __init__(self, container, tolerance=0):
+        super(Within, self).__init__(container, tolerance=tolerance)
+
+    def compare_rects(self, rect, reference_rects):
+        """Check that the element is inside the container."""
+        container_rect = reference_rects[0]
+        msg = "{} is not within {} {}".format(
+            rect,
+            self._references[0].__class__.__name__,
+            container_rect,
+        )
+        assert container_rect.contains(rect, self._tolerance), msg
+
+
+class LeftAlignedWith(LayoutAttribute):
+    """Checks if the component's left edge lines up with another component's.
+
+    Args:
+        reference (PageComponent): The component it should be aligned with.
+        tolerance (float): How many pixels off the alignment can be.
+    """
+
+    def __init__(self, reference, tolerance=0):
+        super(LeftAlignedWith, self).__init__(reference, tolerance=tolerance)
+
+    def compare_rects(self, rect, reference_rects):
+        """Check that the left edges line up."""
+        reference_rect = reference_rects[0]
+        msg = "Left edge at {} is not aligned with {} left edge at {}".format(
+            rect.left,
+            self._references[0].__class__.__name__,
+            reference_rect.left,
+        )
+        assert abs(rect.left - reference_rect.left) <= self._tolerance, msg
+
+
+class NotOverlapping(LayoutAttribute):
+    """Checks that the component doesn't overlap any of the other components.
+
+    Every overlap is reported as its own problem.
+
+    Args:
+        *others (PageComponent): The components it shouldn't overlap.
+    """
+
+    def compare_rects(self, rect, reference_rects):
+        """Check that the element doesn't overlap any of the others."""
+        for other, other_rect in zip(self._references, reference_rects):
+            if rect.overlaps(other_rect):
+                self.add_problem(
+                    AssertionError(
+                        "{} overlaps {} {}".format(
+                            rect,
+                            other.__class__.__name__,
+                            other_rect,
+                        ),
+                    ),
+                )
+
+
+class PerformanceAttribute(ExpectedAttribute):
+    """Base class for checks on how the page performed.
+
+    The page's performance is read from the browser with a single script (see
+    ``pypcom.performance``), and passed to ``compare_timings``, which
+    subclasses must override to define the actual check. These can be checked
+    against a ``Page`` or any of its components (only the driver is used), and
+    when a ``State`` has several of them, the performance is only read once
+    for all of them.
+    """
+
+    _reads_performance = True
+
+    def compare(self, other):
+        """Read the performance and pass it to ``compare_timings``."""
+        if not isinstance(other, PerformanceTimings):
+            other = fetch_performance(other.driver)
+        self.compare_timings(other)
+
+    def compare_timings(self, timings):
+        """Check the page's performance.
+
+        Args:
+            timings (PerformanceTimings): How the page performed.
+        """
+        raise NotImplementedError(
+            "Must be overridden to define how to check the performance.",
+        )
+
+
+class LoadsWithin(PerformanceAttribute):
+    """Checks that the page finished loading within a number of milliseconds.
+
+    Args:
+        ms (float): The most milliseconds loading should have taken.
+        event (str): Which event counts as finished loading (``"load"``, or
+            ``"domcontentloaded"``).
+    """
+
+    _events = {
+        "load": "load_ms",
+        "domcontentloaded": "dom_content_loaded_ms",
+    }
+
+    def __init__(self, ms, event="load"):
+        if event not in self._events:
+            raise ValueError("Unsupported event '{}'".format(event))
+        self._ms = ms
+        self._event = event
+
+    def compare_timings(self, timings):
+        """Check when the page finished loading."""
+        loaded = getattr(timings, self._events[self._event])
+        assert loaded is not None, "Page hasn't finished loading"
+        msg = "Page took {:.0f}ms to {}, which is over {}ms".format(
+            loaded,
+            self._event,
+            self._ms,
+        )
+        assert loaded <= self._ms, msg
+
+
+class LargestContentfulPaintBelow(PerformanceAttribute):
+    """Checks that the largest contentful paint happened soon enough.
+
+    Args:
+        ms (float): The milliseconds it should have happened before.
+    """
+
+    def __init__(self, ms):
+        self._ms = ms
+
+    def compare_timings(self, timings):
+        """Check when the largest contentful paint happened."""
+        paint = timings.largest_contentful_paint_ms
+        assert paint is not None, "No largest contentful paint was reported"
+        msg = "Largest contentful paint at {:.0f}ms is not below {}ms".format(
+            paint,
+            self._ms,
+        )
+        assert paint < self._ms, msg
+
+
+class ResourceCountBelow(PerformanceAttribute):
+    """Checks that the page loaded fewer than a number of resources.
+
+    Args:
+        count (int): How many resources it should have loaded fewer than.
+        *initiator_types (str): Only count these types of resources (e.g.
+            ``"script"``, ``"img"``), rather than all of them.
+    """
+
+    def __init__(self, count, *initiator_types):
+        self._count = count
+        self._initiator_types = initiator_types
+
+    def compare_timings(self, timings):
+        """Check how many resources the page loaded."""
+        if self._initiator_types:
+            loaded = sum(
+                timings.resource_counts.get(initiator_type, 0)
+                for initiator_type in self._initiator_types
+            )
+            kind = "{} resources".format("/".join(self._initiator_types))
+        else:
+            loaded = timings.resource_count
+            kind = "resources"
+        msg = "{} {} were loaded, which is not below {}".format(
+            loaded,
+            kind,
+            self._count,
+        )
+        assert loaded < self._count, msg
+
+
+class MatchesRecords(ExpectedAttribute):
+    """Checks if the items of a collection match the expected records.
+
+    The items are read from the ``Collection`` in bulk, and compared against
+    the records column by column, lined up by their key (see
+    ``pypcom.records``), so the order of the items doesn't matter. The
+    failure report summarizes the rows that are missing, extra, or changed::
+
+        MatchesRecords: 5 rows expected, 4 found: 1 missing, 0 extra, 2 changed
+            missing: '4'
+            color changed in 2 rows: '1': 'Red' is not 'Blue', '3': ...
+
+    Args:
+        records (iterable): The expected records, as mappings or objects with
+            an attribute for each field.
+        key (str): The name of the field that identifies each item (or a
+            tuple of them).
+        fields (list): The names of the fields to compare (all of the
+            collection's fields if ``None``).
+        chunk_size (int): How many items to read with each script.
+        limit (int): The most rows to list for each kind of difference.
+    """
+
+    def __init__(self, records, key, fields=None, chunk_size=500, limit=5):
+        self._records = records
+        self._key = key
+        self._fields = fields
+        self._chunk_size = chunk_size
+        self._limit = limit
+        self._diff = None
+
+    def compare(self, other):
+        """Read the items, and compare them against the records."""
+        key_fields = (
+            (self._key,) if isinstance(self._key, str) else tuple(self._key)
+        )
+        fields = self._fields
+        if fields is None:
+            fields = other.field_names
+        fields = [field for field in fields if field not in key_fields]
+        read_fields = list(key_fields) + fields
+        self._diff = diff_columns(
+            other.read_columns(read_fields, self._chunk_size),
+            columns_from_records(self._records, read_fields),
+            key_fields,
+            fields,
+        )
+        assert self._diff.matches, self._diff.get_report_lines(self._limit)[0]
+
+    def get_report_messages(self):
+        """Get the summary of the differences, with a line for each kind."""
+        if self._diff is None or self._diff.matches:
+            return super(MatchesRecords, self).get_report_messages()
+        lines = self._diff.get_report_lines(self._limit)
+        return ["    {}: {}".format(self.get_name(), lines[0])] + [
+            "        {}".format(line) for line in lines[1:]
+        ]
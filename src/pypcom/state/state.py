@@ -1,4 +1,9 @@
+import copy
+
 from pypcom import PC
+from pypcom.facts import Placement, Rect, fetch_facts, fetch_geometry
+from pypcom.performance import fetch_performance
+from pypcom.tracing import component_span
 
 
 class State(object):
@@ -45,12 +50,39 @@ class State(object):
 
     def __eq__(self, other):
         self._other_class_name = other.__class__.__name__
-        for attr in self._expected_attributes:
-            attr.safe_compare(other)
-            self.add_problems_of_attr(attr)
+        timings = None
+        geometry = None
+        with component_span(other, "State", "state"):
+            for attr in self._expected_attributes:
+                subject = other
+                if getattr(attr, "_reads_performance", False):
+                    # the page's performance is read once for all of them
+                    if timings is None:
+                        timings = fetch_performance(other.driver)
+                    subject = timings
+                elif getattr(attr, "_reads_geometry", False) and isinstance(
+                    other,
+                    PC,
+                ):
+                    # as are the rects of every layout check's components
+                    if geometry is None:
+                        geometry = fetch_geometry(
+                            (other,) + self._get_layout_references(),
+                        )
+                    subject = Placement(geometry[other], geometry)
+                attr.safe_compare(subject)
+                self.add_problems_of_attr(attr)
         if self._problems:
             return False
 
+    def _get_layout_references(self):
+        """Get the components that the layout checks check against."""
+        references = []
+        for attr in self._expected_attributes:
+            if getattr(attr, "_reads_geometry", False):
+                references.extend(attr.get_references())
+        return tuple(references)
+
     def add_problems_of_attr(self, attr):
         """Grab and store the reported problems of the ``ExpectedAttribute``.
 
@@ -110,3 +142,119 @@ class State(object):
                 report_messages.extend(messages)
                 continue
         return report_messages
+
+
+class EachState(State):
+    """The expected state of every item in a collection of components.
+
+    This works like ``State``, except it's compared against an iterable of
+    components (e.g. the rows of a table), and checks every one of them::
+
+        def test_rows(self, page):
+            assert page.car_table.car_items == EachState(
+                IsDisplayed(),
+                IsEnabled(),
+            )
+
+    Rather than checking each ``ExpectedAttribute`` against each component one
+    round trip at a time, the facts that the ``ExpectedAttribute``s need (see
+    ``ExpectedAttribute._facts``) are fetched for all the components at once
+    with ``pypcom.facts.fetch_facts``, and the ``ExpectedAttribute``s are
+    checked against those. Any ``ExpectedAttribute`` that doesn't declare the
+    facts it needs is checked against each component directly, as is
+    everything if the items aren't ``PageComponent``s.
+
+    Problems are grouped by the index of the item they were found on::
+
+        Comparing each CarItem State:
+            [0]:
+                IsDisplayed: Element is not displayed when it should be
+            [3]:
+                IsEnabled: Element is not enabled when it should be
+    """
+
+    def __init__(self, *expected_attributes):
+        super(EachState, self).__init__(*expected_attributes)
+        self._problems_by_index = {}
+
+    def __eq__(self, other):
+        items = list(other)
+        if items:
+            self._other_class_name = items[0].__class__.__name__
+        views = self._fetch_views(items)
+        geometry = None
+        for index, (item, view) in enumerate(zip(items, views)):
+            for attr in self._expected_attributes:
+                item_attr = copy.copy(attr)
+                item_attr._problems = None
+                if view is not None and getattr(
+                    attr,
+                    "_reads_geometry",
+                    False,
+                ):
+                    # the rects of the components the items are checked
+                    # against are fetched once for all of them
+                    if geometry is None:
+                        geometry = fetch_geometry(
+                            self._get_layout_references(),
+                        )
+                    rect = None
+                    if view.is_present():
+                        rect = Rect.from_dict(view.rect)
+                    item_attr.safe_compare(Placement(rect, geometry))
+                elif view is not None and attr._facts is not None:
+                    item_attr.safe_compare(view)
+                else:
+                    item_attr.safe_compare(item)
+                if item_attr.get_problems():
+                    self._problems.append(item_attr)
+                    self._problems_by_index.setdefault(index, []).append(
+                        item_attr,
+                    )
+        return not self._problems
+
+    def _fetch_views(self, items):
+        """Fetch the facts for every item in one pass, if possible.
+
+        Args:
+            items (list): The items being compared against.
+
+        Returns:
+            list: A ``FactView`` for each item, or ``None`` for each item if
+                the facts can't be fetched in bulk.
+        """
+        facts = set()
+        for attr in self._expected_attributes:
+            facts.update(attr._facts or ())
+        bulk = facts and items and all(
+            isinstance(item, PC) for item in items
+        )
+        if not bulk:
+            return [None] * len(items)
+        return fetch_facts(items, sorted(facts))
+
+    def get_pytest_failure_report_repr(self):
+        """Get the failure report repr for ``pytest`` to display in its output.
+
+        This is the same as it is for ``State``, except the problems are
+        grouped by the index of the item they were found on.
+        """
+        report = [
+            "Comparing each {} State:".format(self._other_class_name),
+        ]
+        report.extend(self.get_pytest_failure_report_messages())
+        return report
+
+    def get_pytest_failure_report_messages(self):
+        """Get the report messages from all the problems, grouped by index."""
+        report_messages = []
+        for index in sorted(self._problems_by_index):
+            report_messages.append("    [{}]:".format(index))
+            for attr in self._problems_by_index[index]:
+                messages = attr.get_report_messages()
+                if isinstance(messages, str):
+                    messages = [messages]
+                report_messages.extend(
+                    "    {}".format(message) for message in messages
+                )
+        return report_messages
@@ -0,0 +1,276 @@
+"""Record where the time goes while page objects are used.
+
+While tracing is on, every PyPCOM operation (reading from or calling a method
+of a component's element, setting a component's value, waiting on a
+component, switching to an ``Iframe``, comparing a ``State`` and each of its
+``ExpectedAttribute``s) is recorded as a span, tagged with the path to the
+component it was done through, and every WebDriver command sent along the way
+is recorded as a span inside of it. The spans are written out in the Chrome
+trace event format, so they can be opened in a flame graph viewer like
+``chrome://tracing`` or Perfetto::
+
+    with tracing() as tracer:
+        page.login_form.username = "me"
+        page.login_form.submit.click()
+    tracer.write("login.trace.json")
+
+With the pytest plugin, a whole test run can be traced (with a span for each
+test) by passing ``--pypcom-trace=run.trace.json``.
+
+When tracing is off, none of this costs more than a check of whether or not
+it's on.
+"""
+
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+from pypcom.driver_state import add_execute_hook
+
+
+# The tracer that's currently recording, if any.
+_active_tracer = None
+
+
+class _NullSpan(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span(object):
+    """A span of time being recorded by a ``Tracer``."""
+
+    def __init__(self, tracer, name, category, args):
+        self._tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self._tracer.add_event(self, self._start, end)
+        return False
+
+
+class Tracer(object):
+    """Collects spans as Chrome trace events.
+
+    Attributes:
+        events (list): The trace events recorded so far.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._drivers = weakref.WeakSet()
+        self._drivers_lock = threading.Lock()
+
+    def span(self, name, category="pypcom", args=None):
+        """Make a span that's recorded when it exits.
+
+        Args:
+            name (str): The name of the span.
+            category (str): The category of the span.
+            args (dict): Anything else to record about the span.
+        """
+        return Span(self, name, category, dict(args or {}))
+
+    def add_event(self, span, start, end):
+        self.events.append(
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 3),
+                "dur": round((end - start) * 1e6, 3),
+                "pid": self._pid,
+                "tid": threading.current_thread().ident,
+                "args": span.args,
+            },
+        )
+
+    def watch_driver(self, driver):
+        """Record each WebDriver command sent by the driver as a span.
+
+        A hook is added to the driver (see
+        ``pypcom.driver_state.add_execute_hook``) to record them.
+
+        Args:
+            driver (WebDriver): The driver to watch.
+        """
+        if driver is None:
+            return
+        try:
+            if driver in self._drivers:
+                return
+        except TypeError:
+            # the driver can't be weakly referenced
+            return
+        with self._drivers_lock:
+            if driver not in self._drivers:
+                add_execute_hook(driver, "pypcom.tracing", _traced_execute)
+                self._drivers.add(driver)
+
+    def as_dict(self):
+        return {"traceEvents": list(self.events), "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        """Write the trace to a file as Chrome trace event JSON.
+
+        Args:
+            path (str): Where to write the trace to.
+        """
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f)
+
+
+def _traced_execute(driver_command, proceed):
+    tracer = _active_tracer
+    if tracer is None:
+        return proceed()
+    with tracer.span(driver_command, "webdriver"):
+        return proceed()
+
+
+def start_tracing(tracer=None):
+    """Start recording spans.
+
+    Args:
+        tracer (Tracer): What to record the spans with (a new one if
+            ``None``).
+
+    Returns:
+        Tracer: The tracer that's recording.
+    """
+    global _active_tracer
+    _active_tracer = tracer or Tracer()
+    return _active_tracer
+
+
+def stop_tracing():
+    """Stop recording spans.
+
+    Returns:
+        Tracer: The tracer that was recording, if there was one.
+    """
+    global _active_tracer
+    tracer, _active_tracer = _active_tracer, None
+    return tracer
+
+
+def get_tracer():
+    """Get the tracer that's recording, if there is one."""
+    return _active_tracer
+
+
+@contextmanager
+def tracing(path=None):
+    """Context manager that records spans while it's active.
+
+    Args:
+        path (str): Where to write the trace once the context exits (it isn't
+            written if ``None``).
+    """
+    previous = _active_tracer
+    tracer = start_tracing()
+    try:
+        yield tracer
+    finally:
+        stop_tracing()
+        if previous is not None:
+            start_tracing(previous)
+        if path is not None:
+            tracer.write(path)
+
+
+def span(name, category="pypcom", args=None, driver=None):
+    """Make a span, if tracing is on.
+
+    Args:
+        name (str): The name of the span.
+        category (str): The category of the span.
+        args (dict): Anything else to record about the span.
+        driver (WebDriver): A driver whose commands should be recorded.
+
+    Returns:
+        A context manager that records the span (or does nothing, if tracing
+        is off).
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        return _NULL_SPAN
+    tracer.watch_driver(driver)
+    return tracer.span(name, category, args)
+
+
+def component_span(component, operation, category="component"):
+    """Make a span for an operation done through a component, if tracing is on.
+
+    The span is named after the path to the component from its page, and the
+    operation (e.g. ``LoginPage.login_form.username.send_keys``).
+
+    Anything else the operation is done on (e.g. a ``Page``) is named after
+    its class.
+
+    Args:
+        component (PageComponent): The component the operation is done
+            through.
+        operation (str): What's being done.
+        category (str): The category of the span.
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        return _NULL_SPAN
+    path = component_path(component)
+    tracer.watch_driver(getattr(component, "driver", None))
+    return tracer.span(
+        "{}.{}".format(path, operation),
+        category,
+        {"component": path, "operation": operation},
+    )
+
+
+def component_path(component):
+    """Get the dotted path to the component from its page (or top parent).
+
+    Args:
+        component (PageComponent): The (bound) component (anything else is
+            just named after its class).
+    """
+    from pypcom.component import PageComponent, iter_component_descriptors
+
+    names = []
+    node = component
+    while isinstance(node, PageComponent):
+        parent = node._parent
+        if parent is None:
+            names.append(node.__class__.__name__)
+            break
+        for name, descriptor in iter_component_descriptors(type(parent)):
+            if descriptor is node:
+                names.append(name)
+                break
+        else:
+            names.append(node.__class__.__name__)
+        node = parent
+    if node is not None and not isinstance(node, PageComponent):
+        names.append(node.__class__.__name__)
+    return ".".join(reversed(names))
@@ -0,0 +1,182 @@
+"""Find the elements of a page's components in the background.
+
+Right after a page is navigated to, tests often spend a while doing things
+that don't involve the browser (e.g. preparing data) before they start using
+the page's components, and each component then pays for finding its element
+the first time it's used. A ``Warmup`` uses that time instead: a background
+thread finds the elements of the page's components (with one script per batch
+of them, like ``Page.prefetch``) and hands them to the page, so the test finds
+them waiting when it gets to them::
+
+    page = DashboardPage(driver)
+    page.warm_up()
+    expected = build_expected_rows()  # the elements are found meanwhile
+    assert page.header.title.text == expected.title
+
+The test always comes first. Every WebDriver command is sent while holding a
+lock for its driver (so the two threads never send commands at the same time),
+and as soon as the test sends a command of its own (or writes through one of
+the page's components), the warm-up stops, and throws away anything it's in
+the middle of finding. Only components in the page's own document are warmed
+up, as switching into an iframe from the background would move the test's
+focus.
+"""
+
+import threading
+import weakref
+from functools import partial
+
+from pypcom.component import as_binding
+from pypcom.driver_state import add_execute_hook
+from pypcom.facts import RESOLVE_ELEMENTS_SCRIPT, locator_chain
+
+
+# The lock each driver's commands are sent while holding, and the warm-ups
+# that are running for each driver.
+_driver_locks = weakref.WeakKeyDictionary()
+_driver_warmups = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_driver_lock(driver):
+    """Get the lock that the driver's commands are sent while holding.
+
+    The first time this is called for a driver, a hook is added to it (see
+    ``pypcom.driver_state.add_execute_hook``) so that it holds the lock for
+    each command, and so that a command sent by any thread other than a
+    warm-up's makes the warm-up stop.
+
+    Args:
+        driver (WebDriver): The driver to get the lock of.
+    """
+    with _registry_lock:
+        lock = _driver_locks.get(driver)
+        if lock is None:
+            lock = _driver_locks[driver] = threading.RLock()
+            warmups = _driver_warmups[driver] = weakref.WeakSet()
+            add_execute_hook(
+                driver,
+                "pypcom.warmup",
+                partial(_locked_execute, lock, warmups),
+            )
+    return lock
+
+
+def _locked_execute(lock, warmups, driver_command, proceed):
+    current = threading.current_thread()
+    for warmup in list(warmups):
+        if warmup.thread is not current:
+            warmup.cancel()
+    with lock:
+        return proceed()
+
+
+class Warmup(object):
+    """Finds the elements of a page's components in a background thread.
+
+    This is normally made (and started) through ``Page.warm_up``. Everything
+    about the components is worked out when it's made, so the background
+    thread never touches the components themselves (which are shared by
+    every page they're used through).
+
+    Args:
+        page (Page): The page the components belong to.
+        components (list): The (bound) components to find the elements of
+            (or their ``Binding``s).
+        batch_size (int): How many elements to find with each script.
+
+    Attributes:
+        found (int): How many elements have been handed to the page.
+        cancelled (bool): Whether or not the warm-up was stopped early.
+    """
+
+    def __init__(self, page, components, batch_size=20):
+        self._page_ref = weakref.ref(page)
+        self._driver = page.driver
+        self._targets = []
+        for binding in map(as_binding, components):
+            component = binding.bind()
+            if component._locator is None or component.iframe_ancestor:
+                continue
+            chain = locator_chain(component)
+            if chain is not None:
+                self._targets.append(
+                    (binding.key, component._is_iframe, chain),
+                )
+        self._batch_size = batch_size
+        self._store_lock = threading.Lock()
+        self._lock = None
+        self.thread = None
+        self.found = 0
+        self.cancelled = False
+
+    def start(self):
+        """Start finding the elements in a background thread."""
+        self._lock = get_driver_lock(self._driver)
+        _driver_warmups[self._driver].add(self)
+        self.thread = threading.Thread(
+            target=self._run,
+            name="pypcom-warmup",
+        )
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """Stop the warm-up, throwing away anything it hasn't handed over.
+
+        Once this returns, nothing more will be handed to the page.
+        """
+        with self._store_lock:
+            self.cancelled = True
+
+    def join(self, timeout=None):
+        """Wait for the background thread to finish."""
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+    @property
+    def done(self):
+        """Whether or not the background thread has finished."""
+        return self.thread is not None and not self.thread.is_alive()
+
+    def _run(self):
+        from pypcom.component import get_focused_iframe
+
+        for start in range(0, len(self._targets), self._batch_size):
+            batch = self._targets[start:start + self._batch_size]
+            if self.cancelled:
+                return
+            with self._lock:
+                # the test may have sent a command while this was waiting
+                # for the lock, or be holding the focus on an iframe
+                if (
+                    self.cancelled
+                    or get_focused_iframe(self._driver) is not None
+                ):
+                    return
+                try:
+                    elements = self._driver.execute_script(
+                        RESOLVE_ELEMENTS_SCRIPT,
+                        [chain for _, _, chain in batch],
+                    )
+                except Exception:
+                    # anything that goes wrong is left for the components to
+                    # run into themselves
+                    return
+            self._store(batch, elements)
+
+    def _store(self, batch, elements):
+        page = self._page_ref()
+        if page is None:
+            return
+        with self._store_lock:
+            if self.cancelled:
+                return
+            for (key, is_iframe, _), element in zip(batch, elements):
+                if element is None:
+                    continue
+                page._prefetched_elements[key] = element
+                if is_iframe:
+                    page._element_cache[key] = element
+                self.found += 1
@@ -0,0 +1,361 @@
+"""Stream changes to a component's element as they happen.
+
+Rather than polling something like ``component.text`` in a loop (one WebDriver
+command per poll, and changes between polls are missed), a ``Watch`` registers
+a ``MutationObserver`` on the component's element, which buffers every change
+inside the browser. The buffered changes are then drained with long-polling
+async scripts, so each command waits in the browser until there's something to
+report, and delivers everything that happened since the last one::
+
+    with page.dashboard.total.watch(attributes=["class"]) as watch:
+        for event in watch.events(duration=30):
+            print(event.timestamp, event.kind, event.name, event.value)
+
+It can also be iterated over asynchronously (each poll is run in the event
+loop's default executor)::
+
+    async for event in page.dashboard.total.watch():
+        ...
+
+The observer lives in the document, so navigating away ends the watch.
+"""
+
+import collections
+import time
+
+from pypcom.batch import run_in_iframe
+from pypcom.facts import SCRIPT_HELPERS, get_script_target
+
+
+START_WATCH_SCRIPT = SCRIPT_HELPERS + r"""
+var el = resolve(arguments[0]), attributes = arguments[1];
+var watchText = arguments[2];
+if (!el) {
+    return null;
+}
+var registry = window.__pypcomWatches;
+if (!registry) {
+    registry = window.__pypcomWatches = {next: 1, watches: {}};
+}
+function now() {
+    if (window.performance && performance.timeOrigin) {
+        return performance.timeOrigin + performance.now();
+    }
+    return Date.now();
+}
+var watch = {events: [], notify: null, text: watchText ? getText(el) : null};
+function push(event) {
+    watch.events.push(event);
+    if (watch.notify) {
+        var notify = watch.notify;
+        watch.notify = null;
+        notify();
+    }
+}
+watch.observer = new MutationObserver(function (mutations) {
+    var time = now(), textChanged = false;
+    mutations.forEach(function (mutation) {
+        if (mutation.type !== "attributes") {
+            textChanged = true;
+        } else if (mutation.target === el) {
+            push({
+                time: time,
+                kind: "attribute",
+                name: mutation.attributeName,
+                oldValue: mutation.oldValue,
+                value: el.getAttribute(mutation.attributeName)
+            });
+        }
+    });
+    if (watchText && textChanged) {
+        var text = getText(el);
+        if (text !== watch.text) {
+            push({
+                time: time,
+                kind: "text",
+                name: null,
+                oldValue: watch.text,
+                value: text
+            });
+            watch.text = text;
+        }
+    }
+});
+var options = {};
+if (attributes.length) {
+    options.attributes = true;
+    options.attributeFilter = attributes;
+    options.attributeOldValue = true;
+}
+if (watchText) {
+    options.childList = true;
+    options.characterData = true;
+    options.subtree = true;
+}
+watch.observer.observe(el, options);
+var id = registry.next++;
+registry.watches[id] = watch;
+return id;
+"""
+
+DRAIN_WATCH_SCRIPT = r"""
+var done = arguments[arguments.length - 1];
+var maxWaitMs = arguments[1], batchMs = arguments[2];
+var registry = window.__pypcomWatches;
+var watch = registry && registry.watches[arguments[0]];
+if (!watch) {
+    done(null);
+    return;
+}
+var finished = false;
+function finish() {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    watch.notify = null;
+    var events = watch.events;
+    watch.events = [];
+    done(events);
+}
+if (watch.events.length) {
+    finish();
+} else {
+    watch.notify = function () {
+        setTimeout(finish, batchMs);
+    };
+    setTimeout(finish, maxWaitMs);
+}
+"""
+
+STOP_WATCH_SCRIPT = r"""
+var registry = window.__pypcomWatches;
+var watch = registry && registry.watches[arguments[0]];
+if (watch) {
+    watch.observer.disconnect();
+    delete registry.watches[arguments[0]];
+}
+"""
+
+
+class ChangeEvent(object):
+    """A change that was made to a watched element.
+
+    Attributes:
+        timestamp (float): When the change was observed, in seconds since the
+            epoch (according to the browser).
+        kind (str): ``"text"`` or ``"attribute"``.
+        name (str): The name of the attribute that changed (``None`` for text
+            changes).
+        old_value (str): The value before the change.
+        value (str): The value after the change.
+    """
+
+    def __init__(self, timestamp, kind, name, old_value, value):
+        self.timestamp = timestamp
+        self.kind = kind
+        self.name = name
+        self.old_value = old_value
+        self.value = value
+
+    @classmethod
+    def from_dict(cls, event):
+        return cls(
+            event["time"] / 1000.0,
+            event["kind"],
+            event["name"],
+            event["oldValue"],
+            event["value"],
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, ChangeEvent):
+            return NotImplemented
+        return self.__dict__ == other.__dict__
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "<ChangeEvent {} {}: {!r} -> {!r}>".format(
+            self.kind,
+            self.name,
+            self.old_value,
+            self.value,
+        )
+
+
+class Watch(object):
+    """Changes to a component's element, streamed from the browser.
+
+    This is normally made through ``PageComponent.watch``. The observer is
+    registered when it's started, and stays registered until it's stopped
+    (exiting it as a context manager stops it).
+
+    Args:
+        component (PageComponent): The (bound) component to watch.
+        attributes (iterable): Names of the attributes to watch.
+        text (bool): Whether or not to watch the element's text.
+        poll_seconds (float): The longest each poll waits in the browser for
+            something to change.
+        batch_ms (int): How long to wait for more changes once one has been
+            made, so changes made together are delivered together.
+    """
+
+    def __init__(
+        self,
+        component,
+        attributes=(),
+        text=True,
+        poll_seconds=5,
+        batch_ms=50,
+    ):
+        attributes = list(attributes)
+        if not attributes and not text:
+            raise ValueError("Nothing to watch.")
+        self._component = component
+        self._attributes = attributes
+        self._text = text
+        self._poll_seconds = poll_seconds
+        self._batch_ms = batch_ms
+        self._buffer = collections.deque()
+        self._iframe = component.iframe_ancestor
+        self.watch_id = None
+        self.stopped = False
+
+    def __enter__(self):
+        if self.watch_id is None:
+            self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _run(self, func):
+        return run_in_iframe(self._iframe, func, self._component.driver)
+
+    def start(self):
+        """Register the observer on the element.
+
+        Raises:
+            NoSuchElementException: If the element isn't present.
+        """
+        from selenium.common.exceptions import NoSuchElementException
+
+        driver = self._component.driver
+        target = get_script_target(self._component)
+        self.watch_id = self._run(
+            lambda: driver.execute_script(
+                START_WATCH_SCRIPT,
+                target,
+                self._attributes,
+                self._text,
+            ),
+        )
+        if self.watch_id is None:
+            raise NoSuchElementException(
+                "Element for '{}' was not present".format(
+                    self._component.__class__.__name__,
+                ),
+            )
+        self.stopped = False
+        return self
+
+    def poll(self, timeout=None):
+        """Get every change that's been buffered in the browser.
+
+        If nothing has changed yet, this waits in the browser (for up to
+        ``timeout`` seconds) for something to change.
+
+        Args:
+            timeout (float): The longest to wait (``poll_seconds`` if
+                ``None``).
+
+        Returns:
+            list: The ``ChangeEvent``s, oldest first. This is empty if nothing
+                changed in time, or if the watch has ended.
+        """
+        if self.watch_id is None:
+            self.start()
+        if self.stopped:
+            return []
+        if timeout is None:
+            timeout = self._poll_seconds
+        driver = self._component.driver
+        events = self._run(
+            lambda: driver.execute_async_script(
+                DRAIN_WATCH_SCRIPT,
+                self.watch_id,
+                int(round(timeout * 1000)),
+                self._batch_ms,
+            ),
+        )
+        if events is None:
+            # the observer is gone (e.g. the page was navigated away from)
+            self.stopped = True
+            return []
+        return [ChangeEvent.from_dict(event) for event in events]
+
+    def stop(self):
+        """Disconnect the observer, and throw away anything still buffered."""
+        from selenium.common.exceptions import WebDriverException
+
+        if self.watch_id is not None and not self.stopped:
+            driver = self._component.driver
+            try:
+                self._run(
+                    lambda: driver.execute_script(
+                        STOP_WATCH_SCRIPT,
+                        self.watch_id,
+                    ),
+                )
+            except WebDriverException:
+                # the page (or the browser) is already gone
+                pass
+        self.stopped = True
+        self._buffer.clear()
+
+    def events(self, duration=None, clock=time.monotonic):
+        """Yield each change as it's drained from the browser.
+
+        Args:
+            duration (float): How many seconds to keep watching for (forever,
+                or until the watch ends, if ``None``).
+            clock (callable): Returns the current time in seconds.
+
+        Yields:
+            ChangeEvent: Each change, oldest first.
+        """
+        deadline = None if duration is None else clock() + duration
+        while True:
+            while self._buffer:
+                yield self._buffer.popleft()
+            if self.stopped:
+                return
+            timeout = None
+            if deadline is not None:
+                remaining = deadline - clock()
+                if remaining <= 0:
+                    return
+                timeout = min(remaining, self._poll_seconds)
+            self._buffer.extend(self.poll(timeout))
+
+    def __iter__(self):
+        return self.events()
+
+    def _next_event(self):
+        while not self._buffer:
+            if self.stopped:
+                raise StopAsyncIteration
+            self._buffer.extend(self.poll())
+        return self._buffer.popleft()
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        import asyncio
+
+        # only ever called from a coroutine, so there's always a running loop
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(None, self._next_event)
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.analyze import (
+    analyze_page,
+    main,
+    rank,
+    slow_locator_warnings,
+)
+from pypcom.common import Iframe
+
+
+class Username(PC):
+    _find_from_parent = True
+    _locator = ("css selector", "input[name='username']")
+
+
+class LoginForm(PC):
+    _locator = ("id", "login")
+    username = Username()
+
+
+class Row(PC):
+    @property
+    def _locator(self):
+        return ("css selector", "tr")
+
+
+class InnerButton(PC):
+    _locator = ("xpath", "//button")
+
+
+class InnerFrame(Iframe):
+    _locator = ("css selector", "#inner")
+    button = InnerButton()
+
+
+class OuterFrame(Iframe):
+    _locator = ("css selector", "#outer")
+    inner = InnerFrame()
+
+
+class AnalyzedPage(Page):
+    login_form = LoginForm()
+    row = Row()
+    outer = OuterFrame()
+
+
+@pytest.fixture(scope="module")
+def costs():
+    return dict((cost.path, cost) for cost in analyze_page(AnalyzedPage))
+
+
+def test_all_components_found(costs):
+    assert sorted(costs) == [
+        "login_form",
+        "login_form.username",
+        "outer",
+        "outer.inner",
+        "outer.inner.button",
+        "row",
+    ]
+
+
+def test_find_from_parent_lookups(costs):
+    assert costs["login_form.username"].lookups == 2
+    assert costs["login_form.username"].commands == 3
+
+
+def test_nested_iframe_commands(costs):
+    button = costs["outer.inner.button"]
+    assert button.iframe_depth == 2
+    assert button.frame_commands == 4
+    assert button.commands == 6
+
+
+def test_most_expensive_first(costs):
+    assert rank(costs.values())[0].path == "outer.inner.button"
+
+
+def test_dynamic_locator_flagged(costs):
+    assert costs["row"].warnings == [
+        "dynamic _locator can't be checked statically",
+    ]
+
+
+@pytest.mark.parametrize(
+    "locator, slow",
+    [
+        (("xpath", "//div"), True),
+        (("xpath", "/html/body"), False),
+        (("css selector", "div span"), True),
+        (("css selector", "#main span"), False),
+        (("css selector", "div > span"), False),
+        (("css selector", "[data-x='a b']"), False),
+    ],
+)
+def test_slow_locator_warnings(locator, slow):
+    assert bool(slow_locator_warnings(locator)) is slow
+
+
+def test_main_json(capsys):
+    main([__name__, "--json", "--limit", "1"])
+    output = json.loads(capsys.readouterr().out)
+    assert [item["component"] for item in output] == [
+        "AnalyzedPage.outer.inner.button",
+    ]
@@ -0,0 +1,107 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.batch import run_batch
+from pypcom.common import Iframe
+
+
+class Label(PC):
+    def __init__(self, name):
+        self._locator = ("id", name)
+
+
+class SalesFrame(Iframe):
+    _locator = ("id", "sales")
+    total = Label("total")
+    orders = Label("orders")
+
+
+class TrafficFrame(Iframe):
+    _locator = ("id", "traffic")
+    visitors = Label("visitors")
+
+
+class Dashboard(Page):
+    sales = SalesFrame()
+    traffic = TrafficFrame()
+    title = Label("title")
+
+
+@pytest.fixture
+def driver():
+    def find_element(by, value):
+        return MagicMock(text=value)
+
+    driver = MagicMock()
+    driver.find_element.side_effect = find_element
+    return driver
+
+
+@pytest.fixture
+def page(driver):
+    return Dashboard(driver)
+
+
+@pytest.fixture
+def results(page):
+    return run_batch(
+        (component, lambda component: component.text)
+        for component in (
+            page.sales.total,
+            page.traffic.visitors,
+            page.sales.orders,
+            page.title,
+        )
+    )
+
+
+def test_results_in_order(results):
+    assert results == ["total", "visitors", "orders", "title"]
+
+
+def test_each_frame_visited_once(results, driver):
+    assert driver.switch_to.frame.call_count == 2
+
+
+def test_focus_returned_after_each_frame(results, driver):
+    # once by switch_to for each frame, and once when leaving it
+    assert driver.switch_to.default_content.call_count == 4
+
+
+def test_focus_returned_on_error(page, driver):
+    def fail(component):
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        run_batch([(page.sales.total, fail)])
+    assert driver.switch_to.default_content.call_count == 2
+
+
+def test_page_component_used_while_frame_focused(page, driver):
+    calls = []
+    driver.switch_to.frame.side_effect = lambda el: calls.append("frame")
+    driver.switch_to.default_content.side_effect = (
+        lambda: calls.append("default")
+    )
+    driver.find_element.side_effect = (
+        lambda by, value: calls.append(value) or MagicMock(text=value)
+    )
+    with page.sales.focus():
+        assert page.title.text == "title"
+        assert page.sales.total.text == "total"
+    assert calls == [
+        "default", "sales", "frame",
+        "default", "title", "default", "frame",
+        "total",
+        "default",
+    ]
+
+
+def test_batch_of_page_components_while_frame_focused(page, driver):
+    with page.sales.focus():
+        driver.switch_to.reset_mock()
+        assert run_batch([(page.title, lambda c: c.text)]) == ["title"]
+        assert driver.switch_to.default_content.call_count == 2
+        assert driver.switch_to.frame.call_count == 1
@@ -0,0 +1,131 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from pypcom import PC, Page
+from pypcom.benchmark import benchmark_locators, format_table, to_json
+
+
+class Fast(PC):
+    _locator = ("id", "fast")
+
+
+class Slow(PC):
+    _locator = ("xpath", "//slow")
+
+
+class Missing(PC):
+    _locator = ("id", "missing")
+
+
+class Group(PC):
+    slow = Slow()
+
+
+class BenchmarkedPage(Page):
+    fast = Fast()
+    group = Group()
+    missing = Missing()
+
+
+class FakeClock(object):
+    now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def page(clock):
+    costs = {"fast": 0.001, "//slow": 0.05}
+
+    def find_element(by, value):
+        if value == "missing":
+            raise NoSuchElementException()
+        clock.now += costs[value]
+        return MagicMock()
+
+    driver = MagicMock()
+    driver.find_element.side_effect = find_element
+    return BenchmarkedPage(driver)
+
+
+@pytest.fixture
+def results(page, clock):
+    return benchmark_locators(page, runs=3, clock=clock)
+
+
+def test_slowest_first(results):
+    assert [result.path for result in results] == [
+        "group.slow",
+        "fast",
+        "missing",
+    ]
+
+
+def test_runs(page, results):
+    assert page.driver.find_element.call_count == 7
+    assert len(results[0].timings) == 3
+
+
+def test_json(results):
+    output = json.loads(to_json(results))
+    assert output[0]["median_ms"] == 50.0
+    assert output[2]["error"] == "NoSuchElementException"
+
+
+def test_table(results):
+    lines = format_table(results).splitlines()
+    assert len(lines) == 4
+    assert lines[1].startswith("group.slow")
+
+
+class Title(PC):
+    _locator = ("tag name", "h1")
+    _find_from_parent = True
+
+
+class Header(PC):
+    title = Title()
+
+
+class Top(Header):
+    _locator = ("id", "top")
+
+
+class Bottom(Header):
+    _locator = ("id", "bottom")
+
+
+class HeadersPage(Page):
+    top = Top()
+    bottom = Bottom()
+
+
+def test_shared_component_timed_through_its_path(clock):
+    costs = {"top": 0.01, "bottom": 0.02}
+
+    def find_element(by, value):
+        element = MagicMock()
+
+        def find_title(by, value):
+            clock.now += costs[element.id]
+            return MagicMock()
+
+        element.id = value
+        element.find_element.side_effect = find_title
+        return element
+
+    driver = MagicMock()
+    driver.find_element.side_effect = find_element
+    results = benchmark_locators(HeadersPage(driver), runs=1, clock=clock)
+    medians = dict((result.path, result.median) for result in results)
+    assert medians["top.title"] == pytest.approx(0.01)
+    assert medians["bottom.title"] == pytest.approx(0.02)
@@ -0,0 +1,156 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.budget import Baseline, Budget, Usage, measure_usage
+
+pytest_plugins = ["pytester"]
+
+
+class FakeDriver(object):
+    """Sends every command through ``execute``, like a real driver."""
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, command, params):
+        self.commands.append(command)
+        return MagicMock(text="Welcome")
+
+    def find_element(self, by, value):
+        return self.execute("findElement", {"using": by, "value": value})
+
+
+class Title(PC):
+    _locator = ("id", "title")
+
+
+class HomePage(Page):
+    title = Title()
+
+
+@pytest.fixture
+def driver():
+    return FakeDriver()
+
+
+@pytest.fixture
+def page(driver):
+    return HomePage(driver)
+
+
+def test_only_page_object_commands_counted(page, driver):
+    with measure_usage() as usage:
+        page.title.text
+        page.title.click()
+        driver.find_element("id", "direct")
+    assert usage.commands == 2
+    assert len(driver.commands) == 3
+
+
+def test_wait_time_measured(page, monkeypatch):
+    monkeypatch.setattr(Title, "_get_wait_condition_callable", MagicMock())
+    with measure_usage() as usage:
+        page.title.wait_until("visible")
+    assert 0 < usage.wait_seconds < 1
+
+
+def test_check():
+    budget = Budget(commands=3, wait_seconds=1)
+    assert budget.check(Usage(3, 0.5)) == []
+    assert budget.check(Usage(4, 1.5)) == [
+        "4 WebDriver commands were sent, which is over the budget of 3",
+        "1.50s were spent waiting, which is over the budget of 1.00s",
+    ]
+
+
+def test_tightened():
+    budget = Budget(commands=10).tightened(Usage(7, 2.0), 0.5, 0.25)
+    assert budget.commands == 7
+    assert budget.wait_seconds == 3.25
+
+
+def test_baseline_only_goes_down(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    baseline = Baseline(path)
+    baseline.record("test_a", Usage(10, 1.0))
+    baseline.save()
+    baseline = Baseline(path)
+    baseline.record("test_a", Usage(12, 0.5))
+    baseline.save()
+    with open(path) as f:
+        assert json.load(f) == {
+            "test_a": {"commands": 10, "wait_seconds": 0.5},
+        }
+
+
+PLUGIN_TEST = """
+    import pytest
+    from tests.test_budget import FakeDriver, HomePage
+
+    @pytest.mark.pypcom_budget(commands=1)
+    def test_over():
+        page = HomePage(FakeDriver())
+        page.title.text
+        page.title.text
+
+    @pytest.mark.pypcom_budget(commands=2)
+    def test_within():
+        page = HomePage(FakeDriver())
+        page.title.text
+        page.title.text
+"""
+
+
+@pytest.fixture
+def suite(pytester, request):
+    pytester.syspathinsert(request.config.rootpath)
+    pytester.makepyfile(test_suite=PLUGIN_TEST)
+    return pytester
+
+
+def test_marker_fails_test(suite):
+    result = suite.runpytest("-p", "no:cacheprovider")
+    result.assert_outcomes(passed=1, failed=1)
+    result.stdout.fnmatch_lines([
+        "*PyPCOM budget exceeded:",
+        "*2 WebDriver commands were sent, which is over the budget of 1",
+    ])
+
+
+def test_warn(suite):
+    suite.makeini("[pytest]\npypcom_budget_action = warn\n")
+    result = suite.runpytest("-p", "no:cacheprovider")
+    result.assert_outcomes(passed=2, warnings=1)
+
+
+def test_baseline_ratchet(suite, tmp_path):
+    suite.makeini("[pytest]\npypcom_budget_commands = 5\n")
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps({
+            "test_suite.py::test_within": {"commands": 3, "wait_seconds": 0},
+        }),
+    )
+    result = suite.runpytest(
+        "-p",
+        "no:cacheprovider",
+        "--pypcom-budget-baseline={}".format(baseline),
+    )
+    result.assert_outcomes(passed=1, failed=1)
+    stored = json.loads(baseline.read_text())
+    assert stored["test_suite.py::test_within"]["commands"] == 2
+    assert "test_suite.py::test_over" not in stored
+    baseline.write_text(
+        json.dumps({
+            "test_suite.py::test_within": {"commands": 1, "wait_seconds": 0},
+        }),
+    )
+    result = suite.runpytest(
+        "-p",
+        "no:cacheprovider",
+        "--pypcom-budget-baseline={}".format(baseline),
+    )
+    result.assert_outcomes(passed=0, failed=2)
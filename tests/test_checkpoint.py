@@ -0,0 +1,152 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.checkpoint import (
+    CAPTURE_STORAGE_SCRIPT,
+    RESTORE_STORAGE_SCRIPT,
+    Checkpoint,
+    CheckpointStore,
+)
+
+pytest_plugins = ["pytester"]
+
+
+class Greeting(PC):
+    _locator = ("id", "greeting")
+
+
+class AccountPage(Page):
+    greeting = Greeting()
+
+
+COOKIES = [{"name": "session", "value": "abc", "httpOnly": True}]
+
+
+@pytest.fixture
+def driver():
+    driver = MagicMock()
+    driver.current_url = "https://shop.example.com/account"
+    driver.execute_script.return_value = {
+        "url": "https://shop.example.com/account",
+        "localStorage": {"cart": "[1, 2]"},
+        "sessionStorage": {"tab": "orders"},
+    }
+    driver.get_cookies.return_value = COOKIES
+    return driver
+
+
+@pytest.fixture
+def page(driver):
+    return AccountPage(driver)
+
+
+def test_checkpoint(page, driver):
+    checkpoint = page.checkpoint()
+    driver.execute_script.assert_called_once_with(CAPTURE_STORAGE_SCRIPT)
+    assert checkpoint.url == "https://shop.example.com/account"
+    assert checkpoint.cookies == COOKIES
+    assert checkpoint.local_storage == {"cart": "[1, 2]"}
+    assert checkpoint.session_storage == {"tab": "orders"}
+
+
+def test_restore_same_origin(page, driver):
+    checkpoint = Checkpoint(
+        "https://shop.example.com/account",
+        COOKIES,
+        {"cart": "[1, 2]"},
+        {"tab": "orders"},
+    )
+    page.restore(checkpoint)
+    assert [call[0] for call in driver.method_calls] == [
+        "delete_all_cookies",
+        "add_cookie",
+        "execute_script",
+        "get",
+    ]
+    driver.add_cookie.assert_called_once_with(COOKIES[0])
+    driver.execute_script.assert_called_once_with(
+        RESTORE_STORAGE_SCRIPT,
+        {"cart": "[1, 2]"},
+        {"tab": "orders"},
+    )
+    driver.get.assert_called_once_with("https://shop.example.com/account")
+
+
+def test_restore_other_origin(page, driver):
+    driver.current_url = "about:blank"
+    driver.get.side_effect = lambda url: setattr(driver, "current_url", url)
+    page.restore(Checkpoint("https://shop.example.com/account"))
+    assert driver.get.call_count == 2
+
+
+def test_restore_redirected_off_origin(page, driver):
+    driver.current_url = "about:blank"
+    driver.get.side_effect = lambda url: setattr(
+        driver,
+        "current_url",
+        "https://sso.example.com/login",
+    )
+    with pytest.raises(RuntimeError):
+        page.restore(Checkpoint("https://shop.example.com/account"))
+    assert not driver.add_cookie.called
+
+
+def test_restore_forgets_elements(page, driver):
+    page._prefetched_elements[page.greeting] = MagicMock()
+    page.restore(Checkpoint("https://shop.example.com/account"))
+    assert not page._prefetched_elements
+
+
+def test_save_and_load(page, tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    page.checkpoint().save(path)
+    checkpoint = Checkpoint.load(path)
+    assert checkpoint.as_dict() == page.checkpoint().as_dict()
+
+
+def test_save_replaces_whole_file(page, tmp_path):
+    path = tmp_path / "checkpoint.json"
+    path.write_text("old")
+    checkpoint = page.checkpoint()
+    checkpoint.cookies.append({"name": "bad", "value": object()})
+    with pytest.raises(TypeError):
+        checkpoint.save(str(path))
+    assert path.read_text() == "old"
+    checkpoint.cookies.pop()
+    checkpoint.save(str(path))
+    assert Checkpoint.load(str(path)).cookies == COOKIES
+    assert [p.name for p in tmp_path.iterdir()] == ["checkpoint.json"]
+
+
+def test_store_runs_setup_once(page, driver, tmp_path):
+    setup = MagicMock()
+    store = CheckpointStore(str(tmp_path / "checkpoints"))
+    store.restore_or_run("logged in", page, setup)
+    store.restore_or_run("logged in", page, setup)
+    assert setup.call_count == 1
+    assert driver.delete_all_cookies.call_count == 1
+    assert (tmp_path / "checkpoints" / "logged_in.json").exists()
+    CheckpointStore(str(tmp_path / "checkpoints")).restore_or_run(
+        "logged in",
+        page,
+        setup,
+    )
+    assert setup.call_count == 1
+
+
+def test_fixture(pytester):
+    directory = pytester.path / "checkpoints"
+    pytester.makepyfile(
+        """
+        def test_store(pypcom_checkpoints):
+            assert pypcom_checkpoints.directory == {!r}
+        """.format(str(directory)),
+    )
+    result = pytester.runpytest(
+        "-p",
+        "no:cacheprovider",
+        "--pypcom-checkpoint-dir={}".format(directory),
+    )
+    result.assert_outcomes(passed=1)
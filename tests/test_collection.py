@@ -0,0 +1,192 @@
+import io
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import Page
+from pypcom.common import Collection, VirtualScrollCollection
+
+
+class CarTable(Collection):
+    _locator = ("css selector", ".carTable")
+    _item_locator = ("css selector", "tbody tr")
+    _fields = (
+        ("id", "td:nth-of-type(1) input", "value"),
+        ("make", "td:nth-of-type(2)"),
+        ("year", "td:nth-of-type(3)"),
+    )
+
+
+class CarTablePage(Page):
+    car_table = CarTable()
+
+
+ROWS = [[str(i), "ford", "2019"] for i in range(7)]
+SELECTORS = [field[1] for field in CarTable._fields]
+
+
+@pytest.fixture
+def driver():
+    def execute_script(script, target, item_step, start, count, fields):
+        indexes = [SELECTORS.index(field[0]) for field in fields]
+        return [
+            [row[i] for i in indexes]
+            for row in ROWS[start:start + count]
+        ]
+
+    driver = MagicMock()
+    driver.execute_script.side_effect = execute_script
+    return driver
+
+
+@pytest.fixture
+def table(driver):
+    return CarTablePage(driver).car_table
+
+
+def test_rows_streamed_in_chunks(table, driver):
+    rows = list(table.iter_rows(chunk_size=3))
+    assert rows == [tuple(row) for row in ROWS]
+    assert driver.execute_script.call_count == 3
+
+
+def test_field_specs_sent(table, driver):
+    list(table.iter_rows(chunk_size=10, fields=["id", "make"]))
+    args = driver.execute_script.call_args[0]
+    assert args[1:] == (
+        [("css", ".carTable")],
+        ("css", "tbody tr"),
+        0,
+        10,
+        [["td:nth-of-type(1) input", "value"], ["td:nth-of-type(2)", None]],
+    )
+
+
+def test_unknown_field(table):
+    with pytest.raises(KeyError):
+        list(table.iter_rows(fields=["price"]))
+
+
+def test_write_jsonl(table):
+    output = io.StringIO()
+    assert table.write_jsonl(output, chunk_size=4) == 7
+    lines = output.getvalue().splitlines()
+    assert json.loads(lines[0]) == {"id": "0", "make": "ford", "year": "2019"}
+
+
+def test_write_csv(table):
+    output = io.StringIO()
+    table.write_csv(output, fields=["id", "year"])
+    assert output.getvalue().splitlines()[:2] == ["id,year", "0,2019"]
+
+
+class OrderGrid(VirtualScrollCollection):
+    _locator = ("css selector", ".viewport")
+    _item_locator = ("css selector", ".row")
+    _key_field = "id"
+    _fields = (
+        ("id", None, "data-id"),
+        ("customer", ".customer"),
+    )
+
+
+class OrderPage(Page):
+    order_grid = OrderGrid()
+
+
+class ShortOrderGrid(OrderGrid):
+    _max_scroll_steps = 2
+
+
+class ShortScrollPage(Page):
+    order_grid = ShortOrderGrid()
+
+
+class TestVirtualScroll(object):
+
+    @pytest.fixture
+    def windows(self):
+        return [
+            {"rows": [["1", "a"], ["2", "b"], ["3", "c"]], "atEnd": False},
+            {"rows": [["3", "c"], ["4", "d"], ["5", "e"]], "atEnd": False},
+            {"rows": [["4", "d"], ["5", "e"], ["6", "f"]], "atEnd": True},
+        ]
+
+    @pytest.fixture
+    def driver(self, windows):
+        specs = [[None, "data-id"], [".customer", None]]
+        windows = iter(windows)
+
+        def execute_async_script(script, target, item_step, fields, *args):
+            window = next(windows)
+            indexes = [specs.index(field) for field in fields]
+            return {
+                "rows": [[row[i] for i in indexes] for row in window["rows"]],
+                "atEnd": window["atEnd"],
+            }
+
+        driver = MagicMock()
+        driver.execute_async_script.side_effect = execute_async_script
+        return driver
+
+    @pytest.fixture
+    def grid(self, driver):
+        return OrderPage(driver).order_grid
+
+    def test_rows_deduplicated(self, grid):
+        assert [row[0] for row in grid.iter_rows()] == [
+            "1", "2", "3", "4", "5", "6",
+        ]
+
+    def test_one_script_per_step(self, grid, driver):
+        list(grid.iter_rows())
+        assert driver.execute_async_script.call_count == 3
+
+    def test_starts_from_top(self, grid, driver):
+        list(grid.iter_rows())
+        calls = driver.execute_async_script.call_args_list
+        assert [call[0][-1] for call in calls] == [True, False, False]
+
+    def test_key_read_when_not_requested(self, grid, driver):
+        rows = list(grid.iter_rows(fields=["customer"]))
+        assert rows[:2] == [("a",), ("b",)]
+        assert driver.execute_async_script.call_args[0][3] == [
+            [".customer", None],
+            [None, "data-id"],
+        ]
+
+    def test_count_items(self, grid):
+        assert grid.count_items() == 6
+
+    def test_max_scroll_steps(self, driver):
+        grid = ShortScrollPage(driver).order_grid
+        with pytest.raises(RuntimeError):
+            grid.count_items()
+
+
+class ScrolledGrid(OrderGrid):
+    _scroll_locator = ("id", "scroller")
+
+
+class BadScrollGrid(OrderGrid):
+    _scroll_locator = ("link text", "Orders")
+
+
+class ScrollPage(Page):
+    scrolled_grid = ScrolledGrid()
+    bad_scroll_grid = BadScrollGrid()
+
+
+def test_scroll_locator_sent():
+    driver = MagicMock()
+    driver.execute_async_script.return_value = {"rows": [], "atEnd": True}
+    list(ScrollPage(driver).scrolled_grid.iter_rows())
+    assert driver.execute_async_script.call_args[0][4] == [
+        ("css", '[id="scroller"]'),
+    ]
+
+
+def test_unsupported_scroll_locator():
+    with pytest.raises(ValueError):
+        list(ScrollPage(MagicMock()).bad_scroll_grid.iter_rows())
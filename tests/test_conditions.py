@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.conditions import (
+    CONDITION_SCRIPT,
+    all_of,
+    any_of,
+    clickable,
+    has_attribute,
+    has_text,
+    not_,
+    present,
+    visible,
+)
+
+
+class SaveButton(PC):
+    _locator = ("id", "save")
+    _expected_conditions = {
+        "saved": all_of(
+            visible(),
+            has_text("Saved"),
+            not_(has_attribute("disabled")),
+        ),
+    }
+
+
+class Label(PC):
+    _find_from_parent = True
+    _locator = ("css selector", ".label")
+
+
+class Toolbar(PC):
+    _locator = ("id", "toolbar")
+    label = Label()
+
+
+class EditorPage(Page):
+    save_button = SaveButton()
+    toolbar = Toolbar()
+
+
+@pytest.fixture
+def driver():
+    return MagicMock()
+
+
+@pytest.fixture
+def page(driver):
+    return EditorPage(driver)
+
+
+def test_compiled_into_one_expression():
+    script, params = SaveButton._expected_conditions["saved"].get_script()
+    assert script == CONDITION_SCRIPT % (
+        "((!!el && isDisplayed(el)) && (!!el && getText(el) === p[0]) && "
+        "(!(!!el && getAttribute(el, p[1]) !== null)))"
+    )
+    assert params == ["Saved", "disabled"]
+
+
+def test_wait_by_name(page, driver):
+    element = MagicMock()
+    driver.execute_script.side_effect = [False, False, element]
+    assert page.save_button.wait_until("saved") is element
+    assert driver.execute_script.call_count == 3
+    script, target, params = driver.execute_script.call_args[0]
+    assert target == [("css", '[id="save"]')]
+    assert params == ["Saved", "disabled"]
+
+
+def test_wait_until_not(page, driver):
+    driver.execute_script.side_effect = [True, False]
+    page.save_button.wait_until_not(present())
+    assert driver.execute_script.call_count == 2
+
+
+def test_found_from_parent(page, driver):
+    driver.execute_script.return_value = True
+    page.toolbar.label.wait_until(any_of(has_text("A"), has_text("B")))
+    _, target, params = driver.execute_script.call_args[0]
+    assert target == [("css", '[id="toolbar"]'), ("css", ".label")]
+    assert params == ["A", "B"]
+
+
+def test_names():
+    assert repr(not_(clickable())) == (
+        "<BrowserCondition not_(all_of(visible, enabled))>"
+    )
+    assert has_attribute("role", "tab").name == "has_attribute('role', 'tab')"
@@ -0,0 +1,94 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.common import Iframe
+from pypcom.component import ElementMethod, get_dispatch_table
+
+
+class Button(PC):
+    _locator = ("id", "save")
+
+
+class Dropdown(PC):
+    _locator = ("id", "make")
+
+    @property
+    def _el(self):
+        return self.driver.find_element(*self._locator).wrapped
+
+
+class ButtonFrame(Iframe):
+    _locator = ("id", "frame")
+    button = Button()
+
+
+class DispatchPage(Page):
+    button = Button()
+    dropdown = Dropdown()
+    frame = ButtonFrame()
+
+
+@pytest.fixture
+def driver():
+    return MagicMock()
+
+
+@pytest.fixture
+def page(driver):
+    return DispatchPage(driver)
+
+
+def test_table_built_once():
+    assert get_dispatch_table(Button) is get_dispatch_table(Button)
+
+
+def test_table_kinds():
+    table = get_dispatch_table(Button)
+    assert table["text"] == "property"
+    assert table["click"] == "method"
+
+
+def test_custom_el_has_empty_table():
+    assert get_dispatch_table(Dropdown) == {}
+
+
+def test_method_kept_on_component(page):
+    click = page.button.click
+    assert isinstance(click, ElementMethod)
+    assert page.button.click is click
+
+
+def test_method_finds_element_when_called(page, driver):
+    click = page.button.click
+    assert driver.find_element.call_count == 0
+    click()
+    click()
+    assert driver.find_element.call_count == 2
+    assert driver.find_element.return_value.click.call_count == 2
+
+
+def test_method_uses_current_driver(page):
+    page.button.click
+    other_driver = MagicMock()
+    DispatchPage(other_driver).button.click()
+    other_driver.find_element.return_value.click.assert_called_once_with()
+
+
+def test_no_frame_switch_without_iframe(page, driver):
+    page.button.click()
+    assert page.button.text is driver.find_element.return_value.text
+    assert driver.switch_to.default_content.call_count == 0
+
+
+def test_frame_switched_once_per_call(page, driver):
+    page.frame.button.click()
+    assert driver.switch_to.frame.call_count == 1
+    assert driver.switch_to.default_content.call_count == 2
+
+
+def test_custom_el_attribute(page, driver):
+    wrapped = driver.find_element.return_value.wrapped
+    page.dropdown.select_by_value("ford")
+    wrapped.select_by_value.assert_called_once_with("ford")
@@ -0,0 +1,53 @@
+from pypcom.driver_state import add_execute_hook
+from pypcom.memo import get_navigation_count
+from pypcom.tracing import tracing
+from pypcom.warmup import get_driver_lock
+
+
+class FakeDriver(object):
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, command, params=None):
+        self.commands.append(command)
+        return command
+
+
+def test_hooks_run_in_order():
+    driver = FakeDriver()
+    calls = []
+
+    def hook(name):
+        def record(driver_command, proceed):
+            calls.append((name, driver_command))
+            return proceed()
+        return record
+
+    add_execute_hook(driver, "first", hook("first"))
+    add_execute_hook(driver, "second", hook("second"))
+    assert driver.execute("get") == "get"
+    assert calls == [("first", "get"), ("second", "get")]
+    assert driver.commands == ["get"]
+
+
+def test_hook_added_once_by_name():
+    driver = FakeDriver()
+    calls = []
+    add_execute_hook(driver, "hook", lambda c, proceed: calls.append(c))
+    add_execute_hook(driver, "hook", lambda c, proceed: calls.append(c))
+    driver.execute("get")
+    assert calls == ["get"]
+
+
+def test_execute_wrapped_once():
+    driver = FakeDriver()
+    get_navigation_count(driver)
+    execute = driver.execute
+    get_driver_lock(driver)
+    with tracing() as tracer:
+        tracer.watch_driver(driver)
+        driver.execute("get")
+    assert driver.execute is execute
+    assert get_navigation_count(driver) == 1
+    assert [event["name"] for event in tracer.events] == ["get"]
@@ -0,0 +1,122 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC
+from pypcom.state import (
+    EachState,
+    IsDisplayed,
+    IsEnabled,
+    Text,
+)
+
+
+class FakeComponent(object):
+    def __init__(self, is_displayed=True, is_enabled=True):
+        self._is_displayed = is_displayed
+        self._is_enabled = is_enabled
+
+    def is_displayed(self):
+        return self._is_displayed
+
+    def is_enabled(self):
+        return self._is_enabled
+
+
+class FakeRow(PC):
+    _find_from_parent = True
+
+    def __init__(self, index, parent):
+        self._index = index
+        self._parent = parent
+        self.driver = parent.driver
+
+    @property
+    def _locator(self):
+        return ("css selector", "tr:nth-of-type({})".format(self._index + 1))
+
+
+class FakeTable(PC):
+    _locator = ("id", "table")
+    _parent = None
+    _iframe_ancestor = None
+
+    def __init__(self, driver):
+        self.driver = driver
+
+
+class TestEachStateLive(object):
+
+    @pytest.fixture(scope="class")
+    def items(self):
+        return [
+            FakeComponent(),
+            FakeComponent(is_displayed=False),
+            FakeComponent(is_displayed=False, is_enabled=False),
+        ]
+
+    @pytest.fixture(scope="class")
+    def state(self):
+        return EachState(IsDisplayed(), IsEnabled())
+
+    @pytest.fixture(scope="class", autouse=True)
+    def comparison_result(self, items, state):
+        return items == state
+
+    def test_comparison_result(self, comparison_result):
+        assert comparison_result is False
+
+    def test_pytest_report_repr(self, state):
+        assert state.get_pytest_failure_report_repr() == [
+            "Comparing each FakeComponent State:",
+            "    [1]:",
+            "        IsDisplayed: {}".format(IsDisplayed._msg[True]),
+            "    [2]:",
+            "        IsDisplayed: {}".format(IsDisplayed._msg[True]),
+            "        IsEnabled: {}".format(IsEnabled._msg[True]),
+        ]
+
+
+class TestEachStateBulk(object):
+
+    @pytest.fixture(scope="class")
+    def driver(self):
+        driver = MagicMock()
+        driver.execute_script.return_value = [
+            {"present": True, "displayed": True, "text": "a"},
+            {"present": True, "displayed": True, "text": "b"},
+            {"present": True, "displayed": False, "text": "a"},
+        ]
+        return driver
+
+    @pytest.fixture(scope="class")
+    def rows(self, driver):
+        table = FakeTable(driver)
+        return [FakeRow(i, table) for i in range(3)]
+
+    @pytest.fixture(scope="class")
+    def state(self):
+        return EachState(IsDisplayed(), Text("a"))
+
+    @pytest.fixture(scope="class", autouse=True)
+    def comparison_result(self, rows, state):
+        return rows == state
+
+    def test_one_script_for_all_rows(self, driver):
+        assert driver.execute_script.call_count == 1
+
+    def test_locator_chains_sent(self, driver):
+        targets = driver.execute_script.call_args[0][1]
+        assert targets[2] == [
+            ("css", '[id="table"]'),
+            ("css", "tr:nth-of-type(3)"),
+        ]
+
+    def test_no_element_lookups(self, driver):
+        assert driver.find_element.call_count == 0
+
+    def test_comparison_result(self, comparison_result):
+        assert comparison_result is False
+
+    def test_problem_indexes(self, state):
+        assert sorted(state._problems_by_index) == [1, 2]
@@ -0,0 +1,71 @@
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from pypcom import Page
+from pypcom.idle import (
+    INSTALL_TRACKER_SCRIPT,
+    MAX_SCRIPT_WAIT_SECONDS,
+    WAIT_FOR_IDLE_SCRIPT,
+    wait_for_idle,
+)
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def driver():
+    return MagicMock()
+
+
+def test_page_waits_with_one_script(driver):
+    driver.execute_async_script.return_value = True
+    assert Page(driver).wait_for_idle(idle_ms=250, timeout=3) is True
+    assert driver.execute_async_script.call_count == 1
+    script, idle_ms, max_wait_ms, animations = (
+        driver.execute_async_script.call_args[0]
+    )
+    assert script == WAIT_FOR_IDLE_SCRIPT
+    assert idle_ms == 250
+    assert 2990 <= max_wait_ms <= 3000
+    assert animations is True
+
+
+def test_page_installs_tracker(driver):
+    Page(driver).install_idle_tracker()
+    driver.execute_script.assert_called_once_with(INSTALL_TRACKER_SCRIPT)
+
+
+def test_long_wait_split_across_scripts(driver, clock):
+    def execute_async_script(script, idle_ms, max_wait_ms, animations):
+        clock.now += max_wait_ms / 1000.0
+        return driver.execute_async_script.call_count == 3
+
+    driver.execute_async_script.side_effect = execute_async_script
+    wait_for_idle(driver, timeout=12, clock=clock)
+    assert [
+        call[0][2] for call in driver.execute_async_script.call_args_list
+    ] == [MAX_SCRIPT_WAIT_SECONDS * 1000, MAX_SCRIPT_WAIT_SECONDS * 1000, 2000]
+
+
+def test_timeout(driver, clock):
+    def execute_async_script(script, idle_ms, max_wait_ms, animations):
+        clock.now += max_wait_ms / 1000.0
+        return False
+
+    driver.execute_async_script.side_effect = execute_async_script
+    with pytest.raises(TimeoutException):
+        wait_for_idle(driver, timeout=2, animations=False, clock=clock)
+    assert driver.execute_async_script.call_count == 1
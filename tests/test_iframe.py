@@ -0,0 +1,153 @@
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from pypcom import PC, Page
+from pypcom.common import Iframe
+
+
+class Innermost(Iframe):
+    _locator = ("id", "innermost")
+
+
+class Middle(Iframe):
+    _locator = ("id", "middle")
+    innermost = Innermost()
+
+
+class Outer(Iframe):
+    _locator = ("id", "outer")
+    middle = Middle()
+
+
+class FramedPage(Page):
+    outer = Outer()
+
+
+@pytest.fixture
+def stale():
+    return set()
+
+
+@pytest.fixture
+def driver(stale):
+    driver = MagicMock()
+    driver.find_element.side_effect = lambda by, value: "el-" + value
+
+    def frame(el):
+        if el in stale:
+            stale.discard(el)
+            raise StaleElementReferenceException()
+
+    driver.switch_to.frame.side_effect = frame
+    return driver
+
+
+@pytest.fixture
+def innermost(driver):
+    iframe = FramedPage(driver).outer.middle.innermost
+    iframe.switch_to()
+    driver.reset_mock()
+    return iframe
+
+
+def test_warm_switch_is_one_command_per_level(innermost, driver):
+    innermost.switch_to()
+    assert driver.find_element.call_count == 0
+    assert driver.switch_to.default_content.call_count == 1
+    assert [call[0][0] for call in driver.switch_to.frame.call_args_list] == [
+        "el-outer",
+        "el-middle",
+        "el-innermost",
+    ]
+
+
+def test_only_stale_link_is_found_again(innermost, driver, stale):
+    stale.add("el-middle")
+    innermost.switch_to()
+    assert [call[0][1] for call in driver.find_element.call_args_list] == [
+        "middle",
+    ]
+
+
+def test_cache_is_per_driver(innermost):
+    other_driver = MagicMock()
+    FramedPage(other_driver).outer.middle.innermost.switch_to()
+    assert other_driver.find_element.call_count == 3
+
+
+class Widget(Iframe):
+    _locator = ("css selector", "iframe")
+    _find_from_parent = True
+
+
+class Panel(PC):
+    widget = Widget()
+
+
+class LeftPanel(Panel):
+    _locator = ("id", "left")
+
+
+class RightPanel(Panel):
+    _locator = ("id", "right")
+
+
+class PanelsPage(Page):
+    left = LeftPanel()
+    right = RightPanel()
+
+
+def test_shared_iframe_cached_per_parent():
+    driver = MagicMock()
+    panels = {"left": MagicMock(), "right": MagicMock()}
+    driver.find_element.side_effect = lambda by, value: panels[value]
+    page = PanelsPage(driver)
+    page.left.widget.switch_to()
+    page.right.widget.switch_to()
+    page.left.widget.switch_to()
+    assert [call[0][0] for call in driver.switch_to.frame.call_args_list] == [
+        panels["left"].find_element.return_value,
+        panels["right"].find_element.return_value,
+        panels["left"].find_element.return_value,
+    ]
+
+
+class Inner(Iframe):
+    _locator = ("id", "inner")
+
+
+class OuterFrame(Iframe):
+    inner = Inner()
+
+
+class FirstFrame(OuterFrame):
+    _locator = ("id", "first")
+
+
+class SecondFrame(OuterFrame):
+    _locator = ("id", "second")
+
+
+class TwoFramesPage(Page):
+    first = FirstFrame()
+    second = SecondFrame()
+
+
+def test_shared_iframe_inside_two_frames(driver):
+    page = TwoFramesPage(driver)
+    page.first.inner.switch_to()
+    page.second.inner.switch_to()
+    assert [call[0][0] for call in driver.switch_to.frame.call_args_list] == [
+        "el-first",
+        "el-inner",
+        "el-second",
+        "el-inner",
+    ]
+    assert [call[0][1] for call in driver.find_element.call_args_list] == [
+        "first",
+        "inner",
+        "second",
+        "inner",
+    ]
@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def modules_loaded_by(code):
+    script = "import sys\n{}\nprint(' '.join(sorted(sys.modules)))".format(
+        code,
+    )
+    output = subprocess.check_output(
+        [sys.executable, "-c", script],
+        universal_newlines=True,
+    )
+    return output.split()
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import pypcom",
+        "from pypcom import Page, PC, State",
+        "from pypcom.state import EachState, Text, Within",
+        "from pypcom.common import Iframe",
+    ],
+)
+def test_selenium_not_imported(code):
+    modules = modules_loaded_by(code)
+    assert not [name for name in modules if name.startswith("selenium")]
+
+
+def test_import_pypcom_is_lazy():
+    modules = modules_loaded_by("import pypcom")
+    assert "pypcom.component" not in modules
+    assert "pypcom.state" not in modules
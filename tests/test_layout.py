@@ -0,0 +1,134 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.facts import Rect
+from pypcom.state import (
+    EachState,
+    LeftAlignedWith,
+    NotOverlapping,
+    State,
+    Within,
+)
+
+
+class Container(PC):
+    _locator = ("id", "container")
+
+
+class Sidebar(PC):
+    _locator = ("id", "sidebar")
+
+
+class Content(PC):
+    _locator = ("id", "content")
+
+
+class FakePage(Page):
+    container = Container()
+    sidebar = Sidebar()
+    content = Content()
+
+
+def rect(x, y, width, height):
+    return {"x": x, "y": y, "width": width, "height": height}
+
+
+rects = {
+    '[id="container"]': rect(0, 0, 100, 100),
+    '[id="sidebar"]': rect(0, 0, 20, 100),
+    '[id="content"]': rect(10, 0, 90, 100),
+}
+
+
+def execute_script(script, targets, facts):
+    return [
+        {"present": True, "rect": rects[target[-1][1]]}
+        for target in targets
+    ]
+
+
+@pytest.fixture
+def driver():
+    driver = MagicMock()
+    driver.execute_script.side_effect = execute_script
+    return driver
+
+
+@pytest.fixture
+def page(driver):
+    return FakePage(driver)
+
+
+@pytest.mark.parametrize(
+    "other, contains, overlaps",
+    [
+        (Rect(10, 10, 10, 10), True, True),
+        (Rect(90, 90, 20, 20), False, True),
+        (Rect(100, 0, 10, 10), False, False),
+    ],
+)
+def test_rect(other, contains, overlaps):
+    outer = Rect(0, 0, 100, 100)
+    assert outer.contains(other) is contains
+    assert outer.overlaps(other) is overlaps
+
+
+def test_geometry_is_one_script(page, driver):
+    geometry = page.geometry(page.container, page.sidebar, page.content)
+    assert driver.execute_script.call_count == 1
+    assert geometry[page.sidebar] == Rect(0, 0, 20, 100)
+
+
+def test_within(page):
+    attr = Within(page.container)
+    attr.safe_compare(page.sidebar)
+    assert attr.get_problems() == ()
+
+
+def test_left_aligned_with(page):
+    attr = LeftAlignedWith(page.container, tolerance=5)
+    attr.safe_compare(page.content)
+    assert attr.get_report_messages() == [
+        "    LeftAlignedWith: Left edge at 10 is not aligned with Container "
+        "left edge at 0",
+    ]
+
+
+def test_not_overlapping(page):
+    attr = NotOverlapping(page.sidebar, page.content)
+    attr.safe_compare(page.container)
+    assert len(attr.get_problems()) == 2
+
+
+def test_state_fetches_rects_once(page, driver):
+    state = State(
+        Within(page.container),
+        LeftAlignedWith(page.container, tolerance=10),
+        NotOverlapping(page.sidebar),
+    )
+    state == page.content
+    assert driver.execute_script.call_count == 1
+    assert state.get_pytest_failure_report_messages() == [
+        "    NotOverlapping: {} overlaps Sidebar {}".format(
+            Rect(10, 0, 90, 100),
+            Rect(0, 0, 20, 100),
+        ),
+    ]
+
+
+def test_reused_attribute_fetches_fresh_rects(page, monkeypatch):
+    attr = Within(page.container)
+    attr.safe_compare(page.sidebar)
+    monkeypatch.setitem(rects, '[id="sidebar"]', rect(0, 0, 200, 100))
+    attr.safe_compare(page.sidebar)
+    assert len(attr.get_problems()) == 1
+
+
+def test_each_state_uses_fresh_rects(page, monkeypatch):
+    attr = Within(page.container)
+    EachState(attr) == [page.sidebar]
+    monkeypatch.setitem(rects, '[id="container"]', rect(0, 0, 10, 10))
+    state = EachState(attr)
+    assert (state == [page.sidebar]) is False
@@ -0,0 +1,180 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.state import IsDisplayed, IsPresent, State
+
+
+class FakeDriver(object):
+    """Sends every command through ``execute``, like a real driver."""
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, command, params=None):
+        self.commands.append(command)
+        element = MagicMock()
+        element.is_displayed.return_value = True
+        return element
+
+    def find_element(self, by, value):
+        return self.execute("findElement", {"using": by, "value": value})
+
+    def get(self, url):
+        self.execute("get", {"url": url})
+
+
+def loaded(component, **kwargs):
+    return lambda driver: driver.find_element("id", "loaded")
+
+
+class Results(PC):
+    _locator = ("id", "results")
+    _expected_conditions = {"loaded": loaded}
+
+
+class ResultsPage(Page):
+    _condition_ttl = 0.2
+    results = Results()
+
+
+class UnmemoizedPage(Page):
+    results = Results()
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def driver():
+    return FakeDriver()
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def page(driver, clock):
+    page = ResultsPage(driver)
+    page._condition_memo._clock = clock
+    return page
+
+
+def test_wait_not_repeated(page, driver):
+    element = page.results.wait_until("visible")
+    commands = len(driver.commands)
+    assert page.results.wait_until("visible") is element
+    assert len(driver.commands) == commands
+
+
+def test_state_after_wait(page, driver):
+    page.results.wait_until("visible")
+    commands = len(driver.commands)
+    state = State(IsDisplayed(), IsPresent())
+    state == page.results
+    assert not state.get_pytest_failure_report_messages()
+    assert len(driver.commands) == commands
+
+
+def test_wait_after_state(page, driver):
+    State(IsDisplayed()) == page.results
+    commands = len(driver.commands)
+    element = page.results.wait_until("visible")
+    assert element is not True
+    assert element.is_displayed() is True
+    assert len(driver.commands) > commands
+
+
+def test_state_after_state(page, driver):
+    State(IsDisplayed()) == page.results
+    commands = len(driver.commands)
+    state = State(IsDisplayed())
+    state == page.results
+    assert not state.get_pytest_failure_report_messages()
+    assert len(driver.commands) == commands
+
+
+def test_custom_condition(page, driver):
+    page.results.wait_until("loaded")
+    page.results.wait_until("loaded")
+    assert driver.commands == ["findElement"]
+
+
+def test_expires(page, driver, clock):
+    page.results.wait_until("visible")
+    clock.now = 0.3
+    commands = len(driver.commands)
+    page.results.wait_until("visible")
+    assert len(driver.commands) > commands
+
+
+def test_forgotten_on_write(page, driver):
+    page.results.wait_until("visible")
+    page.results.click()
+    commands = len(driver.commands)
+    page.results.wait_until("visible")
+    assert len(driver.commands) > commands
+
+
+def test_forgotten_on_navigation(page, driver):
+    page.results.wait_until("visible")
+    driver.get("https://example.com/results")
+    commands = len(driver.commands)
+    page.results.wait_until("visible")
+    assert len(driver.commands) > commands
+
+
+def test_not_met_is_separate(page, driver):
+    page.results.wait_until("present")
+    commands = len(driver.commands)
+    state = State(IsPresent(False))
+    state == page.results
+    assert len(driver.commands) > commands
+
+
+def test_off_by_default(driver):
+    page = UnmemoizedPage(driver)
+    assert page._condition_memo is None
+    page.results.wait_until("visible")
+    commands = len(driver.commands)
+    page.results.wait_until("visible")
+    assert len(driver.commands) > commands
+
+
+class Title(PC):
+    _locator = ("css selector", "h1")
+
+
+class Header(PC):
+    title = Title()
+
+
+class Top(Header):
+    _locator = ("id", "top")
+
+
+class Bottom(Header):
+    _locator = ("id", "bottom")
+
+
+class HeadersPage(Page):
+    _condition_ttl = 0.2
+    top = Top()
+    bottom = Bottom()
+
+
+def test_shared_component_remembered_per_parent(driver):
+    page = HeadersPage(driver)
+    page.top.title.wait_until("visible")
+    commands = len(driver.commands)
+    page.bottom.title.wait_until("visible")
+    assert len(driver.commands) > commands
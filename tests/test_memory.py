@@ -0,0 +1,126 @@
+import gc
+import tracemalloc
+import weakref
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.common import Iframe
+
+
+class FakeElement(object):
+    def __init__(self, driver):
+        self.parent = driver
+        self.text = "text"
+
+    def find_element(self, by, value):
+        return FakeElement(self.parent)
+
+
+class FakeSwitchTo(object):
+    def frame(self, el):
+        pass
+
+    def default_content(self):
+        pass
+
+
+class FakeDriver(object):
+    def __init__(self):
+        self.switch_to = FakeSwitchTo()
+
+    def find_element(self, by, value):
+        return FakeElement(self)
+
+
+class Field(PC):
+    _find_from_parent = True
+    _locator = ("id", "field")
+
+
+class Form(PC):
+    _locator = ("id", "form")
+    field = Field()
+
+
+class Frame(Iframe):
+    _locator = ("id", "frame")
+    form = Form()
+
+
+class LeakPage(Page):
+    form = Form()
+    frame = Frame()
+
+
+PAGE_COUNT = 10000
+
+
+def use_page(driver):
+    page = LeakPage(driver)
+    page.form.field.text
+    page.frame.form.field.text
+
+
+@pytest.fixture(scope="module")
+def driver_refs():
+    # anything imported or built the first time a page is used isn't counted
+    use_page(FakeDriver())
+    gc.collect()
+    tracemalloc.start()
+    refs = []
+    for _ in range(PAGE_COUNT):
+        driver = FakeDriver()
+        refs.append(weakref.ref(driver))
+        use_page(driver)
+        del driver
+    gc.collect()
+    return refs
+
+
+@pytest.fixture(scope="module")
+def traced_memory(driver_refs):
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def test_drivers_released(driver_refs):
+    assert [ref for ref in driver_refs if ref() is not None] == []
+
+
+def test_memory_does_not_grow_with_pages(traced_memory, driver_refs):
+    # the weak references themselves are all that should be left over
+    assert traced_memory < PAGE_COUNT * 200
+
+
+class Table(PC):
+    _locator = ("id", "table")
+    field = Field()
+
+    def __init__(self, driver):
+        self.driver = driver
+
+
+class Row(PC):
+    _find_from_parent = True
+    _locator = ("css selector", "tr")
+
+    def __init__(self, parent):
+        self._parent = parent
+        self.driver = parent.driver
+
+
+def test_explicit_parent_kept():
+    row = Row(Table(FakeDriver()))
+    gc.collect()
+    assert isinstance(row._parent, Table)
+    assert row.text == "text"
+
+
+def test_dropped_parent_component():
+    driver = FakeDriver()
+    field = Table(driver).field
+    gc.collect()
+    with pytest.raises(ReferenceError):
+        field.text
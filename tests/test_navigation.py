@@ -0,0 +1,149 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.navigation import (
+    CURRENT_DOCUMENT_SCRIPT,
+    NAVIGATE_SCRIPT,
+    NEW_DOCUMENT_SCRIPT,
+    build_url,
+    is_same_document_url,
+)
+
+
+class CarDetails(PC):
+    _locator = ("id", "details")
+
+
+class CarPage(Page):
+    _url = "/cars/{car_id}"
+    _ready_component = "details"
+    details = CarDetails()
+
+
+class EagerCarPage(CarPage):
+    _base_url = "https://cars.example.com/app/"
+    _url = "cars/{car_id}"
+    _load_strategy = "eager"
+
+
+class PlainPage(Page):
+    pass
+
+
+class Browser(object):
+    """Answers the scripts ``open`` runs, like a browser would."""
+
+    def __init__(self, url, ready_state="complete"):
+        self.url = url
+        self.ready_state = ready_state
+        self.leaving = False
+
+    def execute_script(self, script, *args):
+        if script == CURRENT_DOCUMENT_SCRIPT:
+            return [self.url, self.ready_state]
+        if script == NAVIGATE_SCRIPT:
+            self.url = args[0]
+            self.leaving = True
+            return None
+        if script == NEW_DOCUMENT_SCRIPT:
+            if self.leaving:
+                # the new document shows up after the first poll
+                self.leaving = False
+                return None
+            return "interactive"
+        raise AssertionError("unexpected script")
+
+
+@pytest.fixture
+def browser():
+    return Browser("https://cars.example.com/cars/7")
+
+
+@pytest.fixture
+def driver(browser):
+    driver = MagicMock()
+    driver.execute_script.side_effect = browser.execute_script
+    driver.find_element.return_value.is_displayed.return_value = True
+    return driver
+
+
+def test_build_url():
+    assert build_url(
+        "/cars/{car_id}/{tab}",
+        {"car_id": 42, "tab": "a b/c"},
+        "https://cars.example.com/home",
+    ) == "https://cars.example.com/cars/42/a%20b%2Fc"
+    with pytest.raises(KeyError):
+        build_url("/cars/{car_id}", {})
+
+
+def test_same_document_url():
+    assert is_same_document_url(
+        "https://Cars.example.com/cars/7/#specs",
+        "https://cars.example.com/cars/7",
+    )
+    assert not is_same_document_url(
+        "https://cars.example.com/cars/7?tab=specs",
+        "https://cars.example.com/cars/7",
+    )
+
+
+def test_skipped_when_already_there(driver):
+    page = CarPage(driver).open(car_id=7)
+    assert isinstance(page, CarPage)
+    driver.get.assert_not_called()
+    driver.find_element.assert_called_with("id", "details")
+
+
+def test_navigates_relative_to_current(driver):
+    CarPage(driver).open(car_id=8)
+    driver.get.assert_called_once_with("https://cars.example.com/cars/8")
+
+
+def test_navigates_while_loading(driver, browser):
+    browser.ready_state = "loading"
+    CarPage(driver).open(car_id=7)
+    driver.get.assert_called_once_with("https://cars.example.com/cars/7")
+
+
+def test_eager(driver, browser):
+    EagerCarPage(driver).open(car_id=8)
+    driver.get.assert_not_called()
+    assert browser.url == "https://cars.example.com/app/cars/8"
+    assert not browser.leaving
+
+
+def test_navigation_forgets_elements(driver):
+    page = CarPage(driver)
+    page._prefetched_elements[page.details] = MagicMock()
+    page.open(car_id=8)
+    assert not page._prefetched_elements
+
+
+def test_eager_while_loading_same_document(driver, browser):
+    browser.url = "https://cars.example.com/app/cars/7#specs"
+    browser.ready_state = "loading"
+    EagerCarPage(driver).open(car_id=7)
+    driver.get.assert_called_once_with("https://cars.example.com/app/cars/7")
+    assert not browser.leaving
+
+
+def test_navigation_forgets_elements_of_other_pages(driver):
+    page = CarPage(driver)
+    page._prefetched_elements[page.details] = MagicMock()
+    CarPage(driver).open(car_id=8)
+    assert not page._prefetched_elements
+
+
+def test_no_url(driver):
+    with pytest.raises(AttributeError):
+        PlainPage(driver).open()
+
+
+def test_unsupported_load_strategy(driver):
+    page = CarPage(driver)
+    page._load_strategy = "lazy"
+    with pytest.raises(ValueError):
+        page.open(car_id=8)
@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import Page
+from pypcom.performance import PERFORMANCE_SCRIPT, PerformanceTimings
+from pypcom.state import (
+    LargestContentfulPaintBelow,
+    LoadsWithin,
+    ResourceCountBelow,
+    State,
+)
+
+
+class CheckoutPage(Page):
+    pass
+
+
+timings = {
+    "navigation": {
+        "responseEnd": 120.5,
+        "domContentLoaded": 800.2,
+        "load": 1900.7,
+    },
+    "paint": {"first-paint": 300.0, "first-contentful-paint": 310.0},
+    "largestContentfulPaint": 2600.4,
+    "resources": {"script": 12, "img": 30, "css": 3},
+    "transferSize": 1024,
+}
+
+
+@pytest.fixture
+def driver():
+    driver = MagicMock()
+    driver.execute_async_script.return_value = timings
+    return driver
+
+
+@pytest.fixture
+def page(driver):
+    return CheckoutPage(driver)
+
+
+def test_timings():
+    performance = PerformanceTimings(timings)
+    assert performance.load_ms == 1900.7
+    assert performance.first_contentful_paint_ms == 310.0
+    assert performance.resource_count == 45
+
+
+def test_unfinished_load():
+    performance = PerformanceTimings({"navigation": {"load": 0}})
+    assert performance.load_ms is None
+    assert performance.largest_contentful_paint_ms is None
+
+
+def test_state_reads_performance_once(page, driver):
+    state = State(
+        LoadsWithin(2000),
+        LargestContentfulPaintBelow(2500),
+        ResourceCountBelow(50),
+        ResourceCountBelow(10, "script", "css"),
+    )
+    assert not state == page
+    driver.execute_async_script.assert_called_once_with(PERFORMANCE_SCRIPT)
+    assert state.get_pytest_failure_report_repr() == [
+        "Comparing CheckoutPage State:",
+        "    LargestContentfulPaintBelow: Largest contentful paint at 2600ms "
+        "is not below 2500ms",
+        "    ResourceCountBelow: 15 script/css resources were loaded, which "
+        "is not below 10",
+    ]
+
+
+def test_loads_within_dom_content_loaded(page):
+    attr = LoadsWithin(500, event="domcontentloaded")
+    attr.safe_compare(page)
+    assert attr.get_report_messages() == [
+        "    LoadsWithin: Page took 800ms to domcontentloaded, which is over "
+        "500ms",
+    ]
+
+
+def test_not_loaded_yet(page, driver):
+    driver.execute_async_script.return_value = {"navigation": {"load": 0}}
+    attr = LoadsWithin(500)
+    attr.safe_compare(page)
+    assert attr.get_report_messages() == [
+        "    LoadsWithin: Page hasn't finished loading",
+    ]
+
+
+def test_unsupported_event():
+    with pytest.raises(ValueError):
+        LoadsWithin(500, event="paint")
@@ -0,0 +1,166 @@
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from pypcom import PC, Page
+from pypcom.common import Iframe
+from pypcom.facts import RESOLVE_ELEMENTS_SCRIPT
+
+
+class Label(PC):
+    def __init__(self, name):
+        self._locator = ("id", name)
+
+
+class Username(PC):
+    _find_from_parent = True
+    _locator = ("css selector", "input[name='username']")
+
+
+class LoginForm(PC):
+    _locator = ("id", "login")
+    username = Username()
+
+
+class Help(PC):
+    _locator = ("link text", "Help")
+
+
+class WidgetFrame(Iframe):
+    _locator = ("id", "widget")
+    total = Label("total")
+
+
+class PrefetchPage(Page):
+    title = Label("title")
+    missing = Label("missing")
+    login_form = LoginForm()
+    help = Help()
+    widget = WidgetFrame()
+
+
+@pytest.fixture
+def driver():
+    def execute_script(script, targets):
+        assert script == RESOLVE_ELEMENTS_SCRIPT
+        elements = []
+        for chain in targets:
+            name = chain[-1][1]
+            if "missing" in name:
+                elements.append(None)
+            else:
+                elements.append(MagicMock(text=name))
+        return elements
+
+    driver = MagicMock()
+    driver.execute_script.side_effect = execute_script
+    return driver
+
+
+@pytest.fixture
+def page(driver):
+    return PrefetchPage(driver)
+
+
+def test_one_script_per_frame(page, driver):
+    assert page.prefetch() == 5
+    assert driver.execute_script.call_count == 2
+    assert driver.switch_to.frame.call_count == 1
+
+
+def test_untranslatable_locators_skipped(page, driver):
+    page.prefetch()
+    targets = [
+        chain
+        for call in driver.execute_script.call_args_list
+        for chain in call[0][1]
+    ]
+    assert [("css", "Help")] not in targets
+    assert [
+        ("css", '[id="login"]'),
+        ("css", "input[name='username']"),
+    ] in targets
+
+
+def test_first_use_needs_no_lookup(page, driver):
+    page.prefetch()
+    assert page.title.text == '[id="title"]'
+    assert page.login_form.username.text == "input[name='username']"
+    assert driver.find_element.call_count == 0
+
+
+def test_only_used_once(page, driver):
+    page.prefetch()
+    page.title.text
+    assert page.title.text is driver.find_element.return_value.text
+    assert driver.find_element.call_count == 1
+
+
+def test_missing_element_looked_up(page, driver):
+    page.prefetch()
+    page.missing.text
+    assert driver.find_element.call_count == 1
+
+
+def test_write_discards_others(page, driver):
+    page.prefetch([page.title, page.login_form], subtree=True)
+    page.login_form.username.click()
+    page.title.text
+    assert driver.find_element.call_count == 1
+
+
+def test_stale_element_found_again(page, driver):
+    page.prefetch([page.title])
+    stale = page._prefetched_elements[page.title._get_parent_chain()]
+    stale.click.side_effect = StaleElementReferenceException("stale")
+    page.title.click()
+    driver.find_element.return_value.click.assert_called_once_with()
+
+
+def test_iframe_keeps_frame_element(page, driver):
+    page.prefetch([page.widget])
+    frame_el = page._element_cache[page.widget._get_parent_chain()]
+    page.widget.total.text
+    page.widget.total.text
+    assert [
+        call[0][0] for call in driver.switch_to.frame.call_args_list
+    ] == [frame_el, frame_el]
+
+
+class Heading(PC):
+    _locator = ("css selector", "h1")
+    _find_from_parent = True
+
+
+class Banner(PC):
+    heading = Heading()
+
+
+class TopBanner(Banner):
+    _locator = ("id", "top")
+
+
+class BottomBanner(Banner):
+    _locator = ("id", "bottom")
+
+
+class BannersPage(Page):
+    top = TopBanner()
+    bottom = BottomBanner()
+
+
+def test_shared_component_prefetched_per_parent():
+    def execute_script(script, targets):
+        return [
+            MagicMock(text=" ".join(step[1] for step in chain))
+            for chain in targets
+        ]
+
+    driver = MagicMock()
+    driver.execute_script.side_effect = execute_script
+    page = BannersPage(driver)
+    assert page.prefetch() == 4
+    assert page.top.heading.text == '[id="top"] h1'
+    assert page.bottom.heading.text == '[id="bottom"] h1'
+    assert driver.find_element.call_count == 0
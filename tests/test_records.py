@@ -0,0 +1,137 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import Page
+from pypcom.common import Collection
+from pypcom.records import columns_from_records, diff_columns
+from pypcom.state import MatchesRecords, State
+
+
+class Car(object):
+
+    def __init__(self, id, make, year):
+        self.id = id
+        self.make = make
+        self.year = year
+
+
+class CarTable(Collection):
+    _locator = ("css selector", ".carTable")
+    _item_locator = ("css selector", "tbody tr")
+    _fields = (
+        ("id", "td:nth-of-type(1)"),
+        ("make", "td:nth-of-type(2)"),
+        ("year", "td:nth-of-type(3)"),
+    )
+
+
+class CarTablePage(Page):
+    car_table = CarTable()
+
+
+CARS = [Car(i, "ford", 2019) for i in range(1000)]
+
+
+def table_rows():
+    rows = [[str(car.id), car.make, str(car.year)] for car in CARS]
+    rows[10][1] = "chevy"
+    rows[20][2] = "2018"
+    rows[30][1] = "tesla"
+    del rows[40]
+    rows.append(["1000", "ford", "2019"])
+    rows.reverse()
+    return rows
+
+
+@pytest.fixture
+def driver():
+    rows = table_rows()
+    selectors = [field[1] for field in CarTable._fields]
+
+    def execute_script(script, target, item_step, start, count, fields):
+        indexes = [selectors.index(field[0]) for field in fields]
+        return [[row[i] for i in indexes] for row in rows[start:start + count]]
+
+    driver = MagicMock()
+    driver.execute_script.side_effect = execute_script
+    return driver
+
+
+@pytest.fixture
+def table(driver):
+    return CarTablePage(driver).car_table
+
+
+def test_read_columns(table, driver):
+    columns = table.read_columns(["year", "id"], chunk_size=400)
+    assert list(columns) == ["year", "id"]
+    assert len(columns["id"]) == 1000
+    assert columns["id"][0] == "1000"
+    assert driver.execute_script.call_count == 3
+
+
+def test_diff(table):
+    columns = table.read_columns()
+    diff = diff_columns(
+        columns,
+        columns_from_records(CARS, ["id", "make", "year"]),
+        "id",
+    )
+    assert not diff.matches
+    assert diff.missing == ["40"]
+    assert diff.extra == ["1000"]
+    assert sorted(diff.changed) == [
+        ("10", [("make", "ford", "chevy")]),
+        ("20", [("year", "2019", "2018")]),
+        ("30", [("make", "ford", "tesla")]),
+    ]
+
+
+def test_matching():
+    columns = {"id": ["1", "2"], "make": ["ford", "kia"]}
+    expected = columns_from_records(
+        [{"id": 2, "make": "kia"}, {"id": 1, "make": "ford"}],
+        ["id", "make"],
+    )
+    assert diff_columns(columns, expected, "id").matches
+
+
+def test_compound_key_and_duplicates():
+    columns = {"make": ["ford", "ford"], "model": ["f150", "f150"]}
+    diff = diff_columns(columns, dict(columns), ("make", "model"))
+    assert diff.duplicates == [("ford", "f150"), ("ford", "f150")]
+
+
+def test_state_report(table):
+    state = State(MatchesRecords(CARS, "id", limit=1))
+    state == table
+    assert state.get_pytest_failure_report_repr() == [
+        "Comparing CarTable State:",
+        "    MatchesRecords: 1000 rows expected, 1000 found: 1 missing, "
+        "1 extra, 3 changed",
+        "        missing: '40'",
+        "        extra: '1000'",
+        "        make changed in 2 rows: '10': 'chevy' is not 'ford', ... "
+        "and 1 more",
+        "        year changed in 1 row: '20': '2018' is not '2019'",
+    ]
+
+
+def test_expected_compared_as_text():
+    columns = {"id": ["1", "2"], "year": ["2019", "2018"]}
+    expected = {"id": [1, 2], "year": [2019, 2018]}
+    assert diff_columns(columns, expected, "id").matches
+
+
+class SameHash(str):
+
+    def __hash__(self):
+        return 0
+
+
+def test_rows_with_equal_hashes_compared():
+    columns = {"id": ["1"], "make": [SameHash("ford")]}
+    expected = {"id": ["1"], "make": [SameHash("kia")]}
+    diff = diff_columns(columns, expected, "id")
+    assert diff.changed == [("1", [("make", "kia", "ford")])]
@@ -0,0 +1,135 @@
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from pypcom import PC, Page
+
+
+class Title(PC):
+    _locator = ("id", "title")
+
+
+class Missing(PC):
+    _locator = ("id", "missing")
+
+
+class Button(PC):
+    _locator = ("id", "button")
+
+
+class Header(PC):
+    title = Title()
+    missing = Missing()
+
+
+class SnapshotPage(Page):
+    header = Header()
+    button = Button()
+
+
+FACTS = {
+    '[id="title"]': {
+        "present": True,
+        "text": "Dashboard",
+        "displayed": True,
+        "attribute:class": "big",
+    },
+    '[id="missing"]': {"present": False},
+    '[id="button"]': {"present": True, "text": "Go"},
+}
+
+
+@pytest.fixture
+def driver():
+    def execute_script(script, targets, facts):
+        return [FACTS[target[-1][1]] for target in targets]
+
+    driver = MagicMock()
+    driver.execute_script.side_effect = execute_script
+    driver.find_element.return_value.text = "Live"
+    return driver
+
+
+@pytest.fixture
+def page(driver):
+    return SnapshotPage(driver)
+
+
+def test_reads_answered_from_snapshot(page, driver):
+    with page.snapshot():
+        assert page.header.title.text == "Dashboard"
+        assert page.header.title.is_displayed() is True
+        assert page.header.title.get_attribute("class") == "big"
+    assert driver.execute_script.call_count == 1
+    assert driver.find_element.call_count == 0
+
+
+def test_missing_element(page, driver):
+    with page.snapshot():
+        assert page.header.missing.is_present() is False
+        with pytest.raises(NoSuchElementException):
+            page.header.missing.text
+
+
+def test_subtree_only(page, driver):
+    with page.snapshot([page.header], subtree=True):
+        assert page.button.text == "Live"
+    targets = driver.execute_script.call_args[0][1]
+    assert len(targets) == 2
+
+
+def test_write_invalidates(page, driver):
+    with page.snapshot():
+        page.button.click()
+        assert page.header.title.text == "Live"
+
+
+def test_set_invalidates(page, driver):
+    with page.snapshot():
+        page.button = "keys"
+        assert page.header.title.text == "Live"
+
+
+def test_reads_live_after_exit(page, driver):
+    with page.snapshot():
+        pass
+    assert page.header.title.text == "Live"
+
+
+class Heading(PC):
+    _locator = ("css selector", "h1")
+    _find_from_parent = True
+
+
+class Banner(PC):
+    heading = Heading()
+
+
+class TopBanner(Banner):
+    _locator = ("id", "top")
+
+
+class BottomBanner(Banner):
+    _locator = ("id", "bottom")
+
+
+class BannersPage(Page):
+    top = TopBanner()
+    bottom = BottomBanner()
+
+
+def test_shared_component_read_per_parent():
+    def execute_script(script, targets, facts):
+        return [
+            {"present": True, "text": " ".join(step[1] for step in target)}
+            for target in targets
+        ]
+
+    driver = MagicMock()
+    driver.execute_script.side_effect = execute_script
+    page = BannersPage(driver)
+    with page.snapshot():
+        assert page.top.heading.text == '[id="top"] h1'
+        assert page.bottom.heading.text == '[id="bottom"] h1'
+    assert driver.execute_script.call_count == 1
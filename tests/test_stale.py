@@ -0,0 +1,146 @@
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+
+from pypcom import PC, Page
+
+
+class Cell(PC):
+    _find_from_parent = True
+    _locator = ("css selector", "td")
+
+
+class Row(PC):
+    _find_from_parent = True
+    _locator = ("css selector", "tr")
+    cell = Cell()
+
+
+class Table(PC):
+    _locator = ("id", "cars")
+    row = Row()
+
+
+class Title(PC):
+    _locator = ("id", "title")
+
+
+class Banner(PC):
+    _locator = ("id", "banner")
+    _stale_retries = 0
+
+
+class CarPage(Page):
+    table = Table()
+    title = Title()
+    banner = Banner()
+
+
+def stale_once(value):
+    """Raise a StaleElementReferenceException the first time only."""
+    results = [StaleElementReferenceException("stale"), value]
+
+    def side_effect(*args):
+        result = results.pop(0) if len(results) > 1 else results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return side_effect
+
+
+@pytest.fixture
+def elements():
+    cell_el = MagicMock(text="Ford")
+    row_el = MagicMock()
+    row_el.find_element.return_value = cell_el
+    table_el = MagicMock()
+    table_el.find_element.return_value = row_el
+    return table_el, row_el, cell_el
+
+
+@pytest.fixture
+def driver(elements):
+    driver = MagicMock()
+    driver.find_element.return_value = elements[0]
+    return driver
+
+
+@pytest.fixture
+def page(driver):
+    return CarPage(driver)
+
+
+def test_no_retry_needed(page, driver, elements):
+    table_el, row_el, cell_el = elements
+    assert page.table.row.cell.text == "Ford"
+    assert driver.find_element.call_count == 1
+    assert table_el.find_element.call_count == 1
+    assert row_el.find_element.call_count == 1
+    assert page.stale_metrics() == {}
+
+
+def test_only_stale_element_found_again(page, driver, elements):
+    table_el, row_el, cell_el = elements
+    cell_el.click.side_effect = stale_once(None)
+    page.table.row.cell.click()
+    assert driver.find_element.call_count == 1
+    assert table_el.find_element.call_count == 1
+    assert row_el.find_element.call_count == 2
+    metrics = page.table.row.cell.stale_metrics
+    assert metrics.as_dict() == {
+        "stale": 1,
+        "recovered": 1,
+        "failed": 0,
+        "relinked": 1,
+        "by_link": {"Cell": 1},
+    }
+
+
+def test_stale_parent_found_again(page, driver, elements):
+    table_el, row_el, cell_el = elements
+    row_el.find_element.side_effect = stale_once(cell_el)
+    assert page.table.row.cell.text == "Ford"
+    assert driver.find_element.call_count == 1
+    assert table_el.find_element.call_count == 2
+    assert row_el.find_element.call_count == 2
+    assert page.table.row.cell.stale_metrics.by_link == {"Row": 1}
+    assert page.table.row.cell.stale_metrics.relinked == 2
+
+
+def test_gives_up_after_retries(page, elements):
+    table_el, row_el, cell_el = elements
+    cell_el.clear.side_effect = StaleElementReferenceException("stale")
+    with pytest.raises(StaleElementReferenceException):
+        page.table.row.cell.clear()
+    assert cell_el.clear.call_count == Cell._stale_retries + 1
+    metrics = page.table.row.cell.stale_metrics
+    assert metrics.failed == 1
+    assert metrics.stale == Cell._stale_retries + 1
+
+
+def test_component_without_parent_chain(page, driver):
+    title_el = MagicMock()
+    title_el.is_displayed.side_effect = stale_once(True)
+    driver.find_element.return_value = title_el
+    assert page.title.is_displayed() is True
+    assert driver.find_element.call_count == 2
+    assert page.stale_metrics()["title"].recovered == 1
+
+
+def test_retries_disabled(page, driver):
+    driver.find_element.return_value.submit.side_effect = stale_once(None)
+    with pytest.raises(StaleElementReferenceException):
+        page.banner.submit()
+    assert driver.find_element.call_count == 1
+
+
+def test_metrics_kept_per_page(page, driver):
+    title_el = MagicMock()
+    title_el.is_displayed.side_effect = stale_once(True)
+    driver.find_element.return_value = title_el
+    page.title.is_displayed()
+    other_page = CarPage(driver)
+    assert other_page.stale_metrics() == {}
+    assert other_page.title.stale_metrics.stale == 0
+    assert page.title.stale_metrics.stale == 1
@@ -0,0 +1,160 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.common import Iframe
+from pypcom.state import State, Text
+from pypcom.tracing import Tracer, component_path, tracing
+
+
+class FakeDriver(object):
+    """Sends every command through ``execute``, like a real driver."""
+
+    def __init__(self):
+        self.commands = []
+        self.switch_to = MagicMock()
+
+    def execute(self, command, params):
+        self.commands.append(command)
+        return MagicMock(text="Welcome")
+
+    def find_element(self, by, value):
+        return self.execute("findElement", {"using": by, "value": value})
+
+
+class Title(PC):
+    _locator = ("id", "title")
+
+
+class Username(PC):
+    _locator = ("id", "username")
+
+
+class LoginForm(PC):
+    _locator = ("id", "login")
+    username = Username()
+
+
+class WidgetFrame(Iframe):
+    _locator = ("id", "widget")
+
+
+class LoginPage(Page):
+    title = Title()
+    login_form = LoginForm()
+    widget = WidgetFrame()
+
+
+@pytest.fixture
+def driver():
+    return FakeDriver()
+
+
+@pytest.fixture
+def page(driver):
+    return LoginPage(driver)
+
+
+def spans(tracer, category=None):
+    return [
+        event for event in tracer.events
+        if category is None or event["cat"] == category
+    ]
+
+
+def test_command_inside_component_span(page):
+    with tracing() as tracer:
+        assert page.title.text == "Welcome"
+    command, operation = spans(tracer)
+    assert operation["name"] == "LoginPage.title.text"
+    assert operation["args"] == {
+        "component": "LoginPage.title",
+        "operation": "text",
+    }
+    assert command["name"] == "findElement"
+    assert command["cat"] == "webdriver"
+    assert operation["ts"] <= command["ts"]
+    assert (
+        command["ts"] + command["dur"] <= operation["ts"] + operation["dur"]
+    )
+
+
+def test_set_and_method_spans(page):
+    with tracing() as tracer:
+        page.login_form.username = "me"
+    assert [event["name"] for event in spans(tracer, "component")] == [
+        "LoginPage.login_form.username.send_keys",
+        "LoginPage.login_form.username.__set__",
+    ]
+
+
+def test_state_spans(page):
+    state = State(Text("Welcome"))
+    with tracing() as tracer:
+        state == page.title
+    assert not state.get_pytest_failure_report_messages()
+    assert [event["name"] for event in spans(tracer)] == [
+        "findElement",
+        "LoginPage.title.text",
+        "LoginPage.title.Text",
+        "LoginPage.title.State",
+    ]
+    assert spans(tracer, "expected_attribute")[0]["args"] == {
+        "component": "LoginPage.title",
+        "operation": "Text",
+    }
+
+
+def test_iframe_switch_span(page):
+    with tracing() as tracer:
+        page.widget.switch_to()
+    assert "LoginPage.widget.switch_to" in [
+        event["name"] for event in spans(tracer, "component")
+    ]
+
+
+def test_error_recorded(page, driver):
+    driver.execute = MagicMock(side_effect=RuntimeError("gone"))
+    with tracing() as tracer:
+        with pytest.raises(RuntimeError):
+            page.title.text
+    assert spans(tracer, "component")[0]["args"]["error"] == "RuntimeError"
+
+
+def test_nothing_recorded_when_off(page, driver):
+    with tracing() as tracer:
+        page.title.text
+    recorded = len(tracer.events)
+    page.title.text
+    assert len(tracer.events) == recorded
+    assert driver.commands == ["findElement", "findElement"]
+
+
+def test_write(page, tmp_path):
+    path = tmp_path / "run.trace.json"
+    with tracing(str(path)):
+        page.title.text
+    trace = json.loads(path.read_text())
+    assert [event["ph"] for event in trace["traceEvents"]] == ["X", "X"]
+
+
+def test_component_path(page):
+    assert component_path(page.login_form.username) == (
+        "LoginPage.login_form.username"
+    )
+    assert component_path(page) == "LoginPage"
+
+
+def test_tracer_restored():
+    outer = Tracer()
+    from pypcom import tracing as tracing_module
+
+    tracing_module.start_tracing(outer)
+    try:
+        with tracing() as inner:
+            assert tracing_module.get_tracer() is inner
+        assert tracing_module.get_tracer() is outer
+    finally:
+        tracing_module.stop_tracing()
@@ -0,0 +1,151 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from pypcom import PC, Page
+from pypcom.common import Iframe
+from pypcom.facts import RESOLVE_ELEMENTS_SCRIPT
+
+
+class FakeDriver(object):
+    """Sends every command through ``execute``, like a real driver."""
+
+    def __init__(self, hold_scripts=False):
+        self.commands = []
+        self.release = threading.Event()
+        self.script_started = threading.Event()
+        if not hold_scripts:
+            self.release.set()
+        self.switch_to = MagicMock()
+
+    def execute(self, command, params):
+        self.commands.append(command)
+        if command == "executeScript":
+            self.script_started.set()
+            self.release.wait(5)
+            return [
+                MagicMock(text=" ".join(step[1] for step in chain))
+                for chain in params["args"][0]
+            ]
+        return MagicMock(text="found")
+
+    def execute_script(self, script, *args):
+        assert script == RESOLVE_ELEMENTS_SCRIPT
+        return self.execute("executeScript", {"args": list(args)})
+
+    def find_element(self, by, value):
+        return self.execute("findElement", {"using": by, "value": value})
+
+
+class Label(PC):
+    def __init__(self, name):
+        self._locator = ("id", name)
+
+
+class WidgetFrame(Iframe):
+    _locator = ("id", "widget")
+    total = Label("total")
+
+
+class WarmPage(Page):
+    title = Label("title")
+    footer = Label("footer")
+    widget = WidgetFrame()
+
+
+class Heading(PC):
+    _locator = ("css selector", "h1")
+    _find_from_parent = True
+
+
+class Banner(PC):
+    heading = Heading()
+
+
+class TopBanner(Banner):
+    _locator = ("id", "top")
+
+
+class BottomBanner(Banner):
+    _locator = ("id", "bottom")
+
+
+class BannersPage(Page):
+    top = TopBanner()
+    bottom = BottomBanner()
+
+
+class EagerPage(WarmPage):
+    _warm_up = True
+
+
+@pytest.fixture
+def driver():
+    return FakeDriver()
+
+
+def test_elements_handed_to_page(driver):
+    page = WarmPage(driver)
+    warmup = page.warm_up(batch_size=2)
+    warmup.join(5)
+    assert warmup.found == 3
+    assert driver.commands == ["executeScript", "executeScript"]
+    assert page.title.text == '[id="title"]'
+    assert "findElement" not in driver.commands
+
+
+def test_iframe_components_skipped(driver):
+    page = WarmPage(driver)
+    page.warm_up().join(5)
+    assert page.widget._get_parent_chain() in page._element_cache
+    total_key = page.widget.total._get_parent_chain()
+    assert total_key not in page._prefetched_elements
+
+
+def test_test_command_stops_warm_up():
+    driver = FakeDriver(hold_scripts=True)
+    page = WarmPage(driver)
+    warmup = page.warm_up(batch_size=1)
+    assert driver.script_started.wait(5)
+    test_thread = threading.Thread(
+        target=lambda: driver.find_element("id", "other"),
+    )
+    test_thread.start()
+    deadline = time.time() + 5
+    while not warmup.cancelled and time.time() < deadline:
+        time.sleep(0.001)
+    driver.release.set()
+    test_thread.join(5)
+    warmup.join(5)
+    assert warmup.found == 0
+    assert page.__dict__.get("_pypcom_prefetched_elements") is None
+    assert driver.commands == ["executeScript", "findElement"]
+
+
+def test_write_stops_warm_up():
+    driver = FakeDriver(hold_scripts=True)
+    page = WarmPage(driver)
+    warmup = page.warm_up()
+    assert driver.script_started.wait(5)
+    page._on_component_write(page.title)
+    driver.release.set()
+    warmup.join(5)
+    assert warmup.cancelled
+    assert warmup.found == 0
+
+
+def test_warm_up_on_init(driver):
+    page = EagerPage(driver)
+    warmup = page.__dict__["_pypcom_warmup"]
+    warmup.join(5)
+    assert warmup.found == 3
+
+
+def test_shared_component_warmed_up_per_parent(driver):
+    page = BannersPage(driver)
+    page.warm_up().join(5)
+    assert page.top.heading.text == '[id="top"] h1'
+    assert page.bottom.heading.text == '[id="bottom"] h1'
+    assert "findElement" not in driver.commands
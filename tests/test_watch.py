@@ -0,0 +1,138 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from pypcom import PC, Page
+from pypcom.watch import (
+    DRAIN_WATCH_SCRIPT,
+    START_WATCH_SCRIPT,
+    STOP_WATCH_SCRIPT,
+    ChangeEvent,
+)
+
+
+class Status(PC):
+    _locator = ("id", "status")
+
+
+class StatusPage(Page):
+    status = Status()
+
+
+def event(time, value, old_value=None, kind="text", name=None):
+    return {
+        "time": time,
+        "kind": kind,
+        "name": name,
+        "oldValue": old_value,
+        "value": value,
+    }
+
+
+class FakeBrowser(object):
+    """Hands out batches of buffered events, then ends the watch."""
+
+    def __init__(self, batches, watch_id=7):
+        self.batches = list(batches)
+        self.watch_id = watch_id
+        self.drains = 0
+
+    def execute_script(self, script, *args):
+        if script == START_WATCH_SCRIPT:
+            return self.watch_id
+        assert script == STOP_WATCH_SCRIPT
+
+    def execute_async_script(self, script, watch_id, max_wait_ms, batch_ms):
+        assert script == DRAIN_WATCH_SCRIPT
+        assert watch_id == self.watch_id
+        self.drains += 1
+        if not self.batches:
+            return None
+        return self.batches.pop(0)
+
+
+@pytest.fixture
+def browser():
+    return FakeBrowser(
+        [
+            [event(1000, "Pending"), event(1500, "Packed", "Pending")],
+            [],
+            [
+                event(
+                    2000,
+                    "done",
+                    "busy",
+                    kind="attribute",
+                    name="class",
+                ),
+            ],
+        ],
+    )
+
+
+@pytest.fixture
+def driver(browser):
+    driver = MagicMock()
+    driver.execute_script.side_effect = browser.execute_script
+    driver.execute_async_script.side_effect = browser.execute_async_script
+    return driver
+
+
+@pytest.fixture
+def page(driver):
+    return StatusPage(driver)
+
+
+expected_events = [
+    ChangeEvent(1.0, "text", None, None, "Pending"),
+    ChangeEvent(1.5, "text", None, "Pending", "Packed"),
+    ChangeEvent(2.0, "attribute", "class", "busy", "done"),
+]
+
+
+def test_start_resolves_locator(page, driver):
+    page.status.watch(attributes=["class"])
+    driver.execute_script.assert_called_once_with(
+        START_WATCH_SCRIPT,
+        [("css", '[id="status"]')],
+        ["class"],
+        True,
+    )
+
+
+def test_events_until_watch_ends(page, browser):
+    assert list(page.status.watch(attributes=["class"])) == expected_events
+    assert browser.drains == 4
+
+
+def test_many_events_per_poll(page):
+    watch = page.status.watch()
+    assert len(watch.poll()) == 2
+
+
+def test_stop(page, driver):
+    with page.status.watch() as watch:
+        watch.poll()
+    assert driver.execute_script.call_args[0] == (STOP_WATCH_SCRIPT, 7)
+    assert watch.poll() == []
+
+
+def test_async_iteration(page):
+    async def collect():
+        return [event async for event in page.status.watch()]
+
+    assert asyncio.run(collect()) == expected_events
+
+
+def test_not_present(page, driver):
+    driver.execute_script.side_effect = None
+    driver.execute_script.return_value = None
+    with pytest.raises(NoSuchElementException):
+        page.status.watch()
+
+
+def test_nothing_to_watch(page):
+    with pytest.raises(ValueError):
+        page.status.watch(text=False)